@@ -0,0 +1,139 @@
+"""Stream rendered cards into a ZIP or TAR archive, entry by entry.
+
+Each card is encoded in memory and appended to the archive as soon as it
+is ready, so no per-card files touch the disk and memory stays bounded by
+the few cards in flight. Entries keep submission order even when several
+encoder threads finish out of order. ``manifest.json`` closes the archive
+with card names, content hashes, SHA-256 of the files and the DPI.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import io
+import json
+import os
+import tarfile
+import threading
+import time
+import zipfile
+from typing import Callable, Dict, List, Optional, Tuple
+
+ARCHIVE_MANIFEST_NAME = "manifest.json"
+ARCHIVE_MANIFEST_VERSION = 1
+# суфікс файлу → формат архіву
+ARCHIVE_FORMATS = {
+    ".zip": "zip",
+    ".tar": "tar",
+    ".tar.gz": "tar.gz",
+    ".tgz": "tar.gz",
+}
+
+
+def archive_format(path: str, fmt: Optional[str] = None) -> str:
+    """``zip``, ``tar`` or ``tar.gz`` — explicit ``fmt`` or from the suffix."""
+    if fmt is not None:
+        if fmt not in ARCHIVE_FORMATS.values():
+            raise ValueError(f"Unknown archive format: {fmt!r}")
+        return fmt
+    lower = path.lower()
+    for suffix, name in sorted(ARCHIVE_FORMATS.items(), key=lambda item: -len(item[0])):
+        if lower.endswith(suffix):
+            return name
+    raise ValueError(f"Cannot tell archive format from {path!r}; use .zip, .tar or .tar.gz")
+
+
+class CardArchive:
+    """Write-only ZIP/TAR archive that takes encoded cards in order.
+
+    :meth:`reserve` hands out a ``write(data)`` callback per card; data
+    arriving ahead of an earlier card waits in memory until that card is
+    written. The archive is built next to ``path`` and renamed into place
+    by :meth:`finish`; leaving the ``with`` block without it (e.g. on an
+    export error) removes the partial file.
+    """
+
+    def __init__(self, path: str, fmt: Optional[str] = None):
+        self.path = path
+        self.format = archive_format(path, fmt)
+        self.entries: List[Dict] = []
+        self._tmp_path = f"{path}.part"
+        self._lock = threading.Lock()
+        self._reserved = 0
+        self._next = 0
+        self._ready: Dict[int, Tuple[str, Dict, bytes]] = {}
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        if self.format == "zip":
+            # PNG/WebP уже стиснуті — deflate лише витрачає час.
+            self._zip: Optional[zipfile.ZipFile] = zipfile.ZipFile(self._tmp_path, "w", zipfile.ZIP_STORED)
+            self._tar: Optional[tarfile.TarFile] = None
+        else:
+            self._zip = None
+            self._tar = tarfile.open(self._tmp_path, "w:gz" if self.format == "tar.gz" else "w")
+
+    def __enter__(self) -> "CardArchive":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        if self._zip is not None or self._tar is not None:
+            self.abort()
+
+    # ------------------------------------------------------------------
+    def reserve(self, name: str, meta: Optional[Dict] = None) -> Callable[[bytes], None]:
+        """Claim the next entry slot; call the result with the file bytes."""
+        with self._lock:
+            seq = self._reserved
+            self._reserved += 1
+
+        def write(data: bytes) -> None:
+            self._put(seq, name, dict(meta or {}), data)
+
+        return write
+
+    def _put(self, seq: int, name: str, meta: Dict, data: bytes) -> None:
+        with self._lock:
+            self._ready[seq] = (name, meta, data)
+            while self._next in self._ready:
+                self._write_entry(*self._ready.pop(self._next))
+                self._next += 1
+
+    def _write_entry(self, name: str, meta: Dict, data: bytes) -> None:
+        self._add_bytes(name, data)
+        meta.update({"file": name, "bytes": len(data), "sha256": hashlib.sha256(data).hexdigest()})
+        self.entries.append(meta)
+
+    def _add_bytes(self, name: str, data: bytes) -> None:
+        if self._zip is not None:
+            info = zipfile.ZipInfo(name, date_time=time.localtime()[:6])
+            info.external_attr = 0o644 << 16
+            self._zip.writestr(info, data)
+        else:
+            info = tarfile.TarInfo(name)
+            info.size = len(data)
+            info.mtime = int(time.time())
+            info.mode = 0o644
+            self._tar.addfile(info, io.BytesIO(data))
+
+    # ------------------------------------------------------------------
+    def finish(self, manifest: Dict) -> str:
+        """Append ``manifest.json`` (with the written entries) and publish."""
+        if self._ready or self._next != self._reserved:
+            raise RuntimeError("CardArchive.finish() before every reserved card was written")
+        manifest = dict(manifest, version=ARCHIVE_MANIFEST_VERSION, cards=self.entries)
+        self._add_bytes(ARCHIVE_MANIFEST_NAME, json.dumps(manifest, indent=2, ensure_ascii=False).encode("utf-8"))
+        self._close()
+        os.replace(self._tmp_path, self.path)
+        return self.path
+
+    def abort(self) -> None:
+        self._close()
+        if os.path.exists(self._tmp_path):
+            os.remove(self._tmp_path)
+
+    def _close(self) -> None:
+        if self._zip is not None:
+            self._zip.close()
+            self._zip = None
+        if self._tar is not None:
+            self._tar.close()
+            self._tar = None
@@ -0,0 +1,257 @@
+"""On-disk cache of art pre-fitted to template slots."""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import struct
+import tempfile
+import threading
+from typing import Dict, Optional, Set, Tuple
+
+from PIL import Image
+
+from .image_loader import ImageLoader, get_image_loader
+from .lru import process_wide
+
+ART_CACHE_DIR_NAME = ".artcache"
+# Поки застосунок не вказав свій каталог (configure_art_cache) — тимчасова
+# тека; поруч з артами кеш не пишеться ніколи.
+DEFAULT_ART_CACHE_DIR = os.path.join(tempfile.gettempdir(), "card-generator", ART_CACHE_DIR_NAME)
+DERIVATIVE_SUFFIX = ".rgba"
+SOURCE_MARKER_SUFFIX = ".src"
+DERIVATIVE_MAGIC = b"CGART\x01"
+DERIVATIVE_VERSION = 1
+_HEADER = struct.Struct("<6sII")
+
+
+class ArtDerivativeCache:
+    """Keeps slot-sized, premultiplied RGBA copies of art files on disk.
+
+    A derivative is keyed by the SHA-1 of the source file and the slot
+    geometry (width, height, DPI, fit mode) and is produced lazily on first
+    use. Files hold a small header followed by raw ``RGBa`` pixels, so
+    reading one back needs no decoding and Qt can wrap it directly as
+    ``Format_RGBA8888_Premultiplied``.
+
+    Derivatives go to ``cache_dir`` (:data:`DEFAULT_ART_CACHE_DIR` if
+    omitted), never into the folder of the source. Every source file that
+    uses a derivative gets its own small marker with its path, size and
+    mtime; :meth:`prune` drops a derivative once no marker of its content
+    points at a file that still has it.
+    """
+
+    def __init__(self, cache_dir: Optional[str] = None, image_loader: Optional[ImageLoader] = None):
+        self.cache_dir = cache_dir or DEFAULT_ART_CACHE_DIR
+        self.images = image_loader or get_image_loader()
+        self._source_hashes: Dict[Tuple[str, int, int], str] = {}
+        # (cache_dir, шлях маркера), уже записані цим процесом
+        self._marked: Set[Tuple[str, str]] = set()
+        self._lock = threading.Lock()
+
+    # ------------------------------------------------------------------
+    def load_premultiplied(
+        self, src_path: Optional[str], width: int, height: int, dpi: int = 300, keep_aspect: bool = True
+    ) -> Optional[Tuple[int, int, bytes]]:
+        """Return ``(width, height, RGBa bytes)`` of the derivative."""
+        if not src_path:
+            return None
+        path = self.derivative_path(src_path, width, height, dpi, keep_aspect)
+        if path is None:
+            return None
+        prefix = _source_prefix(os.path.basename(path))
+        cached = _read_derivative(path)
+        if cached is not None:
+            # Той самий вміст може прийти з іншого файлу — він теж має маркер.
+            self._ensure_marker(src_path, prefix)
+            return cached
+        img = self.images.load_scaled(src_path, width, height, keep_aspect=keep_aspect)
+        if img is None:
+            return None
+        premultiplied = img.convert("RGBa")
+        data = premultiplied.tobytes()
+        _write_derivative(path, premultiplied.width, premultiplied.height, data)
+        self._mark_source(src_path, prefix)
+        return premultiplied.width, premultiplied.height, data
+
+    # ------------------------------------------------------------------
+    def load(
+        self, src_path: Optional[str], width: int, height: int, dpi: int = 300, keep_aspect: bool = True
+    ) -> Optional[Image.Image]:
+        """Return the derivative as a straight-alpha RGBA PIL image."""
+        derived = self.load_premultiplied(src_path, width, height, dpi, keep_aspect)
+        if derived is None:
+            return None
+        w, h, data = derived
+        return Image.frombytes("RGBa", (w, h), data).convert("RGBA")
+
+    # ------------------------------------------------------------------
+    def derivative_path(
+        self, src_path: str, width: int, height: int, dpi: int = 300, keep_aspect: bool = True
+    ) -> Optional[str]:
+        source_hash = self.source_hash(src_path)
+        if source_hash is None:
+            return None
+        mode = "fit" if keep_aspect else "fill"
+        name = (
+            f"{source_hash[:24]}_{int(width)}x{int(height)}_{int(dpi)}dpi_{mode}"
+            f"_v{DERIVATIVE_VERSION}{DERIVATIVE_SUFFIX}"
+        )
+        return os.path.join(self.cache_dir, name)
+
+    # ------------------------------------------------------------------
+    def prune(self) -> int:
+        """Delete derivatives no longer used by any source file.
+
+        A marker whose file still has its size and mtime is live without
+        reading the file; otherwise it is live only if the content hash is
+        unchanged. Dead markers are removed, and so are derivatives left
+        without a live marker. Returns the number of files removed.
+        """
+        try:
+            names = os.listdir(self.cache_dir)
+        except OSError:
+            return 0
+        live = set()
+        stale = []
+        for name in names:
+            if name.endswith(SOURCE_MARKER_SUFFIX):
+                prefix = _source_prefix(name)
+                if self._source_alive(os.path.join(self.cache_dir, name), prefix):
+                    live.add(prefix)
+                else:
+                    stale.append(name)
+        stale += [name for name in names if name.endswith(DERIVATIVE_SUFFIX) and _source_prefix(name) not in live]
+        removed = 0
+        with self._lock:
+            self._marked.clear()
+        for name in stale:
+            try:
+                os.remove(os.path.join(self.cache_dir, name))
+                removed += 1
+            except OSError:
+                pass
+        return removed
+
+    def _source_alive(self, marker_path: str, prefix: str) -> bool:
+        try:
+            with open(marker_path, "r", encoding="utf-8") as fh:
+                marker = json.load(fh)
+            src_path = marker["path"]
+            stat = os.stat(src_path)
+            if (stat.st_size, stat.st_mtime_ns) == (marker["size"], marker["mtime_ns"]):
+                return True
+        except (OSError, ValueError, KeyError, TypeError):
+            return False
+        # Файл торкнули, але вміст міг лишитися тим самим.
+        source_hash = self.source_hash(src_path)
+        if source_hash is None or source_hash[:24] != prefix:
+            return False
+        self._mark_source(src_path, prefix)
+        return True
+
+    def _marker_path(self, src_path: str, prefix: str) -> str:
+        # Маркер на кожен файл-джерело: однакові за вмістом файли не ділять один.
+        path_hash = hashlib.sha1(os.path.normcase(os.path.abspath(src_path)).encode("utf-8")).hexdigest()[:16]
+        return os.path.join(self.cache_dir, f"{prefix}.{path_hash}{SOURCE_MARKER_SUFFIX}")
+
+    def _ensure_marker(self, src_path: str, prefix: str) -> None:
+        marker_path = self._marker_path(src_path, prefix)
+        with self._lock:
+            if (self.cache_dir, marker_path) in self._marked:
+                return
+        if not os.path.exists(marker_path):
+            self._mark_source(src_path, prefix)
+        else:
+            with self._lock:
+                self._marked.add((self.cache_dir, marker_path))
+
+    def _mark_source(self, src_path: str, prefix: str) -> None:
+        try:
+            stat = os.stat(src_path)
+        except OSError:
+            return
+        marker = {"path": os.path.abspath(src_path), "size": stat.st_size, "mtime_ns": stat.st_mtime_ns}
+        data = json.dumps(marker, ensure_ascii=False).encode("utf-8")
+        marker_path = self._marker_path(src_path, prefix)
+        _write_atomic(marker_path, data)
+        with self._lock:
+            self._marked.add((self.cache_dir, marker_path))
+
+    # ------------------------------------------------------------------
+    def source_hash(self, src_path: str) -> Optional[str]:
+        """SHA-1 of the source file, memoized per (path, mtime, size)."""
+        try:
+            stat = os.stat(src_path)
+        except OSError:
+            return None
+        key = (os.path.abspath(src_path), stat.st_mtime_ns, stat.st_size)
+        with self._lock:
+            cached = self._source_hashes.get(key)
+        if cached is not None:
+            return cached
+        digest = hashlib.sha1()
+        try:
+            with open(src_path, "rb") as fh:
+                for chunk in iter(lambda: fh.read(1024 * 1024), b""):
+                    digest.update(chunk)
+        except OSError:
+            return None
+        value = digest.hexdigest()
+        with self._lock:
+            self._source_hashes[key] = value
+        return value
+
+
+def _source_prefix(name: str) -> str:
+    """Source hash prefix of a derivative or marker file name."""
+    return name.split("_", 1)[0].split(".", 1)[0]
+
+
+def _read_derivative(path: str) -> Optional[Tuple[int, int, bytes]]:
+    try:
+        with open(path, "rb") as fh:
+            header = fh.read(_HEADER.size)
+            if len(header) != _HEADER.size:
+                return None
+            magic, width, height = _HEADER.unpack(header)
+            if magic != DERIVATIVE_MAGIC:
+                return None
+            data = fh.read()
+    except OSError:
+        return None
+    if len(data) != width * height * 4:
+        return None
+    return width, height, data
+
+
+def _write_derivative(path: str, width: int, height: int, data: bytes) -> None:
+    _write_atomic(path, _HEADER.pack(DERIVATIVE_MAGIC, width, height), data)
+
+
+def _write_atomic(path: str, *chunks: bytes) -> None:
+    """Write atomically; an unwritable cache folder only costs speed."""
+    tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(tmp_path, "wb") as fh:
+            for chunk in chunks:
+                fh.write(chunk)
+        os.replace(tmp_path, path)
+    except OSError:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+
+
+@process_wide
+def get_art_cache() -> ArtDerivativeCache:
+    """Process-wide :class:`ArtDerivativeCache` used by the renderers."""
+    return ArtDerivativeCache()
+
+
+def configure_art_cache(cache_dir: str) -> ArtDerivativeCache:
+    """Point the process-wide cache at ``cache_dir`` (e.g. in the workspace)."""
+    cache = get_art_cache()
+    cache.cache_dir = cache_dir
+    return cache
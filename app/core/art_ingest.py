@@ -0,0 +1,272 @@
+"""Bulk ingestion of raw art dumps into the deck's ``arts`` folder."""
+
+from __future__ import annotations
+
+import difflib
+import json
+import os
+import re
+import unicodedata
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import asdict, dataclass, field
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from PIL import Image
+
+from .image_loader import REDUCIBLE_MODES
+from .json_loader import JSONLoader, sanitize_art_name
+
+ART_EXTENSIONS = (".png", ".jpg", ".jpeg", ".webp", ".bmp", ".tif", ".tiff", ".gif")
+DEFAULT_MAX_SIZE = (2048, 2048)
+FUZZY_CUTOFF = 0.8
+REPORT_NAME = "ingest_report.json"
+
+
+@dataclass
+class IngestReport:
+    """Outcome of :func:`ingest_arts`; ``matched`` maps card name to output file."""
+
+    matched: Dict[str, str] = field(default_factory=dict)
+    fuzzy: Dict[str, str] = field(default_factory=dict)
+    skipped: List[str] = field(default_factory=list)
+    unmatched_cards: List[str] = field(default_factory=list)
+    unused_files: List[str] = field(default_factory=list)
+    failed: Dict[str, str] = field(default_factory=dict)
+    # ім'я вихідного файлу -> джерело, з якого його зроблено (див. _source_record)
+    sources: Dict[str, dict] = field(default_factory=dict)
+
+    def to_dict(self) -> dict:
+        return asdict(self)
+
+
+def match_key(name: str) -> str:
+    """Loose comparison key: case, accents, separators and punctuation ignored."""
+    text = unicodedata.normalize("NFKD", name)
+    text = "".join(ch for ch in text if not unicodedata.combining(ch)).casefold()
+    text = re.sub(r"[\s_.\-]+", " ", text)
+    text = "".join(ch for ch in text if ch.isalnum() or ch == " ")
+    return " ".join(text.split())
+
+
+def match_arts(card_names: Iterable[str], files: Iterable[str], cutoff: float = FUZZY_CUTOFF):
+    """Pair card names with art files.
+
+    Exact matches on :func:`match_key` win first; remaining cards take the
+    closest remaining file by ``difflib`` ratio. Each file is used once.
+    Returns ``(matches, fuzzy_names, unmatched_cards, unused_files)`` where
+    ``matches`` maps card name to file path.
+    """
+    by_key: Dict[str, List[str]] = {}
+    for path in sorted(files):
+        stem = os.path.splitext(os.path.basename(path))[0]
+        by_key.setdefault(match_key(stem), []).append(path)
+
+    names = list(dict.fromkeys(card_names))
+    matches: Dict[str, str] = {}
+    pending: List[str] = []
+    for name in names:
+        candidates = by_key.get(match_key(sanitize_art_name(name)))
+        if candidates:
+            matches[name] = candidates.pop(0)
+        else:
+            pending.append(name)
+
+    fuzzy = set()
+    unmatched: List[str] = []
+    for name in pending:
+        remaining = [key for key, paths in by_key.items() if paths]
+        close = difflib.get_close_matches(match_key(sanitize_art_name(name)), remaining, n=1, cutoff=cutoff)
+        if close:
+            matches[name] = by_key[close[0]].pop(0)
+            fuzzy.add(name)
+        else:
+            unmatched.append(name)
+
+    unused = sorted(path for paths in by_key.values() for path in paths)
+    return matches, fuzzy, unmatched, unused
+
+
+def normalize_art(src_path: str, dst_path: str, max_size: Tuple[int, int] = DEFAULT_MAX_SIZE) -> Tuple[int, int]:
+    """Decode ``src_path`` and write it as a metadata-free RGBA PNG.
+
+    Images larger than ``max_size`` are shrunk (aspect kept, never
+    enlarged). Runs in worker processes, so it only touches its arguments.
+    """
+    with Image.open(src_path) as img:
+        img.draft("RGB", max_size)
+        if img.width > max_size[0] * 2 and img.height > max_size[1] * 2:
+            factor = min(img.width // max_size[0], img.height // max_size[1])
+            if img.mode not in REDUCIBLE_MODES:
+                # Палітра, I;16 тощо — reduce їх не приймає.
+                img = img.convert("RGBA")
+            img = img.reduce(factor)
+        img = img.convert("RGBA")
+    img.thumbnail(max_size, Image.LANCZOS)
+    # Нове зображення без info/exif/icc — метадані не переносяться.
+    clean = Image.frombytes("RGBA", img.size, img.tobytes())
+    tmp_path = f"{dst_path}.{os.getpid()}.tmp"
+    try:
+        clean.save(tmp_path, format="PNG", compress_level=6)
+        os.replace(tmp_path, dst_path)
+    finally:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+    return clean.size
+
+
+def _normalize_task(args) -> Tuple[str, Optional[str]]:
+    src_path, dst_path, max_size = args
+    try:
+        normalize_art(src_path, dst_path, max_size)
+    except Exception as exc:  # noqa: BLE001 — звітуємо й продовжуємо
+        return src_path, str(exc)
+    return src_path, None
+
+
+def _source_record(src_path: str, max_size: Tuple[int, int]) -> Optional[dict]:
+    try:
+        stat = os.stat(src_path)
+    except OSError:
+        return None
+    return {
+        "path": os.path.abspath(src_path),
+        "size": stat.st_size,
+        "mtime_ns": stat.st_mtime_ns,
+        "max_size": list(max_size),
+    }
+
+
+def _is_fresh(src_path: str, dst_path: str, max_size: Tuple[int, int], recorded: Optional[dict]) -> bool:
+    """True when ``dst_path`` needs no rework for ``src_path``.
+
+    ``recorded`` is the source entry the previous run stored for
+    ``dst_path``; the output is fresh only if it was made from this very
+    file, unchanged, with the same size limit.
+    """
+    try:
+        if os.path.samefile(src_path, dst_path):
+            # Арт уже лежить під цільовою назвою — достатньо, щоб вміщався в ліміт.
+            with Image.open(src_path) as img:
+                return img.format == "PNG" and img.width <= max_size[0] and img.height <= max_size[1]
+    except OSError:
+        return False
+    return recorded is not None and recorded == _source_record(src_path, max_size)
+
+
+def read_report_sources(output_dir: str) -> Dict[str, dict]:
+    """``sources`` of the report a previous run left in ``output_dir``."""
+    try:
+        with open(os.path.join(output_dir, REPORT_NAME), "r", encoding="utf-8") as fh:
+            sources = json.load(fh).get("sources")
+    except (OSError, ValueError, AttributeError):
+        return {}
+    return sources if isinstance(sources, dict) else {}
+
+
+def list_art_files(source_dir: str) -> List[str]:
+    return [
+        os.path.join(source_dir, entry)
+        for entry in sorted(os.listdir(source_dir))
+        if entry.lower().endswith(ART_EXTENSIONS) and os.path.isfile(os.path.join(source_dir, entry))
+    ]
+
+
+def ingest_arts(
+    deck_path: str,
+    source_dir: str,
+    output_dir: Optional[str] = None,
+    max_size: Tuple[int, int] = DEFAULT_MAX_SIZE,
+    workers: Optional[int] = None,
+    force: bool = False,
+) -> IngestReport:
+    """Match, normalize and copy arts for every card of ``deck_path``.
+
+    Outputs are ``<output_dir>/<sanitized card name>.png`` — exactly the
+    names :meth:`JSONLoader._autodetect_art` looks for. ``output_dir``
+    defaults to the deck's arts folder. The report is saved there as
+    :data:`REPORT_NAME` with the path, size and mtime of the source of
+    every output; an output whose source still matches that record is
+    kept unless ``force`` is set. Decoding runs on ``workers`` processes
+    (``os.cpu_count()`` by default, ``1`` runs inline).
+    """
+    loader = JSONLoader(deck_path)
+    output_dir = output_dir or loader.arts_dir
+    os.makedirs(output_dir, exist_ok=True)
+
+    card_names = [card.payload["name"] for card in loader.load().cards if card.payload.get("name")]
+    matches, fuzzy, unmatched, unused = match_arts(card_names, list_art_files(source_dir))
+
+    report = IngestReport(unmatched_cards=unmatched, unused_files=unused)
+    previous_sources = read_report_sources(output_dir)
+    tasks = []
+    pending_sources: Dict[str, Tuple[str, Optional[dict]]] = {}
+    for name, src_path in matches.items():
+        dst_path = os.path.join(output_dir, f"{sanitize_art_name(name)}.png")
+        target = report.fuzzy if name in fuzzy else report.matched
+        target[name] = dst_path
+        dst_name = os.path.basename(dst_path)
+        recorded = previous_sources.get(dst_name)
+        if not force and _is_fresh(src_path, dst_path, max_size, recorded):
+            report.skipped.append(name)
+            report.sources[dst_name] = recorded
+            continue
+        # Стан джерела до обробки: якщо воно зміниться під час неї, наступний запуск повторить.
+        pending_sources[src_path] = (dst_name, _source_record(src_path, max_size))
+        tasks.append((src_path, dst_path, tuple(max_size)))
+
+    if workers == 1 or len(tasks) <= 1:
+        results = map(_normalize_task, tasks)
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            results = list(pool.map(_normalize_task, tasks, chunksize=4))
+    for src_path, error in results:
+        if error is not None:
+            report.failed[src_path] = error
+            continue
+        dst_name, record = pending_sources[src_path]
+        if record is not None:
+            report.sources[dst_name] = record
+
+    for name in list(report.matched) + list(report.fuzzy):
+        src_failed = report.failed.get(matches[name])
+        if src_failed is not None:
+            report.matched.pop(name, None)
+            report.fuzzy.pop(name, None)
+            report.unmatched_cards.append(name)
+    write_report(report, os.path.join(output_dir, REPORT_NAME))
+    return report
+
+
+def write_report(report: IngestReport, path: str) -> None:
+    with open(path, "w", encoding="utf-8") as fh:
+        json.dump(report.to_dict(), fh, ensure_ascii=False, indent=2)
+
+
+def main(argv=None) -> int:
+    """``python -m core.art_ingest deck.json raw_arts/`` — bulk art ingest."""
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Match, normalize and copy raw arts for a deck.")
+    parser.add_argument("deck", help="шлях до JSON колоди")
+    parser.add_argument("source", help="тека з сирими артами")
+    parser.add_argument("--output", default=None, help="тека для результату (типово <deck>/../arts)")
+    parser.add_argument("--max-size", default="x".join(map(str, DEFAULT_MAX_SIZE)), help="WxH, більші арти зменшуються")
+    parser.add_argument("--workers", type=int, default=None, help="кількість процесів (типово — усі ядра)")
+    parser.add_argument("--force", action="store_true", help="перезаписати навіть свіжі файли")
+    args = parser.parse_args(argv)
+
+    max_size = tuple(int(v) for v in args.max_size.lower().split("x"))
+    report = ingest_arts(args.deck, args.source, args.output, max_size, args.workers, args.force)
+
+    print(f"matched: {len(report.matched)}, fuzzy: {len(report.fuzzy)}, skipped: {len(report.skipped)}")
+    for name, path in sorted(report.fuzzy.items()):
+        print(f"  ~ {name} -> {os.path.basename(path)}")
+    for name in report.unmatched_cards:
+        print(f"  ! no art for: {name}")
+    for src, error in report.failed.items():
+        print(f"  x {src}: {error}")
+    return 1 if report.failed else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
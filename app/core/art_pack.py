@@ -0,0 +1,282 @@
+"""Memory-mapped pack of slot-sized art for a whole deck."""
+
+from __future__ import annotations
+
+import json
+import mmap
+import os
+import struct
+from typing import Dict, Iterable, Optional, Tuple
+
+from PIL import Image
+
+from .art_cache import ArtDerivativeCache, get_art_cache
+
+ART_PACK_SUFFIX = ".artpack"
+PACK_MAGIC = b"CGPACK\x01\n"
+PACK_FORMAT_VERSION = 1
+PACK_ALIGNMENT = 64
+_INDEX_LEN = struct.Struct("<I")
+# Обрізаний файл чи індекс без потрібних полів — пакет просто непридатний.
+_ENTRY_FIELDS = ("width", "height", "offset", "source_size", "source_mtime_ns")
+_BROKEN_PACK_ERRORS = (OSError, ValueError, KeyError, TypeError, struct.error)
+
+
+def art_pack_path(arts_dir: str, deck_name: str) -> str:
+    """Conventional location of a deck's pack: next to its arts folder.
+
+    Not inside it — the deck cache signature and the hot-reload snapshot
+    scan that folder, and a new pack is not an art change.
+    """
+    return os.path.join(os.path.dirname(os.path.abspath(arts_dir)), f"{deck_name}{ART_PACK_SUFFIX}")
+
+
+class ArtPack:
+    """Read-only view over an ``.artpack`` file.
+
+    The file starts with a JSON index followed by 64-byte aligned blocks of
+    straight RGBA pixels, all fitted to one slot size. Pixels are served
+    straight from the memory map: :meth:`image` returns a PIL image and
+    :meth:`qimage` a ``QImage`` that share the mapped bytes, so neither may
+    outlive :meth:`close`.
+
+    Entries remember the size and mtime of their source file; when the
+    source has changed since packing the lookup misses and callers fall
+    back to the regular art cache.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._fh = open(path, "rb")
+        try:
+            self._map = mmap.mmap(self._fh.fileno(), 0, access=mmap.ACCESS_READ)
+            self._index = self._read_index()
+            self.width: int = int(self._index["width"])
+            self.height: int = int(self._index["height"])
+            self.keep_aspect: bool = bool(self._index["keep_aspect"])
+            self.dpi: int = int(self._index["dpi"])
+            self._entries: Dict[str, dict] = dict(self._index["entries"])
+            self._check_entries()
+        except _BROKEN_PACK_ERRORS:
+            if getattr(self, "_map", None) is not None:
+                self._map.close()
+            self._fh.close()
+            raise
+
+    @classmethod
+    def open(cls, path: Optional[str]) -> Optional["ArtPack"]:
+        """Open ``path`` if it is a readable pack, else ``None``."""
+        if not path or not os.path.isfile(path):
+            return None
+        try:
+            return cls(path)
+        except _BROKEN_PACK_ERRORS:
+            return None
+
+    # ------------------------------------------------------------------
+    def _read_index(self) -> dict:
+        head = len(PACK_MAGIC) + _INDEX_LEN.size
+        if self._map[: len(PACK_MAGIC)] != PACK_MAGIC:
+            raise ValueError(f"Not an art pack: {self.path}")
+        (index_len,) = _INDEX_LEN.unpack(self._map[len(PACK_MAGIC):head])
+        index = json.loads(self._map[head:head + index_len].decode("utf-8"))
+        if not isinstance(index, dict):
+            raise ValueError(f"Broken art pack index: {self.path}")
+        if index.get("version") != PACK_FORMAT_VERSION:
+            raise ValueError(f"Unsupported art pack version: {self.path}")
+        return index
+
+    def _check_entries(self) -> None:
+        """Every entry must describe pixels that lie inside the file."""
+        size = len(self._map)
+        for key, entry in self._entries.items():
+            fields = {name: int(entry[name]) for name in _ENTRY_FIELDS}
+            w, h, offset = fields["width"], fields["height"], fields["offset"]
+            if w <= 0 or h <= 0 or offset < 0 or offset + w * h * 4 > size:
+                raise ValueError(f"Art pack entry {key!r} lies outside {self.path}")
+
+    # ------------------------------------------------------------------
+    def matches(self, width: int, height: int, keep_aspect: bool) -> bool:
+        return (self.width, self.height, self.keep_aspect) == (int(width), int(height), bool(keep_aspect))
+
+    # ------------------------------------------------------------------
+    def _lookup(self, src_path: Optional[str]) -> Optional[Tuple[memoryview, int, int]]:
+        if not src_path:
+            return None
+        entry = self._entries.get(_entry_key(src_path))
+        if entry is None:
+            return None
+        try:
+            stat = os.stat(src_path)
+        except OSError:
+            return None
+        if (stat.st_size, stat.st_mtime_ns) != (entry["source_size"], entry["source_mtime_ns"]):
+            return None
+        w, h, offset = entry["width"], entry["height"], entry["offset"]
+        view = memoryview(self._map)[offset:offset + w * h * 4]
+        return view, w, h
+
+    # ------------------------------------------------------------------
+    def image(self, src_path: Optional[str]) -> Optional[Image.Image]:
+        """Zero-copy read-only RGBA PIL image for ``src_path``."""
+        found = self._lookup(src_path)
+        if found is None:
+            return None
+        view, w, h = found
+        return Image.frombuffer("RGBA", (w, h), view, "raw", "RGBA", 0, 1)
+
+    # ------------------------------------------------------------------
+    def qimage(self, src_path: Optional[str]):
+        """Zero-copy ``QImage`` (``Format_RGBA8888``) for ``src_path``."""
+        found = self._lookup(src_path)
+        if found is None:
+            return None
+        from PySide6.QtGui import QImage
+
+        view, w, h = found
+        return QImage(view, w, h, w * 4, QImage.Format_RGBA8888)
+
+    # ------------------------------------------------------------------
+    def __contains__(self, src_path: str) -> bool:
+        return self._lookup(src_path) is not None
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def close(self) -> None:
+        try:
+            self._map.close()
+        except BufferError:
+            # Ще живі образи поверх мапи — звільниться разом з ними.
+            pass
+        self._fh.close()
+
+
+def _entry_key(src_path: str) -> str:
+    return os.path.normcase(os.path.basename(src_path))
+
+
+def write_art_pack(
+    pack_path: str,
+    art_paths: Iterable[Optional[str]],
+    width: int,
+    height: int,
+    keep_aspect: bool = True,
+    dpi: int = 300,
+    art_cache: Optional[ArtDerivativeCache] = None,
+) -> int:
+    """Pack every readable art in ``art_paths`` and return the entry count.
+
+    Pixels come from the derivative cache, so repacking a deck only decodes
+    arts that changed. The file is written atomically.
+    """
+    art_cache = art_cache or get_art_cache()
+    entries: Dict[str, dict] = {}
+    blocks = []
+    for src_path in art_paths:
+        if not src_path or _entry_key(src_path) in entries:
+            continue
+        try:
+            stat = os.stat(src_path)
+        except OSError:
+            continue
+        img = art_cache.load(src_path, width, height, dpi=dpi, keep_aspect=keep_aspect)
+        if img is None:
+            continue
+        entries[_entry_key(src_path)] = {
+            "width": img.width,
+            "height": img.height,
+            "source_size": stat.st_size,
+            "source_mtime_ns": stat.st_mtime_ns,
+        }
+        blocks.append((_entry_key(src_path), img.tobytes("raw", "RGBA")))
+
+    def _index_bytes() -> bytes:
+        index = {
+            "version": PACK_FORMAT_VERSION,
+            "width": int(width),
+            "height": int(height),
+            "keep_aspect": bool(keep_aspect),
+            "dpi": int(dpi),
+            "entries": entries,
+        }
+        return json.dumps(index, sort_keys=True).encode("utf-8")
+
+    # Зсуви залежать від довжини індексу, а індекс — від зсувів; повторюємо,
+    # доки довжина індексу не перестане змінюватися (зазвичай 2 проходи).
+    for key, _data in blocks:
+        entries[key]["offset"] = 0
+    for _ in range(3):
+        cursor = _align(len(PACK_MAGIC) + _INDEX_LEN.size + len(_index_bytes()))
+        changed = False
+        for key, data in blocks:
+            if entries[key]["offset"] != cursor:
+                entries[key]["offset"] = cursor
+                changed = True
+            cursor = _align(cursor + len(data))
+        if not changed:
+            break
+    index_bytes = _index_bytes()
+
+    tmp_path = f"{pack_path}.{os.getpid()}.tmp"
+    try:
+        with open(tmp_path, "wb") as fh:
+            fh.write(PACK_MAGIC)
+            fh.write(_INDEX_LEN.pack(len(index_bytes)))
+            fh.write(index_bytes)
+            for key, data in blocks:
+                fh.write(b"\0" * (entries[key]["offset"] - fh.tell()))
+                fh.write(data)
+        os.replace(tmp_path, pack_path)
+    finally:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+    return len(blocks)
+
+
+def _align(offset: int) -> int:
+    return (offset + PACK_ALIGNMENT - 1) // PACK_ALIGNMENT * PACK_ALIGNMENT
+
+
+def main(argv=None) -> int:
+    """``python -m core.art_pack deck.json`` — build a deck's art pack."""
+    import argparse
+
+    from .json_loader import JSONLoader
+
+    parser = argparse.ArgumentParser(description="Pack a deck's arts into one memory-mapped file.")
+    parser.add_argument("deck", help="шлях до JSON колоди")
+    parser.add_argument("--size", default=None, help="розмір слоту WxH у пікселях (типово з template_layout.json)")
+    parser.add_argument("--fill", action="store_true", help="розтягнути на весь слот замість вписування")
+    parser.add_argument("--dpi", type=int, default=300)
+    parser.add_argument("--output", default=None, help="файл пакета (типово <колода>.artpack поруч із папкою arts)")
+    args = parser.parse_args(argv)
+
+    loader = JSONLoader(args.deck)
+    deck = loader.load()
+    if args.size:
+        width, height = (int(v) for v in args.size.lower().split("x"))
+    else:
+        width, height = _layout_art_size()
+    output = args.output or art_pack_path(loader.arts_dir, loader.deck_name)
+    count = write_art_pack(
+        output,
+        (card.payload.get("art_path") for card in deck.cards),
+        width,
+        height,
+        keep_aspect=not args.fill,
+        dpi=args.dpi,
+    )
+    print(f"{output}: {count} arts packed at {width}x{height}")
+    return 0
+
+
+def _layout_art_size() -> Tuple[int, int]:
+    layout_path = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "editor", "template_layout.json")
+    with open(layout_path, "r", encoding="utf-8") as fh:
+        size = json.load(fh).get("items", {}).get("artwork", {}).get("size", {})
+    return int(size.get("w", 0)), int(size.get("h", 0))
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,306 @@
+"""Sprite sheets (atlases) of rendered cards for digital tabletop engines.
+
+Cards are pasted into the current sheet as they are rendered; a full sheet
+is handed to an :class:`~core.export_pipeline.EncodeQueue` and its buffer
+comes back from a :class:`~core.export_pipeline.BufferPool` once written,
+so at most two sheet buffers are in memory whatever the deck size (in
+``pack`` mode plus the trimmed copy of the sheet being written).
+
+Two placements:
+
+* ``grid`` — fixed ``columns × rows`` cells of one card size (e.g. the
+  10×7 sheets of Tabletop Simulator); with ``reserve_back`` the last cell
+  of every sheet holds the card back;
+* ``pack`` — online shelf packing into sheets of at most
+  ``max_sheet_size``, trimmed to the used area; cards of different sizes
+  share a sheet, the back (if any) is packed first on every sheet.
+
+The JSON index lists every sheet and, per card, its sheet, pixel rect and
+UV rect (``u0, v0, u1, v1`` in 0..1 with ``v`` measured from the top).
+A full-size 10×7 sheet of 63×88 mm cards at 300 DPI is ~7440×7266 px,
+so engines are usually better served by downscaled cards.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Tuple
+
+from PIL import Image
+
+from .encoder_profiles import EncoderProfile, get_profile
+from .export_pipeline import BufferPool, EncodeQueue
+
+ATLAS_INDEX_VERSION = 1
+ATLAS_MODES = ("grid", "pack")
+ATLAS_GRID = (10, 7)
+# Найпоширеніший ліміт текстури на GPU.
+ATLAS_MAX_SHEET = (4096, 4096)
+# Один аркуш заповнюється, другий кодується.
+ATLAS_SHEET_BUFFERS = 2
+
+
+def as_pil(image) -> Image.Image:
+    """RGBA PIL image from a PIL image or ``QImage``."""
+    if isinstance(image, Image.Image):
+        return image if image.mode == "RGBA" else image.convert("RGBA")
+    from .qt_images import qimage_to_pil
+
+    return qimage_to_pil(image)
+
+
+# ----------------------------------------------------------------------
+# Розміщення на аркуші
+# ----------------------------------------------------------------------
+class GridPlacer:
+    """``columns × rows`` cells of ``cell`` size; the last one may be reserved."""
+
+    def __init__(self, cell: Tuple[int, int], columns: int, rows: int, reserve_back: bool = False):
+        if columns < 1 or rows < 1:
+            raise ValueError("Atlas grid needs at least one column and one row")
+        self.cell = cell
+        self.columns = columns
+        self.rows = rows
+        self.capacity = columns * rows - (1 if reserve_back else 0)
+        if self.capacity < 1:
+            raise ValueError("Atlas grid has no cell left for cards")
+        self.sheet_size = (cell[0] * columns, cell[1] * rows)
+        self._used = 0
+
+    def reset(self) -> None:
+        self._used = 0
+
+    def place(self, size: Tuple[int, int]) -> Optional[Tuple[int, int]]:
+        if self._used >= self.capacity:
+            return None
+        slot = self._used
+        self._used += 1
+        return self.slot_origin(slot)
+
+    def slot_origin(self, slot: int) -> Tuple[int, int]:
+        return (slot % self.columns) * self.cell[0], (slot // self.columns) * self.cell[1]
+
+    @property
+    def back_origin(self) -> Tuple[int, int]:
+        return self.slot_origin(self.columns * self.rows - 1)
+
+    def used_size(self) -> Tuple[int, int]:
+        # Рушії розрізають аркуш сіткою — розмір завжди повний.
+        return self.sheet_size
+
+
+class ShelfPacker:
+    """Online first-fit shelf packing into a sheet of at most ``sheet_size``."""
+
+    def __init__(self, sheet_size: Tuple[int, int], padding: int = 0):
+        self.sheet_size = sheet_size
+        self.padding = padding
+        self._shelves: List[List[int]] = []  # [y, висота, зайнята ширина]
+        self._width = 0
+
+    def reset(self) -> None:
+        self._shelves.clear()
+        self._width = 0
+
+    def place(self, size: Tuple[int, int]) -> Optional[Tuple[int, int]]:
+        width, height = size[0] + self.padding, size[1] + self.padding
+        if size[0] > self.sheet_size[0] or size[1] > self.sheet_size[1]:
+            raise ValueError(f"Card {size[0]}x{size[1]} does not fit a {self.sheet_size[0]}x{self.sheet_size[1]} sheet")
+        for shelf in self._shelves:
+            y, shelf_height, used = shelf
+            if height <= shelf_height and used + size[0] <= self.sheet_size[0]:
+                shelf[2] = used + width
+                self._width = max(self._width, used + size[0])
+                return used, y
+        top = self._shelves[-1][0] + self._shelves[-1][1] if self._shelves else 0
+        if top + size[1] > self.sheet_size[1]:
+            return None
+        self._shelves.append([top, height, width])
+        self._width = max(self._width, size[0])
+        return 0, top
+
+    def used_size(self) -> Tuple[int, int]:
+        if not self._shelves:
+            return 0, 0
+        y, height, _ = self._shelves[-1]
+        return self._width, min(self.sheet_size[1], y + height - self.padding)
+
+
+# ----------------------------------------------------------------------
+# Аркуші й індекс
+# ----------------------------------------------------------------------
+@dataclass
+class AtlasSheet:
+    file: str
+    cards: List[Dict] = field(default_factory=list)
+    back: Optional[List[int]] = None
+    size: Tuple[int, int] = (0, 0)
+
+
+class AtlasBuilder:
+    """Incrementally packs card images into sheets written to ``out_dir``.
+
+    Sheets are ``<basename>-01.png`` … (extension from ``profile``) and
+    the index is ``<basename>.json``. Call :meth:`add` per card and
+    :meth:`finish` at the end; leaving the ``with`` block without
+    :meth:`finish` only waits for the queued sheets. Sheets listed by a
+    previous index in the directory but not written again are removed.
+    """
+
+    def __init__(
+        self,
+        out_dir: str,
+        basename: str,
+        mode: str = "grid",
+        grid: Tuple[int, int] = ATLAS_GRID,
+        reserve_back: bool = False,
+        back=None,
+        max_sheet_size: Tuple[int, int] = ATLAS_MAX_SHEET,
+        padding: int = 0,
+        profile=None,
+    ):
+        if mode not in ATLAS_MODES:
+            raise ValueError(f"Unknown atlas mode: {mode!r} (known: {', '.join(ATLAS_MODES)})")
+        self.out_dir = out_dir
+        self.basename = basename
+        self.mode = mode
+        self.grid = grid
+        self.reserve_back = reserve_back or back is not None
+        self.back = as_pil(back) if back is not None else None
+        self.max_sheet_size = max_sheet_size
+        self.padding = padding
+        self.profile: EncoderProfile = get_profile(profile)
+        self.sheets: List[AtlasSheet] = []
+        self.cell: Optional[Tuple[int, int]] = None
+        self._placer = None
+        self._sheet: Optional[Image.Image] = None
+        self._pool = BufferPool(lambda size: Image.new("RGBA", size), maxsize=ATLAS_SHEET_BUFFERS)
+        os.makedirs(out_dir, exist_ok=True)
+        self._encoder = EncodeQueue(maxsize=1, profile=self.profile)
+
+    def __enter__(self) -> "AtlasBuilder":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self._encoder.close()
+
+    # ------------------------------------------------------------------
+    def add(self, name: str, image, meta: Optional[Dict] = None) -> Dict:
+        """Paste a rendered card (PIL or ``QImage``); returns its index entry."""
+        image = as_pil(image)
+        if self._placer is None:
+            self._placer = self._make_placer(image.size)
+        if self.mode == "grid" and image.size != self.cell:
+            # Сітка однорідна: картку іншого розміру вписуємо в клітинку.
+            image = image.resize(self.cell, Image.LANCZOS)
+        if self._sheet is None:
+            self._start_sheet()
+        origin = self._placer.place(image.size)
+        if origin is None:
+            if not self.sheets[-1].cards:
+                # Порожній аркуш — на новому буде те саме місце поруч зі зворотом.
+                raise ValueError(f"Card {image.width}x{image.height} does not fit a sheet next to the back")
+            self._flush_sheet()
+            self._start_sheet()
+            origin = self._placer.place(image.size)
+        self._sheet.paste(image, origin)
+        entry = dict(meta or {}, name=name, sheet=len(self.sheets) - 1, rect=[*origin, *image.size])
+        self.sheets[-1].cards.append(entry)
+        return entry
+
+    def finish(self, extra: Optional[Dict] = None) -> str:
+        """Write the last sheet and the JSON index; returns the index path."""
+        if self._sheet is not None:
+            self._flush_sheet()
+        self._encoder.close()
+        cards = []
+        for sheet in self.sheets:
+            for entry in sheet.cards:
+                entry["uv"] = _uv(entry["rect"], sheet.size)
+                cards.append(entry)
+        index = dict(
+            extra or {},
+            version=ATLAS_INDEX_VERSION,
+            mode=self.mode,
+            sheets=[
+                {
+                    "file": sheet.file,
+                    "size": list(sheet.size),
+                    "cards": len(sheet.cards),
+                    "back": {"rect": sheet.back, "uv": _uv(sheet.back, sheet.size)} if sheet.back else None,
+                }
+                for sheet in self.sheets
+            ],
+            cards=cards,
+        )
+        if self.mode == "grid" and self.cell is not None:
+            index.update(grid=list(self.grid), cell=list(self.cell), reserve_back=self.reserve_back)
+        path = os.path.join(self.out_dir, f"{self.basename}.json")
+        self._remove_stale_sheets(path)
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as fh:
+            json.dump(index, fh, indent=2, ensure_ascii=False)
+        os.replace(tmp_path, path)
+        return path
+
+    # ------------------------------------------------------------------
+    def _make_placer(self, first_size: Tuple[int, int]):
+        if self.mode == "grid":
+            self.cell = first_size
+            return GridPlacer(self.cell, self.grid[0], self.grid[1], self.reserve_back)
+        return ShelfPacker(self.max_sheet_size, self.padding)
+
+    def _start_sheet(self) -> None:
+        self._placer.reset()
+        self._sheet = self._pool.acquire(self._placer.sheet_size)
+        self._sheet.paste((0, 0, 0, 0), (0, 0, *self._sheet.size))
+        sheet = AtlasSheet(file=f"{self.basename}-{len(self.sheets) + 1:02d}{self.profile.extension}")
+        self.sheets.append(sheet)
+        if self.back is None and not (self.reserve_back and self.mode == "grid"):
+            return
+        if self.mode == "grid":
+            origin, size = self._placer.back_origin, self.cell
+            if self.back is not None:
+                back = self.back if self.back.size == size else self.back.resize(size, Image.LANCZOS)
+                self._sheet.paste(back, origin)
+        else:
+            origin, size = self._placer.place(self.back.size), self.back.size
+            self._sheet.paste(self.back, origin)
+        sheet.back = [*origin, *size]
+
+    def _remove_stale_sheets(self, index_path: str) -> None:
+        """Delete sheets of a previous export that this one did not rewrite."""
+        try:
+            with open(index_path, "r", encoding="utf-8") as fh:
+                previous = json.load(fh).get("sheets", [])
+        except (OSError, ValueError, AttributeError):
+            return
+        current = {sheet.file for sheet in self.sheets}
+        for sheet in previous:
+            name = sheet.get("file") if isinstance(sheet, dict) else None
+            if isinstance(name, str) and name not in current and os.path.basename(name) == name:
+                stale = os.path.join(self.out_dir, name)
+                if os.path.exists(stale):
+                    os.remove(stale)
+
+    def _flush_sheet(self) -> None:
+        sheet, buffer = self.sheets[-1], self._sheet
+        self._sheet = None
+        sheet.size = self._placer.used_size()
+        path = os.path.join(self.out_dir, sheet.file)
+        if sheet.size == buffer.size:
+            self._encoder.submit(buffer, path, done=self._pool.release)
+        else:
+            # Буфер повертається в пул лише після запису обрізаної копії —
+            # інакше наступні аркуші заповнювалися б, поки копії чекають у черзі.
+            self._encoder.submit(
+                buffer.crop((0, 0, *sheet.size)), path, done=lambda _crop, buffer=buffer: self._pool.release(buffer)
+            )
+
+
+def _uv(rect: List[int], sheet_size: Tuple[int, int]) -> List[float]:
+    x, y, w, h = rect
+    width, height = sheet_size
+    return [round(x / width, 6), round(y / height, 6), round((x + w) / width, 6), round((y + h) / height, 6)]
@@ -0,0 +1,140 @@
+"""Binary snapshot cache of normalized decks for fast reopen."""
+
+from __future__ import annotations
+
+import hashlib
+import os
+import pickle
+from typing import Optional
+
+from .json_loader import JSONLoader
+from .models import CardColumns, CompactCardList, DeckModel
+
+CACHE_DIR_NAME = ".deckcache"
+CACHE_MAGIC = b"CGDECK\x01\n"
+CACHE_FORMAT_VERSION = 1
+
+# Globals the snapshot unpickler may resolve; anything else is rejected.
+_ALLOWED_GLOBALS = {
+    ("array", "array"),
+    ("array", "_array_reconstructor"),
+    ("copyreg", "_reconstructor"),
+    ("builtins", "object"),
+    (CardColumns.__module__, "CardColumns"),
+}
+
+
+class DeckCache:
+    """Sidecar cache that stores a normalized, compact :class:`DeckModel`.
+
+    Snapshots live in ``<deck_folder>/.deckcache/<deck_name>.bin`` (or in
+    ``cache_dir`` when given) and are keyed by the SHA-1 of the deck file
+    plus a signature of the arts folder, so a changed deck or a new/removed
+    art file silently falls back to a full load.
+    """
+
+    def __init__(self, cache_dir: Optional[str] = None):
+        self.cache_dir = cache_dir
+
+    # ------------------------------------------------------------------
+    def cache_path(self, loader: JSONLoader) -> str:
+        folder = self.cache_dir or os.path.join(loader.deck_folder, CACHE_DIR_NAME)
+        return os.path.join(folder, f"{loader.deck_name}.bin")
+
+    # ------------------------------------------------------------------
+    def snapshot_key(self, loader: JSONLoader) -> str:
+        digest = hashlib.sha1()
+        digest.update(f"v{CACHE_FORMAT_VERSION}\0".encode())
+        with open(loader.deck_path, "rb") as fh:
+            for chunk in iter(lambda: fh.read(1024 * 1024), b""):
+                digest.update(chunk)
+        digest.update(b"\0")
+        digest.update(arts_signature(loader.arts_dir).encode("utf-8"))
+        return digest.hexdigest()
+
+    # ------------------------------------------------------------------
+    def load(self, loader: JSONLoader, key: Optional[str] = None) -> Optional[DeckModel]:
+        """Return the cached deck, or ``None`` when missing or stale."""
+        try:
+            key = key or self.snapshot_key(loader)
+            with open(self.cache_path(loader), "rb") as fh:
+                if fh.read(len(CACHE_MAGIC)) != CACHE_MAGIC:
+                    return None
+                if fh.readline().rstrip(b"\n").decode("ascii") != key:
+                    return None
+                state = _SnapshotUnpickler(fh).load()
+            # Знімок без потрібного ключа (чи не словник) — такий самий промах.
+            return DeckModel(
+                name=loader.deck_name,
+                path=loader.deck_path,
+                deck_color=state["deck_color"],
+                cards=CompactCardList(state["columns"]),
+                prompts=state["prompts"],
+                metadata=state["metadata"],
+            )
+        except (OSError, EOFError, ValueError, TypeError, AttributeError, KeyError, pickle.UnpicklingError):
+            return None
+
+    # ------------------------------------------------------------------
+    def store(self, loader: JSONLoader, deck: DeckModel, key: Optional[str] = None) -> None:
+        """Write ``deck`` as the snapshot for ``loader``'s file.
+
+        Regular decks are converted to columns first. Errors are ignored:
+        the cache is an optimization, not a requirement.
+        """
+        if isinstance(deck.cards, CompactCardList):
+            columns = deck.cards.columns
+        else:
+            columns = CardColumns(deck_color=deck.deck_color, prompts=deck.prompts)
+            for card in deck.cards:
+                columns.append(card.payload)
+        state = {
+            "deck_color": deck.deck_color,
+            "prompts": deck.prompts,
+            "metadata": deck.metadata,
+            "columns": columns,
+        }
+        path = self.cache_path(loader)
+        tmp_path = f"{path}.tmp"
+        try:
+            key = key or self.snapshot_key(loader)
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            with open(tmp_path, "wb") as fh:
+                fh.write(CACHE_MAGIC)
+                fh.write(key.encode("ascii") + b"\n")
+                pickle.dump(state, fh, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp_path, path)
+        except OSError:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+
+    # ------------------------------------------------------------------
+    def load_or_build(self, loader: JSONLoader) -> DeckModel:
+        """Return the cached deck, rebuilding and storing it on a miss."""
+        key = self.snapshot_key(loader)
+        deck = self.load(loader, key)
+        if deck is None:
+            deck = loader.load(compact=True)
+            self.store(loader, deck, key)
+        return deck
+
+
+def arts_signature(arts_dir: str) -> str:
+    """Describe the arts folder by file names, sizes and modification times."""
+    if not os.path.isdir(arts_dir):
+        return f"{arts_dir}|-"
+    entries = []
+    with os.scandir(arts_dir) as it:
+        for entry in it:
+            if entry.is_file():
+                stat = entry.stat()
+                entries.append(f"{entry.name}:{stat.st_size}:{stat.st_mtime_ns}")
+    entries.sort()
+    return f"{arts_dir}|" + "|".join(entries)
+
+
+class _SnapshotUnpickler(pickle.Unpickler):
+    def find_class(self, module, name):
+        if (module, name) not in _ALLOWED_GLOBALS:
+            raise pickle.UnpicklingError(f"Заборонений тип у кеші колоди: {module}.{name}")
+        return super().find_class(module, name)
@@ -0,0 +1,75 @@
+"""Work out which cards need re-rendering after deck or art changes."""
+
+from __future__ import annotations
+
+import os
+from typing import Dict, Iterable, List, Set, Tuple
+
+from .models import CardModel, DeckModel
+
+ArtSnapshot = Dict[str, Tuple[int, int]]
+
+
+def art_snapshot(arts_dir: str) -> ArtSnapshot:
+    """Return ``{file name: (size, mtime_ns)}`` for files in ``arts_dir``."""
+    snapshot: ArtSnapshot = {}
+    if not os.path.isdir(arts_dir):
+        return snapshot
+    with os.scandir(arts_dir) as it:
+        for entry in it:
+            if entry.is_file():
+                stat = entry.stat()
+                snapshot[entry.name] = (stat.st_size, stat.st_mtime_ns)
+    return snapshot
+
+
+def changed_art_files(old: ArtSnapshot, new: ArtSnapshot) -> Set[str]:
+    """Names of art files that were added, removed or rewritten."""
+    changed = set(old.keys() ^ new.keys())
+    changed.update(name for name in old.keys() & new.keys() if old[name] != new[name])
+    return changed
+
+
+def card_identity(name: str, name_counts: Dict[str, int]) -> str:
+    """Identify a card by name and occurrence, so reordering keeps files."""
+    occurrence = name_counts.get(name, 0) + 1
+    name_counts[name] = occurrence
+    return f"{name}#{occurrence}"
+
+
+def card_identities(cards: Iterable[CardModel]) -> List[str]:
+    """``name#occurrence`` of every card, as in the export manifest."""
+    name_counts: Dict[str, int] = {}
+    return [card_identity(card.name, name_counts) for card in cards]
+
+
+def affected_card_indices(old: DeckModel, new: DeckModel, changed_arts: Iterable[str] = ()) -> Set[int]:
+    """Indices of ``new`` cards whose rendered output may differ from ``old``.
+
+    Cards are matched by :func:`card_identity`, so inserting, removing or
+    moving a card leaves the others alone. A card is affected when its
+    normalized payload changed (this also covers an art file appearing or
+    disappearing, because ``art_path`` is part of the payload), when it is
+    new, or when the art file it uses was rewritten. A deck colour change
+    affects every card.
+    """
+    if old.deck_color != new.deck_color:
+        return set(range(len(new)))
+    changed_arts = set(changed_arts)
+    old_payloads = {identity: card.payload for identity, card in zip(card_identities(old.cards), old.cards)}
+    affected: Set[int] = set()
+    for index, (identity, card) in enumerate(zip(card_identities(new.cards), new.cards)):
+        payload = card.payload
+        if old_payloads.get(identity) != payload:
+            affected.add(index)
+            continue
+        art_path = payload.get("art_path")
+        if art_path and os.path.basename(art_path) in changed_arts:
+            affected.add(index)
+    return affected
+
+
+def removed_card_indices(old: DeckModel, new: DeckModel) -> List[int]:
+    """Indices of ``old`` cards whose identity is gone from ``new``."""
+    kept = set(card_identities(new.cards))
+    return [index for index, identity in enumerate(card_identities(old.cards)) if identity not in kept]
@@ -0,0 +1,144 @@
+"""Prebuilt search index over the cards of a deck.
+
+The index keeps one casefolded string per card for free-text search over
+name, type and cost type, plus integer columns for the numeric stats, so a
+query over a 10k-card deck is a tight scan over flat arrays instead of
+materializing every card payload.
+
+Query syntax — whitespace-separated terms, all of which must match::
+
+    storm               name / type / cost type contains "storm"
+    type:unit           type contains "unit" (also name:, cost_type:)
+    atk>=3  cost<2      numeric stat comparison (>, >=, <, <=, =, !=)
+    rng:x               stat equals the literal value (for non-numeric stats)
+"""
+
+from __future__ import annotations
+
+import operator
+import re
+from array import array
+from typing import Callable, Dict, Iterable, List, Optional, Sequence
+
+from .models import _NO_VALUE, STAT_FIELDS, CompactCardList
+
+TEXT_FIELDS = ("name", "type", "cost_type")
+_TERM_RE = re.compile(r"^(?P<field>[a-z_]+)(?P<op>>=|<=|!=|:|=|>|<)(?P<value>.+)$")
+_NUMERIC_OPS: Dict[str, Callable[[int, int], bool]] = {
+    ">": operator.gt,
+    ">=": operator.ge,
+    "<": operator.lt,
+    "<=": operator.le,
+    "=": operator.eq,
+    ":": operator.eq,
+    "!=": operator.ne,
+}
+
+
+class DeckSearchIndex:
+    """Search index over the cards of one deck, extendable while streaming.
+
+    Row ``i`` of the index is deck index ``i``; :meth:`filter` returns the
+    matching deck indices in ascending order.
+    """
+
+    def __init__(self, cards: Iterable = ()):
+        self._text: Dict[str, List[str]] = {key: [] for key in TEXT_FIELDS}
+        self._haystack: List[str] = []
+        self._stats: Dict[str, array] = {key: array("i") for key in STAT_FIELDS}
+        # Нечислові значення статів ("X", "*") — лише для точного збігу.
+        self._stat_text: Dict[str, Dict[int, str]] = {key: {} for key in STAT_FIELDS}
+        self._last_query: Optional[str] = None
+        self._last_result: Optional[array] = None
+        self.extend(cards)
+
+    def __len__(self) -> int:
+        return len(self._haystack)
+
+    # ------------------------------------------------------------------
+    def extend(self, cards: Iterable) -> None:
+        """Index ``cards`` as the next deck rows."""
+        if isinstance(cards, CompactCardList):
+            self._extend_columns(cards)
+        else:
+            for card in cards:
+                self._add(card.name, card.get("type"), card.get("cost_type"), card.get)
+        self._last_query = self._last_result = None
+
+    def _extend_columns(self, cards: CompactCardList) -> None:
+        columns = cards.columns
+        for row in range(len(columns)):
+            self._add(
+                columns.names[row] or f"Card {row + 1}",
+                columns.types[row],
+                columns.cost_types[row],
+                lambda key, default=None, row=row: columns.value(row, key, default),
+                stats={key: column[row] for key, column in columns.stats.items()},
+            )
+
+    def _add(self, name, card_type, cost_type, get, stats: Optional[Dict[str, int]] = None) -> None:
+        row = len(self._haystack)
+        values = (_fold(name), _fold(card_type), _fold(cost_type))
+        for key, value in zip(TEXT_FIELDS, values):
+            self._text[key].append(value)
+        self._haystack.append("\n".join(values))
+        for key, column in self._stats.items():
+            value = stats[key] if stats is not None and stats[key] != _NO_VALUE else get(key)
+            if isinstance(value, int) and not isinstance(value, bool) and _NO_VALUE < value < 2 ** 31:
+                column.append(value)
+                continue
+            column.append(_NO_VALUE)
+            if value is not None:
+                self._stat_text[key][row] = _fold(value)
+
+    # ------------------------------------------------------------------
+    def filter(self, query: str) -> Optional[array]:
+        """Deck indices of the cards matching ``query``, ascending.
+
+        An empty query returns ``None`` — "every card" — so callers can
+        keep the identity mapping without allocating it.
+        """
+        terms = _fold(query).split()
+        if not terms:
+            return None
+        query = " ".join(terms)
+        if query == self._last_query:
+            return self._last_result
+        rows: Sequence[int] = range(len(self))
+        for term in terms:
+            rows = self._match(term, rows)
+            if not rows:
+                break
+        result = array("i", rows)
+        self._last_query, self._last_result = query, result
+        return result
+
+    def _match(self, term: str, rows: Sequence[int]) -> List[int]:
+        match = _TERM_RE.match(term)
+        if match is not None:
+            field, op, value = match.group("field", "op", "value")
+            if field in self._stats:
+                return self._match_stat(field, op, value, rows)
+            if field in self._text and op == ":":
+                column = self._text[field]
+                return [row for row in rows if value in column[row]]
+        haystack = self._haystack
+        return [row for row in rows if term in haystack[row]]
+
+    def _match_stat(self, field: str, op: str, value: str, rows: Sequence[int]) -> List[int]:
+        column = self._stats[field]
+        try:
+            number = int(value)
+        except ValueError:
+            if op not in (":", "=", "!="):
+                return []
+            text = self._stat_text[field]
+            if op == "!=":
+                return [row for row in rows if text.get(row) != value]
+            return [row for row in rows if text.get(row) == value]
+        compare = _NUMERIC_OPS[op]
+        return [row for row in rows if column[row] != _NO_VALUE and compare(column[row], number)]
+
+
+def _fold(value) -> str:
+    return "" if value is None else str(value).casefold()
@@ -0,0 +1,98 @@
+"""Debounced file watcher for hot reloading decks, arts, frame and layout."""
+
+from __future__ import annotations
+
+import os
+from typing import Dict, Iterable, Optional, Set
+
+from PySide6.QtCore import QFileSystemWatcher, QObject, QTimer, Signal
+
+DEBOUNCE_MS = 300
+
+KIND_DECK = "deck"
+KIND_ARTS = "arts"
+KIND_FRAME = "frame"
+KIND_LAYOUT = "layout"
+
+
+class DeckWatcher(QObject):
+    """Watches the current deck's inputs and reports bursts of changes once.
+
+    ``changed`` is emitted with the set of kinds (``"deck"``, ``"arts"``,
+    ``"frame"``, ``"layout"``) touched since the last emission, after
+    ``DEBOUNCE_MS`` of quiet. Paths replaced by atomic saves are re-added.
+    """
+
+    changed = Signal(object)
+
+    def __init__(self, parent: Optional[QObject] = None):
+        super().__init__(parent)
+        self._watcher = QFileSystemWatcher(self)
+        self._watcher.fileChanged.connect(self._on_path_changed)
+        self._watcher.directoryChanged.connect(self._on_path_changed)
+        self._kinds: Dict[str, str] = {}
+        self._pending: Set[str] = set()
+        self._timer = QTimer(self)
+        self._timer.setSingleShot(True)
+        self._timer.setInterval(DEBOUNCE_MS)
+        self._timer.timeout.connect(self._flush)
+
+    # ------------------------------------------------------------------
+    def watch(
+        self,
+        *,
+        deck_path: Optional[str] = None,
+        arts_dir: Optional[str] = None,
+        frame_path: Optional[str] = None,
+        layout_path: Optional[str] = None,
+        art_files: Iterable[str] = (),
+    ) -> None:
+        """Replace the watched set. ``art_files`` catches in-place art edits."""
+        self.stop()
+        kinds: Dict[str, str] = {}
+        for path, kind in (
+            (deck_path, KIND_DECK),
+            (arts_dir, KIND_ARTS),
+            (frame_path, KIND_FRAME),
+            (layout_path, KIND_LAYOUT),
+        ):
+            if path:
+                kinds[os.path.abspath(path)] = kind
+        for path in art_files:
+            if path:
+                kinds.setdefault(os.path.abspath(path), KIND_ARTS)
+        self._kinds = kinds
+        existing = [path for path in kinds if os.path.exists(path)]
+        if existing:
+            self._watcher.addPaths(existing)
+
+    # ------------------------------------------------------------------
+    def stop(self) -> None:
+        self._timer.stop()
+        self._pending.clear()
+        watched = self._watcher.files() + self._watcher.directories()
+        if watched:
+            self._watcher.removePaths(watched)
+        self._kinds = {}
+
+    # ------------------------------------------------------------------
+    def _on_path_changed(self, path: str) -> None:
+        kind = self._kinds.get(os.path.abspath(path))
+        if kind is None:
+            return
+        # Editors often save by replacing the file, which drops the watch.
+        if os.path.exists(path) and path not in self._watcher.files() + self._watcher.directories():
+            self._watcher.addPath(path)
+        self._pending.add(kind)
+        self._timer.start()
+
+    # ------------------------------------------------------------------
+    def _flush(self) -> None:
+        # A replaced file may only reappear after the debounce window.
+        watched = set(self._watcher.files() + self._watcher.directories())
+        missing = [path for path in self._kinds if path not in watched and os.path.exists(path)]
+        if missing:
+            self._watcher.addPaths(missing)
+        kinds, self._pending = self._pending, set()
+        if kinds:
+            self.changed.emit(kinds)
@@ -0,0 +1,180 @@
+"""Export encoder profiles: compression level, palette and format per use.
+
+=============  ===================================================
+``default``    PNG with the encoder's own settings (previous output)
+``fast``       PNG, zlib level 1 — quickest, largest files
+``archival``   PNG, zlib level 9 + optimize — smallest lossless PNG
+``web``        lossless WebP
+``web_png``    PNG quantized to a 256-colour palette
+=============  ===================================================
+
+Profiles encode PIL images directly and ``QImage`` either natively
+(``default``) or through Pillow, so both renderers produce the same files.
+Pillow releases the GIL while compressing, so several encoder threads
+(:class:`core.export_pipeline.EncodeQueue` ``workers``) scale with cores.
+
+``python -m core.encoder_profiles card.png ...`` prints bytes versus time
+for every profile on sample cards.
+"""
+
+from __future__ import annotations
+
+import io
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Dict, Iterable, List, Optional, Sequence
+
+from PIL import Image
+
+DEFAULT_PROFILE = "default"
+DEFAULT_ENCODE_WORKERS = max(1, min(4, os.cpu_count() or 1))
+
+
+@dataclass(frozen=True)
+class EncoderProfile:
+    name: str
+    format: str = "PNG"
+    compress_level: Optional[int] = None
+    optimize: bool = False
+    colors: int = 0  # >0 — квантизація до палітри
+    lossless: bool = False
+    method: int = 4  # WebP: 0 (швидко) … 6 (щільно)
+
+    @property
+    def extension(self) -> str:
+        return ".webp" if self.format == "WEBP" else ".png"
+
+    @property
+    def native(self) -> bool:
+        """Encoder defaults, so ``QImage`` can keep its own PNG writer."""
+        return self == EncoderProfile(self.name)
+
+    # ------------------------------------------------------------------
+    def save(self, image, target, dpi: Optional[int] = None) -> None:
+        """Encode ``image`` (PIL or ``QImage``) to a path or binary file."""
+        if not isinstance(image, Image.Image):
+            if self.native and isinstance(target, str):
+                if not image.save(target, self.format):
+                    raise OSError(f"Could not write {target}")
+                return
+            from .qt_images import qimage_to_pil
+
+            dpi = dpi or round(image.dotsPerMeterX() * 0.0254) or None
+            image = qimage_to_pil(image)
+        image = self.prepare(image)
+        image.save(target, format=self.format, **self._options(dpi))
+
+    def encode(self, image, dpi: Optional[int] = None) -> bytes:
+        buffer = io.BytesIO()
+        self.save(image, buffer, dpi)
+        return buffer.getvalue()
+
+    def _options(self, dpi: Optional[int]) -> dict:
+        if self.format == "WEBP":
+            return {"lossless": self.lossless, "method": self.method}
+        options = {"optimize": self.optimize}
+        if self.compress_level is not None:
+            options["compress_level"] = self.compress_level
+        if dpi:
+            options["dpi"] = (dpi, dpi)
+        return options
+
+    def prepare(self, image: Image.Image) -> Image.Image:
+        """Palette profiles quantize before encoding."""
+        if not self.colors:
+            return image
+        if image.mode not in ("RGB", "RGBA"):
+            image = image.convert("RGBA")
+        return image.quantize(colors=self.colors, method=Image.Quantize.FASTOCTREE)
+
+
+PROFILES: Dict[str, EncoderProfile] = {
+    profile.name: profile
+    for profile in (
+        EncoderProfile(DEFAULT_PROFILE),
+        EncoderProfile("fast", compress_level=1),
+        EncoderProfile("archival", compress_level=9, optimize=True),
+        EncoderProfile("web", format="WEBP", lossless=True),
+        EncoderProfile("web_png", optimize=True, colors=256),
+    )
+}
+
+
+def get_profile(profile) -> EncoderProfile:
+    """Profile by name; ``None`` is :data:`DEFAULT_PROFILE`."""
+    if isinstance(profile, EncoderProfile):
+        return profile
+    try:
+        return PROFILES[profile or DEFAULT_PROFILE]
+    except KeyError:
+        raise ValueError(f"Unknown encoder profile: {profile!r} (known: {', '.join(PROFILES)})") from None
+
+
+# ----------------------------------------------------------------------
+# Звіт: байти проти часу
+# ----------------------------------------------------------------------
+@dataclass
+class ProfileReport:
+    profile: str
+    files: int
+    bytes: int
+    seconds: float
+    workers: int
+
+    @property
+    def bytes_per_file(self) -> float:
+        return self.bytes / self.files if self.files else 0.0
+
+    @property
+    def ms_per_file(self) -> float:
+        return self.seconds * 1000 / self.files if self.files else 0.0
+
+
+def profile_report(
+    images: Sequence[Image.Image],
+    profiles: Iterable = PROFILES,
+    workers: int = DEFAULT_ENCODE_WORKERS,
+    dpi: Optional[int] = None,
+) -> List[ProfileReport]:
+    """Encode ``images`` in memory with each profile on ``workers`` threads."""
+    reports = []
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        for profile in map(get_profile, profiles):
+            started = time.perf_counter()
+            sizes = list(pool.map(lambda image: len(profile.encode(image, dpi)), images))
+            reports.append(ProfileReport(profile.name, len(sizes), sum(sizes), time.perf_counter() - started, workers))
+    return reports
+
+
+def format_report(reports: Sequence[ProfileReport]) -> str:
+    lines = [f"{'profile':<10} {'files':>5} {'KiB/file':>9} {'ms/file':>8} {'workers':>7}"]
+    for report in reports:
+        lines.append(
+            f"{report.profile:<10} {report.files:>5} {report.bytes_per_file / 1024:>9.1f} "
+            f"{report.ms_per_file:>8.1f} {report.workers:>7}"
+        )
+    return "\n".join(lines)
+
+
+def main(argv=None) -> int:
+    """``python -m core.encoder_profiles cards/*.png`` — compare profiles."""
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Compare export encoder profiles on rendered cards.")
+    parser.add_argument("images", nargs="+", help="відрендерені картки (PNG)")
+    parser.add_argument("--profile", action="append", choices=sorted(PROFILES), help="лише ці профілі")
+    parser.add_argument("--workers", type=int, default=DEFAULT_ENCODE_WORKERS)
+    args = parser.parse_args(argv)
+
+    images = []
+    for path in args.images:
+        with Image.open(path) as img:
+            images.append(img.convert("RGBA"))
+    print(format_report(profile_report(images, args.profile or PROFILES, workers=args.workers)))
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
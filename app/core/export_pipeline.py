@@ -0,0 +1,165 @@
+"""Render/encode overlap for card export.
+
+Export used to allocate a fresh card-sized image per card and encode it
+synchronously before the next card could render. Here rendered images come
+from a :class:`BufferPool` and are handed to an :class:`EncodeQueue`, whose
+worker thread encodes and writes them while the GUI thread renders the
+next card. Qt and Pillow release the GIL while encoding, so the stages
+really run in parallel, and several encoder threads scale with cores.
+Buffers are whatever the factory returns; queued images are written by an
+:class:`~core.encoder_profiles.EncoderProfile`.
+"""
+
+from __future__ import annotations
+
+import os
+import queue
+import threading
+import time
+from typing import Callable, Dict, Hashable, List, Optional
+
+from .encoder_profiles import EncoderProfile, get_profile
+
+# Рендер + кодування + черга: більше буферів лише їстиме пам'ять.
+EXPORT_QUEUE_SIZE = 2
+EXPORT_BUFFERS = EXPORT_QUEUE_SIZE + 2
+
+_STOP = object()
+
+
+class BufferPool:
+    """Reusable buffers, at most ``maxsize`` per key.
+
+    :meth:`acquire` blocks while every buffer of the key is in use, which
+    is the back-pressure that keeps rendering at most a few cards ahead of
+    encoding.
+    """
+
+    def __init__(self, factory: Callable[[Hashable], object], maxsize: int = EXPORT_BUFFERS):
+        self.factory = factory
+        self.maxsize = maxsize
+        self.created = 0
+        self._free: Dict[Hashable, List[object]] = {}
+        self._in_use: Dict[int, Hashable] = {}
+        self._counts: Dict[Hashable, int] = {}
+        self._cond = threading.Condition()
+
+    # ------------------------------------------------------------------
+    def acquire(self, key: Hashable):
+        with self._cond:
+            while True:
+                free = self._free.get(key)
+                if free:
+                    buffer = free.pop()
+                    break
+                if self._counts.get(key, 0) < self.maxsize:
+                    buffer = self.factory(key)
+                    self._counts[key] = self._counts.get(key, 0) + 1
+                    self.created += 1
+                    break
+                self._cond.wait()
+            self._in_use[id(buffer)] = key
+            return buffer
+
+    def release(self, buffer) -> None:
+        with self._cond:
+            key = self._in_use.pop(id(buffer))
+            self._free.setdefault(key, []).append(buffer)
+            self._cond.notify_all()
+
+    def clear(self) -> None:
+        """Drop idle buffers (e.g. after the card size changed)."""
+        with self._cond:
+            for key, free in self._free.items():
+                self._counts[key] -= len(free)
+            self._free.clear()
+
+
+class EncodeQueue:
+    """Bounded queue of images encoded and written by worker threads.
+
+    :meth:`submit` blocks while ``maxsize`` images are waiting. The first
+    write error is re-raised by :meth:`close`; later jobs are still drained
+    so their ``done`` callbacks run and pooled buffers are returned.
+    ``written``, ``bytes_written`` and ``encode_seconds`` (summed over
+    workers) feed the export report.
+    """
+
+    def __init__(self, maxsize: int = EXPORT_QUEUE_SIZE, workers: int = 1, profile=None):
+        self.profile: EncoderProfile = get_profile(profile)
+        self.workers = max(1, workers)
+        self.written = 0
+        self.bytes_written = 0
+        self.encode_seconds = 0.0
+        self._queue: "queue.Queue" = queue.Queue(maxsize)
+        self._error: Optional[BaseException] = None
+        self._stats_lock = threading.Lock()
+        self._threads: Optional[List[threading.Thread]] = [
+            threading.Thread(target=self._run, name=f"card-encode-{i}", daemon=True) for i in range(self.workers)
+        ]
+        for thread in self._threads:
+            thread.start()
+
+    def __enter__(self) -> "EncodeQueue":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.close()
+
+    # ------------------------------------------------------------------
+    @property
+    def capacity(self) -> int:
+        """Images that can be queued or encoding at once."""
+        return self._queue.maxsize + self.workers
+
+    def submit(self, image, target, done: Optional[Callable[[object], None]] = None) -> None:
+        """Queue ``image`` for writing; ``done(image)`` runs afterwards.
+
+        ``target`` is a file path or a ``write(data)`` callable that takes
+        the encoded bytes (e.g. an archive entry).
+        """
+        if self._threads is None:
+            raise RuntimeError("EncodeQueue is closed")
+        self._queue.put((image, target, done))
+
+    def close(self) -> None:
+        """Wait for every queued image to be written."""
+        if self._threads is None:
+            return
+        for _ in self._threads:
+            self._queue.put(_STOP)
+        for thread in self._threads:
+            thread.join()
+        self._threads = None
+        if self._error is not None:
+            raise self._error
+
+    # ------------------------------------------------------------------
+    def _run(self) -> None:
+        while True:
+            job = self._queue.get()
+            if job is _STOP:
+                return
+            image, target, done = job
+            try:
+                if self._error is None:
+                    started = time.perf_counter()
+                    if callable(target):
+                        data = self.profile.encode(image)
+                        elapsed = time.perf_counter() - started
+                        target(data)
+                        size = len(data)
+                    else:
+                        self.profile.save(image, target)
+                        elapsed = time.perf_counter() - started
+                        size = os.path.getsize(target)
+                    with self._stats_lock:
+                        self.written += 1
+                        self.bytes_written += size
+                        self.encode_seconds += elapsed
+            except Exception as exc:
+                # Помилку підніме close() у потоці, що експортує.
+                self._error = exc
+            finally:
+                if done is not None:
+                    done(image)
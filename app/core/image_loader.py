@@ -1,23 +1,198 @@
+"""Decoded-image service shared by the PIL and Qt renderers."""
+
+from __future__ import annotations
+
+import logging
 import os
+from dataclasses import dataclass
+from typing import Optional, Tuple
+
 from PIL import Image
 
+from .lru import LRUCache, process_wide
+
+logger = logging.getLogger("card_generator.image_loader")
+
+DEFAULT_BUDGET_BYTES = 256 * 1024 * 1024
+# Shrink by integer factors (JPEG draft / Image.reduce) only down to this
+# multiple of the target size; LANCZOS does the rest. Pillow documents 3.0
+# as visually indistinguishable from a full-resolution resample.
+REDUCING_GAP = 3.0
+# Modes Image.reduce accepts (not P, I;16, ...
+REDUCIBLE_MODES = {"L", "LA", "RGB", "RGBA", "RGBX", "CMYK"}
+
+
+@dataclass(frozen=True)
+class CacheStats:
+    hits: int
+    misses: int
+    evictions: int
+    entries: int
+    bytes_used: int
+    budget_bytes: int
+
 
 class ImageLoader:
-    def __init__(self):
-        pass
+    """Loads images as RGBA and keeps decoded/scaled results in an LRU.
+
+    The cache is bounded by ``budget_bytes`` of pixel data. Keys include the
+    file's mtime and size, so a rewritten file is decoded again. Returned
+    images are shared between callers: treat them as read-only and
+    ``copy()`` before mutating. All methods are thread-safe.
 
-    def load(self, path):
-        """Load image safely. Returns None if file not found."""
-        if not path or not os.path.exists(path):
+    With ``reduced_decode`` (the default) :meth:`load_scaled` decodes
+    oversized files close to the target size (JPEG draft mode and
+    ``Image.reduce``) before the final LANCZOS pass, and does not keep the
+    full-resolution image around.
+    """
+
+    def __init__(self, budget_bytes: int = DEFAULT_BUDGET_BYTES, reduced_decode: bool = True):
+        self.budget_bytes = budget_bytes
+        self.reduced_decode = reduced_decode
+        self._cache = LRUCache(budget_bytes, weigh=image_nbytes)
+
+    # ------------------------------------------------------------------
+    def load(self, path) -> Optional[Image.Image]:
+        """Load image safely. Returns None if file is missing or unreadable."""
+        file_key = self._file_key(path)
+        if file_key is None:
+            return None
+        key = ("full",) + file_key
+        img = self._cache.get(key)
+        if img is not None:
+            return img
+        img = self._decode(file_key[0])
+        if img is not None:
+            self._cache.put(key, img)
+        return img
+
+    # ------------------------------------------------------------------
+    def load_scaled(self, path, width, height, keep_aspect: bool = False) -> Optional[Image.Image]:
+        """Load and resize image.
+
+        With ``keep_aspect`` the result fits inside ``width`` x ``height``
+        the way Qt's ``KeepAspectRatio`` does.
+        """
+        file_key = self._file_key(path)
+        if file_key is None:
+            return None
+        box = (int(width), int(height))
+        if box[0] <= 0 or box[1] <= 0:
             return None
+        full_key = ("full",) + file_key
+        key = ("scaled",) + file_key + box + (keep_aspect,)
+        img = self._get_scaled(key, full_key, box, keep_aspect)
+        if img is not None:
+            return img
+        source = self._cache.peek(full_key)
+        if not self.reduced_decode:
+            if source is None:
+                source = self._decode(file_key[0])
+                if source is None:
+                    return None
+                self._cache.put(full_key, source)
+            img = _resize(source, box, keep_aspect, reducing_gap=None)
+        elif source is not None:
+            img = _resize(source, box, keep_aspect, REDUCING_GAP)
+        else:
+            img = self._decode_scaled(file_key[0], box, keep_aspect)
+        # Without a resize this is the image under full_key; a second entry
+        # would count its bytes twice.
+        if img is not None and img is not source:
+            self._cache.put(key, img)
+        return img
+
+    # ------------------------------------------------------------------
+    def stats(self) -> CacheStats:
+        cache = self._cache
+        return CacheStats(
+            hits=cache.hits,
+            misses=cache.misses,
+            evictions=cache.evictions,
+            entries=len(cache),
+            bytes_used=cache.weight,
+            budget_bytes=self.budget_bytes,
+        )
+
+    # ------------------------------------------------------------------
+    def clear(self) -> None:
+        self._cache.clear()
+
+    # ------------------------------------------------------------------
+    def _file_key(self, path) -> Optional[Tuple]:
+        if not path:
+            return None
+        try:
+            stat = os.stat(path)
+        except OSError:
+            return None
+        return (os.path.abspath(path), stat.st_mtime_ns, stat.st_size)
+
+    def _decode(self, path: str) -> Optional[Image.Image]:
         try:
-            return Image.open(path).convert("RGBA")
-        except:
+            with Image.open(path) as img:
+                return img.convert("RGBA")
+        except (OSError, ValueError, Image.DecompressionBombError) as exc:
+            logger.warning("Cannot decode image %s: %s", path, exc)
             return None
 
-    def load_scaled(self, path, width, height):
-        """Load and resize image."""
-        img = self.load(path)
-        if img is None:
+    def _decode_scaled(self, path: str, box: Tuple[int, int], keep_aspect: bool) -> Optional[Image.Image]:
+        """Decode close to the target size without caching the full image."""
+        try:
+            with Image.open(path) as img:
+                size = _target_size(img.size, box, keep_aspect)
+                if img.format == "JPEG":
+                    # DCT scaling (1/2, 1/4, 1/8) straight from the decoder.
+                    img.draft("RGB", (int(size[0] * REDUCING_GAP), int(size[1] * REDUCING_GAP)))
+                img.load()
+                factor = int(min(img.width / size[0], img.height / size[1]) / REDUCING_GAP)
+                if factor > 1 and img.mode in REDUCIBLE_MODES:
+                    # Box-reduce before the RGBA conversion touches every pixel.
+                    img = img.reduce(factor)
+                img = img.convert("RGBA")
+        except (OSError, ValueError, Image.DecompressionBombError) as exc:
+            logger.warning("Cannot decode image %s: %s", path, exc)
             return None
-        return img.resize((width, height), Image.LANCZOS)
+        if img.size == size:
+            return img
+        return img.resize(size, Image.LANCZOS)
+
+    def _get_scaled(self, key, full_key, box: Tuple[int, int], keep_aspect: bool) -> Optional[Image.Image]:
+        """Counted lookup of a scaled variant; a cached full image of that size is a hit."""
+        if self._cache.peek(key) is None:
+            source = self._cache.peek(full_key)
+            if source is not None and _target_size(source.size, box, keep_aspect) == source.size:
+                key = full_key
+        return self._cache.get(key)
+
+def _target_size(size: Tuple[int, int], box: Tuple[int, int], keep_aspect: bool) -> Tuple[int, int]:
+    return fit_size(size, box) if keep_aspect else box
+
+
+def _resize(source: Image.Image, box: Tuple[int, int], keep_aspect: bool, reducing_gap) -> Image.Image:
+    size = _target_size(source.size, box, keep_aspect)
+    if source.size == size:
+        return source
+    return source.resize(size, Image.LANCZOS, reducing_gap=reducing_gap)
+
+
+def image_nbytes(img: Image.Image) -> int:
+    return img.width * img.height * len(img.getbands())
+
+
+def fit_size(size: Tuple[int, int], box: Tuple[int, int]) -> Tuple[int, int]:
+    """Scale ``size`` to fit ``box`` keeping aspect ratio (as ``QSize.scaled``)."""
+    width, height = size
+    box_w, box_h = box
+    if width <= 0 or height <= 0:
+        return box
+    scaled_w = box_h * width // height
+    if scaled_w <= box_w:
+        return max(1, scaled_w), box_h
+    return box_w, max(1, box_w * height // width)
+
+
+@process_wide
+def get_image_loader() -> ImageLoader:
+    """Process-wide :class:`ImageLoader` used by the renderers."""
+    return ImageLoader()
@@ -0,0 +1,204 @@
+"""Imposition of equally sized cards on print sheets.
+
+:func:`plan_imposition` tries every allowed paper and orientation and
+keeps the grid with the most cards per sheet (ties go to the smaller
+paper, then portrait). The resulting :class:`Imposition` is computed once
+per export and answers everything page drawing needs: image rects of the
+slots, trim rects, shared cut positions, crop marks and mirrored slots for
+the backs of a duplex sheet.
+
+All lengths are PDF points with the origin in the lower-left corner.
+Slots are numbered row-major from the top-left card.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Iterable, List, Optional, Sequence, Tuple, Union
+
+from reportlab.lib.pagesizes import A3, A4, LETTER
+from reportlab.lib.units import mm
+
+PAPER_SIZES = {
+    "A4": A4,
+    "A3": A3,
+    "Letter": LETTER,
+    "SRA3": (320 * mm, 450 * mm),
+}
+ORIENTATIONS = ("portrait", "landscape")
+# Мітки різу: відступ від краю сітки і довжина.
+CROP_MARK_OFFSET_MM = 2
+CROP_MARK_LENGTH_MM = 5
+# long — аркуш перевертається довгим краєм: на портретному зворот
+# дзеркалиться по горизонталі, на альбомному — по вертикалі.
+DUPLEX_FLIPS = ("long", "short")
+
+Rect = Tuple[float, float, float, float]
+Line = Tuple[float, float, float, float]
+
+
+@dataclass(frozen=True)
+class Imposition:
+    paper: str
+    orientation: str
+    page_size: Tuple[float, float]
+    columns: int
+    rows: int
+    card_size: Tuple[float, float]  # обрізний формат, без bleed
+    bleed: float
+    gutter: float
+    origin: Tuple[float, float]  # лівий верхній кут обрізу першої картки
+
+    @property
+    def per_sheet(self) -> int:
+        return self.columns * self.rows
+
+    @property
+    def pitch(self) -> Tuple[float, float]:
+        return self.card_size[0] + self.gutter, self.card_size[1] + self.gutter
+
+    # ------------------------------------------------------------------
+    def trim_rect(self, slot: int, mirrored: Optional[str] = None) -> Rect:
+        """Trim box of ``slot``; ``mirrored`` (``long``/``short``) for a back page."""
+        column, row = slot % self.columns, slot // self.columns
+        x = self.origin[0] + column * self.pitch[0]
+        y = self.origin[1] - row * self.pitch[1] - self.card_size[1]
+        return self._mirror((x, y, self.card_size[0], self.card_size[1]), mirrored)
+
+    def image_rect(self, slot: int, mirrored: Optional[str] = None) -> Rect:
+        """Trim box grown by the bleed — where the card image is drawn."""
+        x, y, w, h = self.trim_rect(slot, mirrored)
+        return x - self.bleed, y - self.bleed, w + 2 * self.bleed, h + 2 * self.bleed
+
+    def clip_rect(self, slot: int, mirrored: Optional[str] = None) -> Optional[Rect]:
+        """Part of the image that may be visible, ``None`` if all of it.
+
+        When the gutter is narrower than two bleeds, inner edges keep only
+        half the gutter so a card never covers its neighbour's trim box;
+        edges on the outside of the grid keep the full bleed.
+        """
+        inner = self.gutter / 2
+        if inner >= self.bleed:
+            return None
+        column, row = slot % self.columns, slot // self.columns
+        x, y, w, h = self.trim_rect(slot)
+        left = self.bleed if column == 0 else inner
+        right = self.bleed if column == self.columns - 1 else inner
+        top = self.bleed if row == 0 else inner
+        bottom = self.bleed if row == self.rows - 1 else inner
+        return self._mirror((x - left, y - bottom, w + left + right, h + top + bottom), mirrored)
+
+    def _mirror(self, rect: Rect, mirrored: Optional[str]) -> Rect:
+        if mirrored is None:
+            return rect
+        x, y, w, h = rect
+        # Вісь перевороту паралельна краю, по якому гортають аркуш.
+        flip_x = (mirrored == "long") == (self.page_size[0] <= self.page_size[1])
+        if flip_x:
+            x = self.page_size[0] - x - w
+        else:
+            y = self.page_size[1] - y - h
+        return x, y, w, h
+
+    def slots(self, count: Optional[int] = None, mirrored: Optional[str] = None) -> List[Rect]:
+        return [self.image_rect(slot, mirrored) for slot in range(self.per_sheet if count is None else count)]
+
+    # ------------------------------------------------------------------
+    def cut_positions(self) -> Tuple[List[float], List[float]]:
+        """Distinct x and y of trim edges; neighbours share one with no gutter."""
+        xs = {self.trim_rect(column)[0] for column in range(self.columns)}
+        xs |= {x + self.card_size[0] for x in xs}
+        ys = {self.trim_rect(row * self.columns)[1] for row in range(self.rows)}
+        ys |= {y + self.card_size[1] for y in ys}
+        return sorted(round(x, 4) for x in xs), sorted(round(y, 4) for y in ys)
+
+    def grid_box(self) -> Rect:
+        """Trim area of the whole grid."""
+        width = self.columns * self.card_size[0] + (self.columns - 1) * self.gutter
+        height = self.rows * self.card_size[1] + (self.rows - 1) * self.gutter
+        return self.origin[0], self.origin[1] - height, width, height
+
+    def cut_lines(self) -> List[Line]:
+        """Guillotine guides through the whole grid, one per shared cut."""
+        left, bottom, width, height = self.grid_box()
+        xs, ys = self.cut_positions()
+        return [(x, bottom, x, bottom + height) for x in xs] + [(left, y, left + width, y) for y in ys]
+
+    def crop_marks(
+        self, offset: float = CROP_MARK_OFFSET_MM * mm, length: float = CROP_MARK_LENGTH_MM * mm
+    ) -> List[Line]:
+        """Short marks outside the grid (and its bleed) in line with every cut."""
+        left, bottom, width, height = self.grid_box()
+        right, top = left + width, bottom + height
+        start = offset + self.bleed
+        xs, ys = self.cut_positions()
+        marks = []
+        for x in xs:
+            marks.append((x, top + start, x, top + start + length))
+            marks.append((x, bottom - start, x, bottom - start - length))
+        for y in ys:
+            marks.append((left - start, y, left - start - length, y))
+            marks.append((right + start, y, right + start + length, y))
+        return marks
+
+
+# ----------------------------------------------------------------------
+def paper_names(paper: Union[str, Iterable[str]]) -> List[str]:
+    """``"auto"`` — every known paper; a name or names otherwise."""
+    if paper == "auto":
+        return list(PAPER_SIZES)
+    names = [paper] if isinstance(paper, str) else list(paper)
+    unknown = [name for name in names if name not in PAPER_SIZES]
+    if unknown or not names:
+        raise ValueError(f"Unknown paper: {', '.join(unknown) or '-'} (known: {', '.join(PAPER_SIZES)})")
+    return names
+
+
+def plan_imposition(
+    card_width_mm: float,
+    card_height_mm: float,
+    bleed_mm: float = 0,
+    margin_mm: float = 20,
+    paper: Union[str, Sequence[str]] = "A4",
+    orientation: str = "auto",
+    gutter_mm: Optional[float] = None,
+) -> Imposition:
+    """Best grid of cards over the allowed papers and orientations.
+
+    ``margin_mm`` is kept free on every side (printer margin and room for
+    crop marks); the grid is centred in what is left. ``gutter_mm`` is the
+    gap between trim boxes and defaults to twice the bleed, so every card
+    keeps its full bleed; ``0`` gives shared cut lines with the bleed
+    clipped on inner edges (see :meth:`Imposition.clip_rect`). A card larger than the printable area
+    still gets one slot.
+    """
+    if orientation not in ("auto", *ORIENTATIONS):
+        raise ValueError(f"Unknown orientation: {orientation!r}")
+    bleed = bleed_mm * mm
+    gutter = 2 * bleed if gutter_mm is None else gutter_mm * mm
+    margin = margin_mm * mm
+    card = (card_width_mm * mm, card_height_mm * mm)
+    best = None
+    for rank, name in enumerate(paper_names(paper)):
+        width, height = PAPER_SIZES[name]
+        portrait = (min(width, height), max(width, height))
+        for turn, orient in enumerate(ORIENTATIONS):
+            if orientation not in ("auto", orient):
+                continue
+            page = portrait if orient == "portrait" else portrait[::-1]
+            # Крайні картки теж мають bleed, тож він входить у робочу площу.
+            columns = _fit(page[0] - 2 * (margin + bleed), card[0], gutter)
+            rows = _fit(page[1] - 2 * (margin + bleed), card[1], gutter)
+            key = (-columns * rows, page[0] * page[1], rank, turn)
+            if best is None or key < best[0]:
+                best = (key, name, orient, page, columns, rows)
+    _, name, orient, page, columns, rows = best
+    grid_w = columns * card[0] + (columns - 1) * gutter
+    grid_h = rows * card[1] + (rows - 1) * gutter
+    origin = ((page[0] - grid_w) / 2, (page[1] + grid_h) / 2)
+    return Imposition(name, orient, page, columns, rows, card, bleed, gutter, origin)
+
+
+def _fit(space: float, size: float, gutter: float) -> int:
+    # n карток і n-1 проміжків; допуск на похибку округлення
+    return max(1, int((space + gutter + 1e-6) // (size + gutter)))
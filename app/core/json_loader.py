@@ -1,8 +1,13 @@
 import json
 import os
-from typing import List
+from typing import Dict, Iterator, List, Tuple
 
-from .models import CardModel, DeckModel
+from .models import CardColumns, CardModel, CompactCardList, DeckModel, format_card_prompt
+
+STREAM_CHUNK_SIZE = 64 * 1024
+# Найдовший токен, який може обірватися на межі буфера ("-Infinity").
+_MAX_PARTIAL_TOKEN = len("-Infinity")
+DECK_LEVEL_KEYS = {"cards", "deck_color", "prompts"}
 
 
 class JSONLoader:
@@ -11,25 +16,106 @@ class JSONLoader:
         self.deck_folder = os.path.dirname(deck_path)
         self.data = None
 
-    def load(self) -> DeckModel:
+    def load(self, compact: bool = False) -> DeckModel:
+        """Read and normalize the deck.
+
+        With ``compact=True`` cards are stored column-wise in
+        :class:`CardColumns` (see :class:`CompactCardModel`), which keeps
+        memory flat for very large generated decks. The raw card dicts are
+        released from ``self.data`` once copied into the columns.
+        """
         if not os.path.exists(self.deck_path):
             raise FileNotFoundError(f"JSON deck not found: {self.deck_path}")
 
         with open(self.deck_path, "r", encoding="utf-8") as f:
             self.data = json.load(f)
 
-        self.normalize()
-        deck_name = os.path.splitext(os.path.basename(self.deck_path))[0]
-        cards: List[CardModel] = [CardModel(index=i, payload=card) for i, card in enumerate(self.data["cards"])]
+        if compact:
+            cards = self._build_compact_cards()
+        else:
+            self.normalize()
+            cards: List[CardModel] = [CardModel(index=i, payload=card) for i, card in enumerate(self.data["cards"])]
 
         return DeckModel(
-            name=deck_name,
+            name=self.deck_name,
             path=self.deck_path,
             deck_color=self.data.get("deck_color", "#FFFFFF"),
             cards=cards,
             prompts=self.data.get("prompts", {}),
-            metadata={k: v for k, v in self.data.items() if k not in {"cards", "deck_color", "prompts"}},
+            metadata={k: v for k, v in self.data.items() if k not in DECK_LEVEL_KEYS},
+        )
+
+    def open_stream(self, chunk_size: int = STREAM_CHUNK_SIZE) -> Tuple[DeckModel, Iterator[CardModel]]:
+        """Open the deck for incremental reading.
+
+        Returns a :class:`DeckModel` with the deck-level fields found before
+        the ``cards`` array (its ``cards`` list is left empty) and an
+        iterator that parses and yields normalized cards one at a time.
+        Callers decide how many cards to keep, so memory is bounded by
+        whatever window they retain. Keys that follow ``cards`` in the file
+        are applied to the deck once the iterator is exhausted; cards
+        streamed before that point use the values known at the time.
+        """
+        if not os.path.exists(self.deck_path):
+            raise FileNotFoundError(f"JSON deck not found: {self.deck_path}")
+
+        fh = open(self.deck_path, "r", encoding="utf-8")
+        try:
+            reader = _DeckStreamReader(fh, chunk_size)
+            header = reader.read_header()
+        except Exception:
+            fh.close()
+            raise
+
+        deck = DeckModel(
+            name=self.deck_name,
+            path=self.deck_path,
+            deck_color=header.get("deck_color", "#FFFFFF"),
+            cards=[],
+            prompts=header.get("prompts", {}),
+            metadata={k: v for k, v in header.items() if k not in DECK_LEVEL_KEYS},
         )
+        return deck, self._iter_stream(reader, fh, deck)
+
+    def _iter_stream(self, reader: "_DeckStreamReader", fh, deck: DeckModel) -> Iterator[CardModel]:
+        try:
+            for index, card in enumerate(reader.iter_cards()):
+                if not isinstance(card, dict):
+                    raise ValueError(f"Картка #{index + 1} не є JSON-об'єктом")
+                self._normalize_card(card, deck.deck_color, deck.prompts)
+                yield CardModel(index=index, payload=card)
+            trailer = reader.read_trailer()
+        finally:
+            fh.close()
+        deck.deck_color = trailer.get("deck_color", deck.deck_color)
+        deck.prompts = trailer.get("prompts", deck.prompts)
+        deck.metadata.update({k: v for k, v in trailer.items() if k not in DECK_LEVEL_KEYS})
+
+    @property
+    def deck_name(self) -> str:
+        return os.path.splitext(os.path.basename(self.deck_path))[0]
+
+    @property
+    def arts_dir(self) -> str:
+        """Folder scanned by :meth:`_autodetect_art` (``<deck_folder>/../arts``)."""
+        return os.path.abspath(os.path.join(self.deck_folder, "..", "arts"))
+
+    # ─────────────────────────────────────────────
+    # Компактне (колонкове) зберігання карт
+    # ─────────────────────────────────────────────
+    def _build_compact_cards(self) -> CompactCardList:
+        if "cards" not in self.data:
+            raise ValueError("JSON deck не містить масиву 'cards'")
+
+        columns = CardColumns(
+            deck_color=self.data.get("deck_color", "#FFFFFF"),
+            prompts=self.data.get("prompts", {}),
+        )
+        raw_cards = self.data["cards"]
+        for card in raw_cards:
+            columns.append(card, art_path=self._autodetect_art(card))
+        raw_cards.clear()
+        return CompactCardList(columns)
 
     # ─────────────────────────────────────────────
     # Нормалізація карт
@@ -42,34 +128,29 @@ class JSONLoader:
         prompts = self.data.get("prompts", {})
 
         for card in self.data["cards"]:
-            card["deck_color"] = deck_color
-            card["prompt"] = self._get_prompt(prompts, card)
+            self._normalize_card(card, deck_color, prompts)
+
+    def _normalize_card(self, card, deck_color, prompts):
+        card["deck_color"] = deck_color
+        card["prompt"] = self._get_prompt(prompts, card)
 
-            # арт (опція)
-            card["art_path"] = self._autodetect_art(card)
+        # арт (опція)
+        card["art_path"] = self._autodetect_art(card)
 
     # ─────────────────────────────────────────────
     # Пошук prompt'а для типу картки
     # ─────────────────────────────────────────────
     def _get_prompt(self, prompts, card):
-        t = card.get("type", "")
-        if t in prompts:
-            try:
-                return prompts[t].format(name=card["name"])
-            except KeyError:
-                return prompts[t]
-        return ""
+        return format_card_prompt(prompts, card)
 
     # ─────────────────────────────────────────────
     # Автовизначення шляху до арту
     # /arts/<deck_name>/<card_name>.png
     # ─────────────────────────────────────────────
     def _autodetect_art(self, card):
-        name = card["name"]
-        sanitized = "".join(c for c in name if c.isalnum() or c in " _-").rstrip()
+        sanitized = sanitize_art_name(card["name"])
 
-        arts_dir = os.path.join(self.deck_folder, "..", "arts")
-        arts_dir = os.path.abspath(arts_dir)
+        arts_dir = self.arts_dir
 
         candidates = [
             os.path.join(arts_dir, f"{sanitized}.png"),
@@ -82,3 +163,134 @@ class JSONLoader:
                 return c
 
         return None
+
+
+def sanitize_art_name(name: str) -> str:
+    """File stem under which the art of card ``name`` is looked up."""
+    return "".join(c for c in name if c.isalnum() or c in " _-").rstrip()
+
+
+class _DeckStreamReader:
+    """Incremental reader for deck files shaped as ``{..., "cards": [...], ...}``.
+
+    Only one top-level value (or one card) is decoded at a time; consumed
+    text is dropped from the buffer on every refill.
+    """
+
+    def __init__(self, fh, chunk_size: int = STREAM_CHUNK_SIZE):
+        self._fh = fh
+        self._chunk_size = max(1, chunk_size)
+        self._decoder = json.JSONDecoder()
+        self._buf = ""
+        self._pos = 0
+        self._eof = False
+
+    # ─────────────────────────────────────────────
+    def read_header(self) -> Dict:
+        """Read top-level keys up to the opening bracket of ``cards``."""
+        self._expect("{")
+        header: Dict = {}
+        if self._peek() == "}":
+            raise ValueError("JSON deck не містить масиву 'cards'")
+        while True:
+            key = self._read_key()
+            if key == "cards":
+                self._expect("[")
+                return header
+            header[key] = self._read_value()
+            if not self._next_member():
+                raise ValueError("JSON deck не містить масиву 'cards'")
+
+    def iter_cards(self) -> Iterator:
+        if self._peek() == "]":
+            self._pos += 1
+            return
+        while True:
+            yield self._read_value()
+            sep = self._peek()
+            self._pos += 1
+            if sep == "]":
+                return
+            if sep != ",":
+                raise ValueError(self._error("очікувалось ',' або ']' у масиві 'cards'"))
+
+    def read_trailer(self) -> Dict:
+        """Read the top-level keys that follow the ``cards`` array."""
+        trailer: Dict = {}
+        while self._next_member():
+            key = self._read_key()
+            trailer[key] = self._read_value()
+        return trailer
+
+    # ─────────────────────────────────────────────
+    def _fill(self, size: int = 0) -> bool:
+        if self._eof:
+            return False
+        chunk = self._fh.read(size or self._chunk_size)
+        if not chunk:
+            self._eof = True
+            return False
+        self._buf = self._buf[self._pos:] + chunk
+        self._pos = 0
+        return True
+
+    def _peek(self) -> str:
+        while True:
+            buf = self._buf
+            while self._pos < len(buf) and buf[self._pos] in " \t\r\n":
+                self._pos += 1
+            if self._pos < len(buf):
+                return buf[self._pos]
+            if not self._fill():
+                return ""
+
+    def _expect(self, char: str):
+        if self._peek() != char:
+            raise ValueError(self._error(f"очікувалось '{char}'"))
+        self._pos += 1
+
+    def _next_member(self) -> bool:
+        sep = self._peek()
+        self._pos += 1
+        if sep == ",":
+            return True
+        if sep == "}":
+            return False
+        raise ValueError(self._error("очікувалось ',' або '}'"))
+
+    def _read_key(self) -> str:
+        if self._peek() != '"':
+            raise ValueError(self._error("очікувався ключ-рядок"))
+        key = self._read_value()
+        self._expect(":")
+        return key
+
+    def _read_value(self):
+        self._peek()
+        # Незавершене значення дочитується порціями, що ростуть удвічі:
+        # повторні спроби декодування разом лінійні за його довжиною.
+        size = self._chunk_size
+        while True:
+            try:
+                value, end = self._decoder.raw_decode(self._buf, self._pos)
+            except json.JSONDecodeError as exc:
+                if self._truncated(exc) and self._fill(size):
+                    size *= 2
+                    continue
+                raise
+            # A number ending exactly at the buffer edge may continue in the next chunk.
+            if end == len(self._buf) and self._fill(size):
+                size *= 2
+                continue
+            self._pos = end
+            return value
+
+    def _truncated(self, exc: json.JSONDecodeError) -> bool:
+        """Whether more input could still make the value valid."""
+        if exc.msg.startswith("Unterminated string"):
+            return True
+        # Помилка раніше за обірваний хвіст буфера — файл зіпсований.
+        return len(self._buf) - exc.pos < _MAX_PARTIAL_TOKEN
+
+    def _error(self, message: str) -> str:
+        return f"Некоректний JSON deck: {message}"
@@ -0,0 +1,94 @@
+"""Building blocks shared by the in-memory caches of ``core``."""
+
+from __future__ import annotations
+
+import functools
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Hashable, Optional, TypeVar
+
+T = TypeVar("T")
+
+
+class LRUCache:
+    """Thread-safe LRU map with hit, miss and eviction counters.
+
+    Bounded by ``maxsize`` entries, or with ``weigh`` by ``maxsize`` total
+    weight of the values (e.g. bytes of pixel data); a value heavier than
+    the whole bound is not stored. ``None`` is not a storable value.
+    """
+
+    def __init__(self, maxsize: int, weigh: Optional[Callable[[Any], int]] = None):
+        self.maxsize = maxsize
+        self.weigh = weigh
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.weight = 0
+        self._entries: "OrderedDict[Hashable, Any]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    # ------------------------------------------------------------------
+    def get(self, key: Hashable) -> Optional[Any]:
+        """Counted lookup that marks the entry as recently used."""
+        with self._lock:
+            value = self._entries.get(key)
+            if value is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def peek(self, key: Hashable) -> Optional[Any]:
+        """Lookup that touches neither the counters nor the recency."""
+        with self._lock:
+            return self._entries.get(key)
+
+    def put(self, key: Hashable, value: Any) -> None:
+        weight = self.weigh(value) if self.weigh else 1
+        if weight > self.maxsize:
+            return
+        with self._lock:
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self.weight -= self.weigh(previous) if self.weigh else 1
+            self._entries[key] = value
+            self.weight += weight
+            while self.weight > self.maxsize and self._entries:
+                _old_key, old = self._entries.popitem(last=False)
+                self.weight -= self.weigh(old) if self.weigh else 1
+                self.evictions += 1
+
+    def get_or_compute(self, key: Hashable, compute: Callable[[], T]) -> T:
+        """Cached value of ``key``; ``compute()`` runs outside the lock on a miss."""
+        value = self.get(key)
+        if value is None:
+            value = compute()
+            self.put(key, value)
+        return value
+
+    def clear(self, reset_stats: bool = False) -> None:
+        with self._lock:
+            self._entries.clear()
+            self.weight = 0
+            if reset_stats:
+                self.hits = self.misses = self.evictions = 0
+
+
+def process_wide(factory: Callable[[], T]) -> Callable[[], T]:
+    """Turn ``factory`` into a getter of one lazily built, process-wide instance."""
+    lock = threading.Lock()
+    instance = []
+
+    @functools.wraps(factory)
+    def get() -> T:
+        with lock:
+            if not instance:
+                instance.append(factory())
+            return instance[0]
+
+    return get
@@ -2,8 +2,30 @@
 
 from __future__ import annotations
 
+import sys
+from array import array
+from collections.abc import Sequence as SequenceABC
 from dataclasses import dataclass, field
-from typing import Dict, List, Optional
+from typing import Dict, Iterator, List, Optional, Sequence
+
+# Numeric card columns stored in compact decks.
+STAT_FIELDS = ("atk", "def", "stb", "init", "rng", "move", "cost")
+_INT_MIN = -(2 ** 31)
+_INT_MAX = 2 ** 31 - 1
+# Sentinel for "no integer value in this column" (key missing or non-integer).
+_NO_VALUE = _INT_MIN
+
+
+def format_card_prompt(prompts: Dict, card) -> str:
+    """Return the art prompt for ``card`` using the deck's per-type templates."""
+
+    t = card.get("type", "")
+    if t in prompts:
+        try:
+            return prompts[t].format(name=card["name"])
+        except KeyError:
+            return prompts[t]
+    return ""
 
 
 @dataclass
@@ -33,12 +55,159 @@ class CardModel:
         return self.payload[item]
 
 
+class CardColumns:
+    """Column-oriented storage for the cards of one deck.
+
+    Numeric stats live in ``array('i')`` columns, repeated strings are
+    interned, and deck-level values (colour, prompts) are kept once instead
+    of being copied into every card. Values that do not fit a column (e.g.
+    ``"X"`` as a stat) are kept verbatim in a per-card ``extras`` dict.
+    """
+
+    __slots__ = ("deck_color", "prompts", "names", "types", "cost_types", "art_paths", "stats", "extras")
+
+    def __init__(self, deck_color: str = "#FFFFFF", prompts: Optional[Dict] = None):
+        self.deck_color = deck_color
+        self.prompts = prompts or {}
+        self.names: List[Optional[str]] = []
+        self.types: List[Optional[str]] = []
+        self.cost_types: List[Optional[str]] = []
+        self.art_paths: List[Optional[str]] = []
+        self.stats: Dict[str, array] = {key: array("i") for key in STAT_FIELDS}
+        self.extras: List[Optional[Dict]] = []
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    # ------------------------------------------------------------------
+    def append(self, card: Dict, art_path: Optional[str] = None) -> int:
+        """Copy a raw card dict into the columns and return its row."""
+
+        extras = {}
+        for key, value in card.items():
+            if key in {"name", "type", "cost_type", "art_path", "deck_color", "prompt"} or key in self.stats:
+                continue
+            extras[key] = value
+
+        self.names.append(_intern(card.get("name")))
+        self.types.append(_intern(card.get("type")))
+        self.cost_types.append(_intern(card.get("cost_type")))
+        self.art_paths.append(_intern(art_path if art_path is not None else card.get("art_path")))
+        for key, column in self.stats.items():
+            value = card.get(key)
+            if _fits_column(value):
+                column.append(value)
+            else:
+                column.append(_NO_VALUE)
+                if key in card:
+                    extras[key] = value
+        self.extras.append(extras or None)
+        return len(self.names) - 1
+
+    # ------------------------------------------------------------------
+    def value(self, row: int, key: str, default=None):
+        if key == "name":
+            return _or_default(self.names[row], default)
+        if key == "type":
+            return _or_default(self.types[row], default)
+        if key == "cost_type":
+            return _or_default(self.cost_types[row], default)
+        if key == "art_path":
+            return self.art_paths[row]
+        if key == "deck_color":
+            return self.deck_color
+        if key == "prompt":
+            return format_card_prompt(self.prompts, _RowView(self, row))
+        column = self.stats.get(key)
+        if column is not None and column[row] != _NO_VALUE:
+            return column[row]
+        extras = self.extras[row]
+        if extras is not None and key in extras:
+            return extras[key]
+        return default
+
+    # ------------------------------------------------------------------
+    def payload(self, row: int) -> Dict:
+        """Materialize the normalized card dict for ``row``."""
+
+        payload: Dict = {}
+        for key, values in (("name", self.names), ("type", self.types), ("cost_type", self.cost_types)):
+            if values[row] is not None:
+                payload[key] = values[row]
+        for key, column in self.stats.items():
+            if column[row] != _NO_VALUE:
+                payload[key] = column[row]
+        if self.extras[row]:
+            payload.update(self.extras[row])
+        payload["deck_color"] = self.deck_color
+        payload["prompt"] = format_card_prompt(self.prompts, payload)
+        payload["art_path"] = self.art_paths[row]
+        return payload
+
+
+class CompactCardModel:
+    """Lightweight view of one row of :class:`CardColumns`.
+
+    Mirrors the read API of :class:`CardModel`; ``payload`` builds a fresh
+    dict on every access.
+    """
+
+    __slots__ = ("_columns", "index")
+
+    def __init__(self, columns: CardColumns, index: int):
+        self._columns = columns
+        self.index = index
+
+    @property
+    def name(self) -> str:
+        return self._columns.value(self.index, "name") or f"Card {self.index + 1}"
+
+    @property
+    def payload(self) -> Dict:
+        return self._columns.payload(self.index)
+
+    def get(self, key: str, default=None):
+        return self._columns.value(self.index, key, default)
+
+    def __getitem__(self, item):
+        value = self._columns.value(self.index, item, _MISSING_KEY)
+        if value is _MISSING_KEY:
+            raise KeyError(item)
+        return value
+
+    def __repr__(self) -> str:
+        return f"CompactCardModel(index={self.index}, name={self.name!r})"
+
+
+class CompactCardList(SequenceABC):
+    """Read-only sequence of :class:`CompactCardModel` views over columns."""
+
+    def __init__(self, columns: CardColumns):
+        self.columns = columns
+
+    def __len__(self) -> int:
+        return len(self.columns)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [CompactCardModel(self.columns, i) for i in range(*index.indices(len(self)))]
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("card index out of range")
+        return CompactCardModel(self.columns, index)
+
+    def __iter__(self) -> Iterator[CompactCardModel]:
+        for i in range(len(self)):
+            yield CompactCardModel(self.columns, i)
+
+
 @dataclass
 class DeckModel:
     name: str
     path: str
     deck_color: str
-    cards: List[CardModel] = field(default_factory=list)
+    cards: Sequence[CardModel] = field(default_factory=list)
     prompts: Dict = field(default_factory=dict)
     metadata: Dict = field(default_factory=dict)
 
@@ -52,3 +221,40 @@ class DeckModel:
 
     def __len__(self) -> int:
         return len(self.cards)
+
+
+# ----------------------------------------------------------------------
+_MISSING_KEY = object()
+
+
+class _RowView:
+    """Minimal mapping used to format prompts without building a payload."""
+
+    __slots__ = ("_columns", "_row")
+
+    def __init__(self, columns: CardColumns, row: int):
+        self._columns = columns
+        self._row = row
+
+    def get(self, key, default=None):
+        return self._columns.value(self._row, key, default)
+
+    def __getitem__(self, key):
+        value = self._columns.value(self._row, key, _MISSING_KEY)
+        if value is _MISSING_KEY:
+            raise KeyError(key)
+        return value
+
+
+def _intern(value):
+    if isinstance(value, str):
+        return sys.intern(value)
+    return value
+
+
+def _or_default(value, default):
+    return default if value is None else value
+
+
+def _fits_column(value) -> bool:
+    return isinstance(value, int) and not isinstance(value, bool) and _INT_MIN < value <= _INT_MAX
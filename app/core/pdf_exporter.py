@@ -1,24 +1,84 @@
 import os
+import shutil
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+
 from PIL import Image
 from reportlab.pdfgen import canvas
-from reportlab.lib.pagesizes import A4
-from reportlab.lib.units import mm
+
+from .imposition import DUPLEX_FLIPS, plan_imposition
+
+try:
+    from pypdf import PdfReader, PdfWriter
+    from pypdf.generic import NameObject
+except ImportError:  # без pypdf частини не злити — PDF збирається послідовно
+    PdfWriter = None
+
+# Товщина ліній різу, pt
+MARK_LINE_WIDTH = 0.25
+# Менше сторінок не варті запуску процесів
+PARALLEL_MIN_PAGES = 4
+
 
 class PDFExporter:
     def __init__(self, dpi=300, margin_mm=20):
         self.dpi = dpi
         self.margin_mm = margin_mm
+        # Розкладка останнього експорту (core.imposition.Imposition)
+        self.last_imposition = None
 
     def mm_to_px(self, mm_value):
         return int((mm_value / 25.4) * self.dpi)
 
-    def export_pdf(self, folder, output_path, card_width_mm=40, card_height_mm=62, bleed_mm=0):
+    def plan(self, card_width_mm=40, card_height_mm=62, bleed_mm=0, paper="A4", orientation="auto", gutter_mm=None):
+        """Розкладка карток на аркуші — див. core.imposition.plan_imposition."""
+        return plan_imposition(
+            card_width_mm,
+            card_height_mm,
+            bleed_mm=bleed_mm,
+            margin_mm=self.margin_mm,
+            paper=paper,
+            orientation=orientation,
+            gutter_mm=gutter_mm,
+        )
+
+    def export_pdf(
+        self,
+        folder,
+        output_path,
+        card_width_mm=40,
+        card_height_mm=62,
+        bleed_mm=0,
+        paper="A4",
+        orientation="auto",
+        gutter_mm=None,
+        crop_marks=False,
+        cut_lines=False,
+        back_path=None,
+        duplex="long",
+        workers=1,
+    ):
         """
         Правильний метод: приймає шлях до директорії з PNG-файлами.
+
+        Папір (``paper`` — назва, список назв або "auto") і орієнтація
+        обираються так, щоб на аркуш влізло найбільше карток; розкладка
+        рахується один раз і використовується для всіх сторінок.
+        ``crop_marks`` / ``cut_lines`` — мітки різу на полях і лінії різу
+        через усю сітку. З ``back_path`` після кожної сторінки йде сторінка
+        зворотів, віддзеркалена для двостороннього друку (``duplex`` —
+        переворот по довгому "long" чи короткому "short" краю).
+
+        З ``workers`` > 1 (і встановленим pypdf) сторінки діляться на
+        діапазони, кожен збирається в окремому процесі, а частини
+        зливаються в один PDF зі спільними ресурсами. Вміст сторінок той
+        самий, що й при послідовній збірці; PDF детермінований.
         """
 
         if not os.path.isdir(folder):
             raise FileNotFoundError(f"Директорію не знайдено: {folder}")
+        if back_path and duplex not in DUPLEX_FLIPS:
+            raise ValueError(f"Unknown duplex flip: {duplex!r}")
 
         # Збираємо всі PNG-файли у стабільному порядку
         image_paths = []
@@ -31,58 +91,142 @@ class PDFExporter:
         if not image_paths:
             raise FileNotFoundError(f"У директорії немає PNG-файлів:\n{folder}")
 
-        # Розміри карток
-        page_width, page_height = A4
-        margin = self.margin_mm * mm
-
-        card_w_pt = (card_width_mm + 2 * bleed_mm) * mm
-        card_h_pt = (card_height_mm + 2 * bleed_mm) * mm
-
-        # Готуємо PDF
-        from reportlab.pdfgen import canvas
-        c = canvas.Canvas(output_path, pagesize=A4)
+        layout = self.plan(card_width_mm, card_height_mm, bleed_mm, paper, orientation, gutter_mm)
+        self.last_imposition = layout
 
-        x = margin
-        y = page_height - margin - card_h_pt
+        per_sheet = layout.per_sheet
+        pages = [image_paths[start:start + per_sheet] for start in range(0, len(image_paths), per_sheet)]
+        options = {"crop_marks": crop_marks, "cut_lines": cut_lines, "back_path": back_path, "duplex": duplex}
 
-        cards_per_row = max(1, int((page_width - margin * 2) // card_w_pt))
-        cards_per_col = max(1, int((page_height - margin * 2) // card_h_pt))
+        if workers > 1 and len(pages) >= PARALLEL_MIN_PAGES and PdfWriter is not None:
+            self._write_parallel(output_path, layout, pages, options, workers)
+        else:
+            self.write_pages(output_path, layout, pages, **options)
 
-        current_col = 0
-        rows_used = 0
+        return output_path
 
-        # Додаємо кожну картку
-        for img_path in image_paths:
-            temp_img = Image.open(img_path)
-            temp_img_path = img_path + "_tmp_for_pdf.png"
-            temp_img.save(temp_img_path, dpi=(self.dpi, self.dpi))
+    # ------------------------------------------------------------------
+    def write_pages(self, output_path, layout, pages, crop_marks=False, cut_lines=False, back_path=None, duplex="long"):
+        """Збирає PDF зі сторінок — списків шляхів до карток, по аркушу на список."""
+        # invariant — без дати створення й випадкового ID: однаковий вхід дає однаковий PDF
+        c = canvas.Canvas(output_path, pagesize=layout.page_size, invariant=1)
+
+        for page_paths in pages:
+            for slot, img_path in enumerate(page_paths):
+                self._draw_card(c, layout, slot, img_path)
+            if cut_lines:
+                self._draw_lines(c, layout.cut_lines(), gray=0.6)
+            if crop_marks:
+                self._draw_lines(c, layout.crop_marks(), gray=0)
+            c.showPage()
+
+            if back_path:
+                # Той самий файл — ReportLab вбудовує зворот один раз на весь PDF.
+                for slot in range(len(page_paths)):
+                    self._draw_image(c, back_path, layout.image_rect(slot, duplex), layout.clip_rect(slot, duplex))
+                c.showPage()
 
-            c.drawImage(
-                temp_img_path,
-                x, y,
-                width=card_w_pt,
-                height=card_h_pt,
-                preserveAspectRatio=True,
-                mask="auto"
-            )
+        c.save()
 
+    # ------------------------------------------------------------------
+    def _write_parallel(self, output_path, layout, pages, options, workers):
+        # Суцільні діапазони сторінок — частини зливаються в тому ж порядку.
+        chunk = -(-len(pages) // workers)
+        ranges = [pages[start:start + chunk] for start in range(0, len(pages), chunk)]
+        part_dir = tempfile.mkdtemp(prefix=".pdf-parts-", dir=os.path.dirname(os.path.abspath(output_path)))
+        try:
+            jobs = [
+                (self.dpi, self.margin_mm, os.path.join(part_dir, f"part-{i:03d}.pdf"), layout, page_range, options)
+                for i, page_range in enumerate(ranges)
+            ]
+            with ProcessPoolExecutor(max_workers=min(workers, len(jobs))) as pool:
+                part_paths = list(pool.map(_write_page_range, jobs))
+
+            writer = PdfWriter()
+            for part_path in part_paths:
+                writer.append(part_path)
+            share_xobjects(writer)
+            merged_path = os.path.join(part_dir, "merged.pdf")
+            writer.write(merged_path)
+            # Повторне клонування бере лише досяжні об'єкти — копії зникають.
+            tmp_path = f"{output_path}.tmp"
+            PdfWriter(clone_from=PdfReader(merged_path)).write(tmp_path)
+            os.replace(tmp_path, output_path)
+        finally:
+            shutil.rmtree(part_dir, ignore_errors=True)
+
+    # ------------------------------------------------------------------
+    def _draw_card(self, c, layout, slot, img_path):
+        temp_img = Image.open(img_path)
+        temp_img_path = img_path + "_tmp_for_pdf.png"
+        temp_img.save(temp_img_path, dpi=(self.dpi, self.dpi))
+        try:
+            self._draw_image(c, temp_img_path, layout.image_rect(slot), layout.clip_rect(slot))
+        finally:
             os.remove(temp_img_path)
 
-            current_col += 1
-
-            if current_col >= cards_per_row:
-                current_col = 0
-                rows_used += 1
-                x = margin
-                y -= card_h_pt
-
-                if rows_used >= cards_per_col:
-                    c.showPage()
-                    y = page_height - margin - card_h_pt
-                    rows_used = 0
-            else:
-                x += card_w_pt
-
-        c.save()
-
-        return output_path
+    # ------------------------------------------------------------------
+    def _draw_image(self, c, path, rect, clip=None):
+        x, y, width, height = rect
+        if clip is not None:
+            c.saveState()
+            clip_path = c.beginPath()
+            clip_path.rect(*clip)
+            c.clipPath(clip_path, stroke=0, fill=0)
+        c.drawImage(
+            path,
+            x, y,
+            width=width,
+            height=height,
+            preserveAspectRatio=True,
+            mask="auto"
+        )
+        if clip is not None:
+            c.restoreState()
+
+    # ------------------------------------------------------------------
+    def _draw_lines(self, c, lines, gray):
+        c.saveState()
+        c.setLineWidth(MARK_LINE_WIDTH)
+        c.setStrokeGray(gray)
+        for line in lines:
+            c.line(*line)
+        c.restoreState()
+
+
+def _write_page_range(job):
+    dpi, margin_mm, part_path, layout, pages, options = job
+    PDFExporter(dpi=dpi, margin_mm=margin_mm).write_pages(part_path, layout, pages, **options)
+    return part_path
+
+
+def share_xobjects(writer):
+    """Point pages of merged parts at one copy of every shared image.
+
+    Each part embeds its own copy of images used by several parts (the
+    back). ReportLab names a file image by a digest of its path and mask,
+    so equal names mean the same image — exactly what the serial path
+    shares. ``PdfWriter.compress_identical_objects`` would find the copies
+    too, but hashes every object of the document, which costs more than
+    building a part. The copies stay in the writer unreferenced; cloning
+    the written document drops them. Returns their number.
+    """
+    by_name = {}
+    # idnum копії → спільне посилання
+    redirect = {}
+    for page in writer.pages:
+        xobjects = page["/Resources"].get("/XObject")
+        if xobjects is None:
+            continue
+        xobjects = xobjects.get_object()
+        for name in list(xobjects):
+            ref = xobjects.raw_get(name)
+            if ref.idnum not in redirect:
+                stream = ref.get_object()
+                attrs = repr(sorted((key, value) for key, value in stream.items() if key != "/Length"))
+                shared = by_name.setdefault((name, attrs), ref)
+                redirect[ref.idnum] = shared
+            shared = redirect[ref.idnum]
+            if shared.idnum != ref.idnum:
+                xobjects[NameObject(name)] = shared
+    return sum(1 for idnum, ref in redirect.items() if ref.idnum != idnum)
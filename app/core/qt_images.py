@@ -0,0 +1,77 @@
+"""Qt adapters over :mod:`core.image_loader` for the scene-based renderer."""
+
+from __future__ import annotations
+
+import sys
+from typing import Optional, Tuple
+
+from PIL import Image
+from PySide6.QtGui import QImage, QPixmap
+
+from .art_cache import ArtDerivativeCache, get_art_cache
+from .art_pack import ArtPack
+from .image_loader import ImageLoader, get_image_loader
+
+
+def qimage_from_pil(img: Image.Image) -> QImage:
+    """Convert an RGBA PIL image into an owned ``QImage``."""
+    if img.mode != "RGBA":
+        img = img.convert("RGBA")
+    data = img.tobytes("raw", "RGBA")
+    return QImage(data, img.width, img.height, img.width * 4, QImage.Format_RGBA8888).copy()
+
+
+def qimage_to_pil(image: QImage) -> Image.Image:
+    """Copy a ``QImage`` into a straight-alpha RGBA PIL image."""
+    if image.format() != QImage.Format_ARGB32:
+        image = image.convertToFormat(QImage.Format_ARGB32)
+    # ARGB32 — 32-бітні слова 0xAARRGGBB у порядку байтів машини.
+    raw_mode = "BGRA" if sys.byteorder == "little" else "ARGB"
+    size = (image.width(), image.height())
+    return Image.frombuffer("RGBA", size, bytes(image.constBits()), "raw", raw_mode, image.bytesPerLine(), 1)
+
+
+def load_pixmap(
+    path: Optional[str],
+    size: Optional[Tuple[int, int]] = None,
+    loader: Optional[ImageLoader] = None,
+) -> QPixmap:
+    """Load ``path`` through the shared image cache.
+
+    ``size`` fits the image inside the box keeping its aspect ratio.
+    Returns a null pixmap when the file cannot be read.
+    """
+    loader = loader or get_image_loader()
+    if size:
+        img = loader.load_scaled(path, size[0], size[1], keep_aspect=True)
+    else:
+        img = loader.load(path)
+    if img is None:
+        return QPixmap()
+    return QPixmap.fromImage(qimage_from_pil(img))
+
+
+def load_art_pixmap(
+    path: Optional[str],
+    size: Tuple[int, int],
+    dpi: int = 300,
+    art_cache: Optional[ArtDerivativeCache] = None,
+    art_pack: Optional[ArtPack] = None,
+) -> QPixmap:
+    """Load card art pre-fitted to ``size`` from the on-disk derivative cache.
+
+    A matching ``art_pack`` is consulted first; its pixels are uploaded
+    straight from the memory map.
+    """
+    if art_pack is not None and art_pack.matches(size[0], size[1], keep_aspect=True):
+        packed = art_pack.qimage(path)
+        if packed is not None:
+            return QPixmap.fromImage(packed)
+    art_cache = art_cache or get_art_cache()
+    derived = art_cache.load_premultiplied(path, size[0], size[1], dpi=dpi, keep_aspect=True)
+    if derived is None:
+        return QPixmap()
+    width, height, data = derived
+    image = QImage(data, width, height, width * 4, QImage.Format_RGBA8888_Premultiplied)
+    # fromImage copies the pixels, so ``data`` may be released afterwards.
+    return QPixmap.fromImage(image)
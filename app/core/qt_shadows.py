@@ -0,0 +1,137 @@
+"""Cached drop-shadow / outline rasterization for scene text items.
+
+``QGraphicsDropShadowEffect`` re-renders its source offscreen and re-blurs
+it on every paint. Here the effect output of a text document — text and
+shadow composited exactly as the effect does it, in device pixels — is
+rendered once per (text, font, colours, blur, offset, device scale and
+sub-pixel phase) and reused as a plain image.
+"""
+
+from __future__ import annotations
+
+import math
+from typing import Optional, Tuple
+
+from PySide6.QtCore import QPointF, QRectF, Qt
+from PySide6.QtGui import (
+    QAbstractTextDocumentLayout,
+    QColor,
+    QImage,
+    QPainter,
+    QPalette,
+    QPixmap,
+    QTextDocument,
+    QTransform,
+)
+from PySide6.QtWidgets import QGraphicsDropShadowEffect, QGraphicsScene
+
+from .lru import LRUCache, process_wide
+
+SHADOW_CACHE_SIZE = 256
+
+
+def device_phase(transform: QTransform) -> Optional[Tuple[float, float, float, float]]:
+    """``(scale x, scale y, frac x, frac y)`` of a scale+translate transform.
+
+    ``None`` for rotated or sheared transforms, which the cache does not handle.
+    """
+    if transform.type().value > QTransform.TxScale.value:
+        return None
+    dx, dy = transform.dx(), transform.dy()
+    return transform.m11(), transform.m22(), dx - math.floor(dx), dy - math.floor(dy)
+
+
+def render_text_with_shadow(
+    document: QTextDocument,
+    text_color: QColor,
+    shadow_color: QColor,
+    offset: QPointF,
+    blur: float,
+    phase: Tuple[float, float, float, float] = (1.0, 1.0, 0.0, 0.0),
+    opacity: float = 1.0,
+) -> Tuple[QImage, QRectF]:
+    """Text of ``document`` with its drop shadow, as the effect would paint it.
+
+    Returns the image and its rectangle relative to the device pixel the
+    text origin falls into (``floor`` of the device position). ``opacity``
+    is the painter opacity of the item: the effect renders its source with
+    it and then paints the result with it once more, so it is baked in here
+    too to keep exports identical.
+    """
+    scale_x, scale_y, frac_x, frac_y = phase
+    size = document.size()
+    text_image = QImage(
+        int(math.ceil(frac_x + size.width() * scale_x)),
+        int(math.ceil(frac_y + size.height() * scale_y)),
+        QImage.Format_ARGB32_Premultiplied,
+    )
+    text_image.fill(Qt.transparent)
+    painter = QPainter(text_image)
+    painter.setRenderHints(QPainter.Antialiasing | QPainter.TextAntialiasing)
+    painter.setOpacity(opacity)
+    painter.translate(frac_x, frac_y)
+    painter.scale(scale_x, scale_y)
+    context = QAbstractTextDocumentLayout.PaintContext()
+    context.palette.setColor(QPalette.Text, text_color)
+    document.documentLayout().draw(painter, context)
+    painter.end()
+
+    # Той самий QGraphicsDropShadowEffect, але на готовому растрі тексту й один раз.
+    scene = QGraphicsScene()
+    item = scene.addPixmap(QPixmap.fromImage(text_image))
+    effect = QGraphicsDropShadowEffect()
+    effect.setColor(shadow_color)
+    effect.setOffset(offset)
+    effect.setBlurRadius(blur)
+    item.setGraphicsEffect(effect)
+    rect = effect.boundingRectFor(QRectF(text_image.rect())).toAlignedRect()
+    image = QImage(rect.size(), QImage.Format_ARGB32_Premultiplied)
+    image.fill(Qt.transparent)
+    painter = QPainter(image)
+    scene.render(painter, QRectF(image.rect()), QRectF(rect))
+    painter.end()
+    return image, QRectF(rect)
+
+
+class ShadowCache(LRUCache):
+    """LRU of rendered shadowed texts shared by all text items."""
+
+    def __init__(self, maxsize: int = SHADOW_CACHE_SIZE):
+        super().__init__(maxsize)
+
+    # ------------------------------------------------------------------
+    def render(
+        self,
+        document: QTextDocument,
+        text_color: QColor,
+        shadow_color: QColor,
+        offset: QPointF,
+        blur: float,
+        phase: Tuple[float, float, float, float] = (1.0, 1.0, 0.0, 0.0),
+        opacity: float = 1.0,
+    ) -> Tuple[QImage, QRectF]:
+        key = (
+            document.toPlainText(),
+            document.defaultFont().toString(),
+            document.textWidth(),
+            document.documentMargin(),
+            text_color.rgba(),
+            shadow_color.rgba(),
+            offset.x(),
+            offset.y(),
+            float(blur),
+            phase,
+            opacity,
+        )
+        return self.get_or_compute(
+            key, lambda: render_text_with_shadow(document, text_color, shadow_color, offset, blur, phase, opacity)
+        )
+
+    def clear(self, reset_stats: bool = True) -> None:
+        super().clear(reset_stats)
+
+
+@process_wide
+def get_shadow_cache() -> ShadowCache:
+    """Process-wide :class:`ShadowCache`."""
+    return ShadowCache()
@@ -0,0 +1,461 @@
+"""Compiles card layouts into immutable render plans.
+
+Both layout formats used by the app — the editor's ``template_layout.json``
+(pixel items with pos/size/font/bindings) and the older ``template.json``
+(millimetres) — compile into the same :class:`RenderPlan`. A plan holds
+absolute pixel geometry for one DPI and bleed, resolved font files, parsed
+colours, the final z-order and the data binding of every card-dependent
+item. Renderers compile once and per card only substitute data via
+:meth:`RenderPlan.bind`.
+"""
+
+from __future__ import annotations
+
+import os
+import re
+from dataclasses import dataclass
+from typing import Dict, Iterator, Mapping, Optional, Tuple
+
+from .text_fit import parse_fit
+
+Color = Tuple[int, int, int, int]
+
+DEFAULT_FONTS_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "fonts")
+# Qt лейаутить текст сцени з логічним DPI 96: 1 pt = 96 / 72 px.
+TEXT_POINT_DPI = 96
+STAT_KEYS = ("atk", "def", "stb", "init", "rng", "move")
+_FONT_EXTENSIONS = (".ttf", ".otf", ".ttc")
+
+
+@dataclass(frozen=True)
+class DataBinding:
+    """How one item takes its content from a card payload.
+
+    The first non-empty field wins; ``missing`` is used when none is set
+    (``None`` keeps the item's template content). ``when`` limits the item
+    to cards whose field equals the given value.
+    """
+
+    fields: Tuple[str, ...]
+    fmt: str = "{}"
+    upper: bool = False
+    missing: Optional[str] = None
+    when: Optional[Tuple[str, str]] = None
+
+    def resolve(self, card: Mapping) -> Optional[str]:
+        value = next((card.get(f) for f in self.fields if card.get(f) not in (None, "")), None)
+        if value is None:
+            if self.missing is None:
+                return None
+            value = self.missing
+        value = str(value)
+        if self.upper:
+            value = value.upper()
+        return self.fmt.format(value)
+
+    def visible(self, card: Mapping) -> bool:
+        return self.when is None or card.get(self.when[0]) == self.when[1]
+
+
+# Прив'язки елементів редактора до полів картки (за id елемента).
+LAYOUT_BINDINGS: Dict[str, DataBinding] = {
+    "title": DataBinding(("name",), missing=""),
+    "type": DataBinding(("type",), upper=True, missing=""),
+    "description": DataBinding(("description", "text", "effect"), missing=""),
+    "cost": DataBinding(("cost",)),
+    "cost_type": DataBinding(("cost_type",)),
+    "artwork": DataBinding(("art_path",)),
+    **{f"stat_{key}": DataBinding((key,), fmt=f"{key.upper()} {{}}", missing="-") for key in STAT_KEYS},
+}
+
+
+@dataclass(frozen=True)
+class FontSpec:
+    family: str
+    pixel_size: float
+    bold: bool = False
+    italic: bool = False
+    underline: bool = False
+    file: Optional[str] = None
+
+
+@dataclass(frozen=True)
+class ShadowSpec:
+    color: Color
+    offset: Tuple[float, float]
+    blur: float
+
+
+@dataclass(frozen=True)
+class FitSpec:
+    """Auto-shrink box of a text item: sizes are in points, ``height`` in plan px."""
+
+    height: float
+    min_size: int
+    max_size: int
+    px_per_point: float
+
+
+@dataclass(frozen=True)
+class PlanItem:
+    item_id: str
+    kind: str  # "text" | "image" | "rect"
+    x: float
+    y: float
+    width: float = 0.0
+    height: float = 0.0
+    z: float = 0.0
+    opacity: float = 1.0
+    color: Color = (255, 255, 255, 255)
+    text: str = ""
+    text_width: float = 0.0
+    font: Optional[FontSpec] = None
+    asset: Optional[str] = None
+    keep_aspect: bool = True
+    pen: Optional[Tuple[Color, float]] = None
+    brush: Optional[Color] = None
+    shadow: Optional[ShadowSpec] = None
+    binding: Optional[DataBinding] = None
+    fit: Optional[FitSpec] = None
+
+    @property
+    def dynamic(self) -> bool:
+        return self.binding is not None
+
+
+@dataclass(frozen=True)
+class RenderPlan:
+    width: int
+    height: int
+    dpi: int
+    bleed: int
+    background: Color
+    items: Tuple[PlanItem, ...]
+
+    def item(self, item_id: str) -> Optional[PlanItem]:
+        return next((item for item in self.items if item.item_id == item_id), None)
+
+    @property
+    def bound_items(self) -> Tuple[PlanItem, ...]:
+        return tuple(item for item in self.items if item.dynamic)
+
+    def bind(self, card: Mapping) -> Iterator[Tuple[PlanItem, Optional[str]]]:
+        """Yield ``(item, value)`` for every data-bound item shown for ``card``."""
+        for item in self.items:
+            binding = item.binding
+            if binding is not None and binding.visible(card):
+                yield item, binding.resolve(card)
+
+    def resolve(self, card: Mapping) -> Iterator[Tuple[PlanItem, Optional[str]]]:
+        """Yield every item shown for ``card`` in z-order; static ones get ``None``."""
+        for item in self.items:
+            binding = item.binding
+            if binding is None:
+                yield item, None
+            elif binding.visible(card):
+                yield item, binding.resolve(card)
+
+
+# ─────────────────────────────────────────────
+# Кольори та шрифти
+# ─────────────────────────────────────────────
+def parse_color(value, default: Color = (255, 255, 255, 255)) -> Color:
+    """Parse ``#RGB``, ``#RRGGBB`` or Qt's ``#AARRGGBB`` into RGBA."""
+    if not isinstance(value, str) or not value.startswith("#"):
+        return default
+    digits = value[1:]
+    if len(digits) == 3:
+        digits = "".join(ch * 2 for ch in digits)
+    try:
+        if len(digits) == 6:
+            return int(digits[0:2], 16), int(digits[2:4], 16), int(digits[4:6], 16), 255
+        if len(digits) == 8:
+            return int(digits[2:4], 16), int(digits[4:6], 16), int(digits[6:8], 16), int(digits[0:2], 16)
+    except ValueError:
+        pass
+    return default
+
+
+def _font_key(name: str) -> str:
+    return re.sub(r"[\s_\-]+", "", name).casefold()
+
+
+_font_index_cache: Dict[str, Dict[str, str]] = {}
+
+
+def _font_index(fonts_dir: str) -> Dict[str, str]:
+    index = _font_index_cache.get(fonts_dir)
+    if index is None:
+        index = {}
+        if os.path.isdir(fonts_dir):
+            for entry in sorted(os.listdir(fonts_dir)):
+                stem, ext = os.path.splitext(entry)
+                if ext.lower() not in _FONT_EXTENSIONS:
+                    continue
+                path = os.path.join(fonts_dir, entry)
+                index.setdefault(_font_key(stem), path)
+                # Qt шукає шрифт за внутрішньою назвою сімейства — індексуємо і її.
+                family, style = _font_names(path)
+                if family:
+                    index.setdefault(_font_key(family) + _font_key(style), path)
+                    if _font_key(style) == "regular":
+                        index[_font_key(family)] = path
+                    else:
+                        # як і Qt, беремо найближче накреслення, якщо regular немає
+                        index.setdefault(_font_key(family), path)
+        _font_index_cache[fonts_dir] = index
+    return index
+
+
+def _font_names(path: str) -> Tuple[Optional[str], str]:
+    try:
+        from PIL import ImageFont
+
+        family, style = ImageFont.truetype(path, 12).getname()
+    except (OSError, ValueError, ImportError):
+        return None, ""
+    return family, style or ""
+
+
+def resolve_font_file(family: str, bold: bool = False, italic: bool = False, fonts_dir: str = DEFAULT_FONTS_DIR) -> Optional[str]:
+    """Find a font file for ``family`` in ``fonts_dir`` (``Family-Bold.ttf`` etc.)."""
+    index = _font_index(fonts_dir)
+    base = _font_key(family)
+    styles = []
+    if bold and italic:
+        styles += ["bolditalic", "boldit"]
+    if bold:
+        styles.append("bold")
+    if italic:
+        styles += ["italic", "it"]
+    for style in styles + ["regular", ""]:
+        path = index.get(base + style)
+        if path:
+            return path
+    return None
+
+
+# ─────────────────────────────────────────────
+# template_layout.json (редактор сцени)
+# ─────────────────────────────────────────────
+def compile_layout(
+    layout: Mapping,
+    dpi: Optional[int] = None,
+    bleed: int = 0,
+    fonts_dir: str = DEFAULT_FONTS_DIR,
+    bindings: Mapping[str, DataBinding] = LAYOUT_BINDINGS,
+) -> RenderPlan:
+    """Compile an editor layout for ``dpi`` (default: the layout's own).
+
+    Relative anchors are resolved against the layout size, everything is
+    scaled by ``dpi / meta.dpi`` and shifted by ``bleed`` pixels.
+    """
+    meta = layout.get("meta", {})
+    base_w = float(meta.get("width", 744))
+    base_h = float(meta.get("height", 1038))
+    base_dpi = meta.get("dpi", 300) or 300
+    dpi = dpi or base_dpi
+    scale = dpi / base_dpi
+
+    compiled = []
+    for order, (item_id, cfg) in enumerate(layout.get("items", {}).items()):
+        kind = _layout_kind(cfg.get("type", "text"))
+        if kind is None:
+            continue
+        x, y = _layout_position(cfg, base_w, base_h)
+        size = cfg.get("size") or {}
+        font = None
+        fit = None
+        if kind == "text":
+            font_cfg = cfg.get("font", {})
+            family = font_cfg.get("family", "Arial")
+            bold = bool(font_cfg.get("bold", False))
+            italic = bool(font_cfg.get("italic", False))
+            font = FontSpec(
+                family=family,
+                pixel_size=float(font_cfg.get("size", 20)) * TEXT_POINT_DPI / 72 * scale,
+                bold=bold,
+                italic=italic,
+                underline=bool(font_cfg.get("underline", False)),
+                file=resolve_font_file(family, bold, italic, fonts_dir),
+            )
+            fit_cfg = parse_fit(cfg.get("fit"))
+            if fit_cfg:
+                fit = FitSpec(
+                    height=fit_cfg["height"] * scale,
+                    min_size=fit_cfg["min_size"],
+                    max_size=int(font_cfg.get("size", 20)),
+                    px_per_point=TEXT_POINT_DPI / 72 * scale,
+                )
+        pen = None
+        brush = None
+        if kind == "rect":
+            pen_cfg = cfg.get("pen", {"color": "#FFFFFF", "width": 1})
+            pen = (parse_color(pen_cfg.get("color", "#FFFFFF")), float(pen_cfg.get("width", 1)) * scale)
+            if cfg.get("brush"):
+                brush = parse_color(cfg["brush"].get("color", "#FFFFFF"))
+        shadow = None
+        if cfg.get("shadow"):
+            shadow_cfg = cfg["shadow"]
+            offset = shadow_cfg.get("offset", [0, 0])
+            shadow = ShadowSpec(
+                color=parse_color(shadow_cfg.get("color", "#000000"), (0, 0, 0, 255)),
+                offset=(float(offset[0]) * scale, float(offset[1]) * scale),
+                blur=float(shadow_cfg.get("blur", 0)) * scale,
+            )
+        default_w, default_h = (100, 100) if kind == "rect" else (0, 0)
+        compiled.append(
+            (
+                float(cfg.get("z", _DEFAULT_Z[kind])),
+                order,
+                PlanItem(
+                    item_id=item_id,
+                    kind=kind,
+                    x=x * scale + bleed,
+                    y=y * scale + bleed,
+                    width=float(size.get("w", default_w) or 0) * scale,
+                    height=float(size.get("h", default_h) or 0) * scale,
+                    z=float(cfg.get("z", _DEFAULT_Z[kind])),
+                    opacity=float(cfg.get("opacity", 1.0)),
+                    color=parse_color(cfg.get("color", "#FFFFFF")),
+                    text=cfg.get("text", ""),
+                    text_width=float(cfg.get("text_width") or 0) * scale,
+                    font=font,
+                    asset=cfg.get("asset"),
+                    pen=pen,
+                    brush=brush,
+                    shadow=shadow,
+                    binding=bindings.get(item_id),
+                    fit=fit,
+                ),
+            )
+        )
+    compiled.sort(key=lambda entry: (entry[0], entry[1]))
+    return RenderPlan(
+        width=int(round(base_w * scale)) + 2 * bleed,
+        height=int(round(base_h * scale)) + 2 * bleed,
+        dpi=int(dpi),
+        bleed=int(bleed),
+        background=(0, 0, 0, 0),
+        items=tuple(entry[2] for entry in compiled),
+    )
+
+
+_DEFAULT_Z = {"text": 5, "image": 2, "rect": 1}
+
+
+def _layout_kind(item_type: str) -> Optional[str]:
+    if item_type == "text":
+        return "text"
+    if item_type in {"image", "pixmap", "icon"}:
+        return "image"
+    if item_type in {"rect", "decor"}:
+        return "rect"
+    return None
+
+
+def _layout_position(cfg: Mapping, base_w: float, base_h: float) -> Tuple[float, float]:
+    """Same placement rule as ``CardSceneView._apply_relative_positions``."""
+    pos = cfg.get("pos", {})
+    bindings = cfg.get("bindings", {})
+    if not bindings.get("relative"):
+        return float(pos.get("x", 0)), float(pos.get("y", 0))
+    anchor = bindings.get("anchor", {})
+    rel_x = anchor.get("x")
+    rel_y = anchor.get("y")
+    if rel_x is None or rel_y is None:
+        rel_x = pos.get("x", 0) / max(1.0, base_w)
+        rel_y = pos.get("y", 0) / max(1.0, base_h)
+    return rel_x * base_w, rel_y * base_h
+
+
+# ─────────────────────────────────────────────
+# template.json (міліметри, CardRenderer)
+# ─────────────────────────────────────────────
+def mm_to_px(mm: float, dpi: int = 300) -> int:
+    return int((mm / 25.4) * dpi)
+
+
+def compile_mm_template(
+    template: Mapping,
+    dpi: int = 300,
+    bleed_mm: float = 0,
+    fonts_dir: str = DEFAULT_FONTS_DIR,
+) -> RenderPlan:
+    """Compile the millimetre ``template.json`` drawn by :class:`CardRenderer`.
+
+    Font sizes in this format are pixel sizes, and the stats block lists
+    one line per stat for unit cards only.
+    """
+    card = template.get("card", {})
+    width = mm_to_px(card.get("width_mm", 40) + bleed_mm * 2, dpi)
+    height = mm_to_px(card.get("height_mm", 62) + bleed_mm * 2, dpi)
+    items = []
+
+    art = template.get("art")
+    if art:
+        items.append(
+            PlanItem(
+                item_id="artwork",
+                kind="image",
+                x=mm_to_px(art["x"] + bleed_mm, dpi),
+                y=mm_to_px(art["y"] + bleed_mm, dpi),
+                width=mm_to_px(art["w"], dpi),
+                height=mm_to_px(art["h"], dpi),
+                z=1,
+                keep_aspect=False,
+                binding=LAYOUT_BINDINGS["artwork"],
+            )
+        )
+
+    title = template.get("title")
+    if title:
+        items.append(
+            PlanItem(
+                item_id="title",
+                kind="text",
+                x=mm_to_px(title["x"] + bleed_mm, dpi),
+                y=mm_to_px(title["y"] + bleed_mm, dpi),
+                z=2,
+                color=parse_color(title.get("color", "#FFFFFF")),
+                font=_mm_font(title, fonts_dir),
+                binding=DataBinding(("name",), missing=""),
+            )
+        )
+
+    stats = template.get("stats")
+    if stats:
+        x = mm_to_px(stats["x"] + bleed_mm, dpi)
+        y = mm_to_px(stats["y"] + bleed_mm, dpi)
+        font = _mm_font(stats, fonts_dir)
+        for line, key in enumerate(STAT_KEYS):
+            items.append(
+                PlanItem(
+                    item_id=f"stat_{key}",
+                    kind="text",
+                    x=x,
+                    y=y + line * (stats["size"] + 2),
+                    z=2,
+                    color=parse_color(stats.get("color", "#FFFFFF")),
+                    font=font,
+                    binding=DataBinding((key,), fmt=f"{key.upper()}: {{}}", missing="", when=("type", "unit")),
+                )
+            )
+
+    return RenderPlan(
+        width=width,
+        height=height,
+        dpi=int(dpi),
+        bleed=mm_to_px(bleed_mm, dpi),
+        background=(0, 0, 0, 0),
+        items=tuple(items),
+    )
+
+
+def _mm_font(cfg: Mapping, fonts_dir: str) -> FontSpec:
+    font_file = cfg.get("font")
+    return FontSpec(
+        family=os.path.splitext(font_file or "")[0],
+        pixel_size=float(cfg.get("size", 12)),
+        file=os.path.join(fonts_dir, font_file) if font_file else None,
+    )
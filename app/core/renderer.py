@@ -1,7 +1,15 @@
+import math
 import os
-from PIL import Image, ImageDraw, ImageFont
+from dataclasses import replace
+from PIL import Image, ImageDraw, ImageFilter, ImageFont
 import sys
 
+from .art_cache import get_art_cache
+from .encoder_profiles import get_profile
+from .image_loader import fit_size, get_image_loader
+from .render_plan import DEFAULT_FONTS_DIR, compile_layout, compile_mm_template, parse_color
+from .text_fit import fit_font_size
+
 def resource_path(*paths):
     if hasattr(sys, '_MEIPASS'):
         return os.path.join(sys._MEIPASS, *paths)
@@ -9,11 +17,18 @@ def resource_path(*paths):
 
 
 class CardRenderer:
-    def __init__(self, template_path, frame_path, fonts_folder):
+    def __init__(self, template_path, frame_path, fonts_folder, image_loader=None, art_cache=None, art_pack=None):
         self.template_path = template_path
         self.frame_path = frame_path
         self.fonts_folder = fonts_folder
+        self.images = image_loader or get_image_loader()
+        self.art_cache = art_cache or get_art_cache()
+        # необов'язковий ArtPack з уже підігнаними артами колоди
+        self.art_pack = art_pack
         self.template = self.load_template()
+        self._plans = {}
+        self._fonts = {}
+        self._bases = {}
 
     def load_template(self):
         import json
@@ -35,61 +50,61 @@ class CardRenderer:
     def mm_to_px(self, mm, dpi=300):
         return int((mm / 25.4) * dpi)
 
+    def render_plan(self, bleed_mm=0):
+        """Скомпільований план template.json для заданого bleed (кешується)."""
+        plan = self._plans.get(bleed_mm)
+        if plan is None:
+            plan = compile_mm_template(self.template, dpi=300, bleed_mm=bleed_mm, fonts_dir=self.fonts_folder)
+            self._plans[bleed_mm] = plan
+        return plan
+
+    def _font(self, spec):
+        key = (spec.file, spec.pixel_size)
+        font = self._fonts.get(key)
+        if font is None:
+            font = ImageFont.truetype(spec.file, spec.pixel_size)
+            self._fonts[key] = font
+        return font
+
+    def _load_art(self, art_path, item):
+        w, h = int(item.width), int(item.height)
+        if self.art_pack is not None and self.art_pack.matches(w, h, keep_aspect=item.keep_aspect):
+            art = self.art_pack.image(art_path)
+            if art is not None:
+                return art
+        return self.art_cache.load(art_path, w, h, dpi=300, keep_aspect=item.keep_aspect)
+
+    def _static_base(self, plan, deck_color, bleed_mm):
+        """Фон + перефарбована рамка: однакові для всіх карт колоди, рендеримо раз."""
+        key = (bleed_mm, deck_color)
+        base = self._bases.get(key)
+        if base is None:
+            base = Image.new("RGBA", (plan.width, plan.height), plan.background)
+            frame = self.images.load_scaled(self.frame_path, plan.width, plan.height)
+            if frame is None:
+                raise FileNotFoundError(f"Frame image not readable: {self.frame_path}")
+            # кешоване зображення спільне — перефарбовуємо копію
+            frame = frame.copy()
+            dc = tuple(int(deck_color[i:i+2], 16) for i in (1,3,5))
+            frame = self.recolor_frame(frame, dc)
+            base.alpha_composite(frame, (0,0))
+            self._bases[key] = base
+        return base
+
     def render_card(self, card_data, deck_color, bleed_mm=0):
-        card_w = self.mm_to_px(40 + bleed_mm * 2)
-        card_h = self.mm_to_px(62 + bleed_mm * 2)
-        canvas = Image.new("RGBA", (card_w, card_h), (0,0,0,0))
+        plan = self.render_plan(bleed_mm)
+        canvas = self._static_base(plan, deck_color, bleed_mm).copy()
         draw = ImageDraw.Draw(canvas)
 
-        frame = Image.open(self.frame_path).convert("RGBA")
-        frame = frame.resize((card_w, card_h), Image.LANCZOS)
-        dc = tuple(int(deck_color[i:i+2], 16) for i in (1,3,5))
-        frame = self.recolor_frame(frame, dc)
-        canvas.alpha_composite(frame, (0,0))
-
-        # ART
-        if "art" in self.template:
-            art_path = card_data.get("art_path", None)
-            if art_path and os.path.exists(art_path):
-                art = Image.open(art_path).convert("RGBA")
-                tw = self.mm_to_px(self.template["art"]["w"])
-                th = self.mm_to_px(self.template["art"]["h"])
-                tx = self.mm_to_px(self.template["art"]["x"] + bleed_mm)
-                ty = self.mm_to_px(self.template["art"]["y"] + bleed_mm)
-                art = art.resize((tw, th), Image.LANCZOS)
-                canvas.alpha_composite(art, (tx, ty))
-
-        # TITLE
-        if "title" in self.template:
-            title = card_data.get("name", "")
-            tx = self.mm_to_px(self.template["title"]["x"] + bleed_mm)
-            ty = self.mm_to_px(self.template["title"]["y"] + bleed_mm)
-            fs = self.template["title"]["size"]
-            font_path = os.path.join(self.fonts_folder, self.template["title"]["font"])
-            font = ImageFont.truetype(font_path, fs)
-            draw.text((tx, ty), title, font=font, fill=(255, 255, 255, 255))
-
-        # STATS
-        if "stats" in self.template and card_data.get("type") == "unit":
-            st = [
-                ("ATK", "atk"),
-                ("DEF", "def"),
-                ("STB", "stb"),
-                ("INIT", "init"),
-                ("RNG", "rng"),
-                ("MOVE", "move"),
-            ]
-            tx = self.mm_to_px(self.template["stats"]["x"] + bleed_mm)
-            ty = self.mm_to_px(self.template["stats"]["y"] + bleed_mm)
-            fs = self.template["stats"]["size"]
-            font_path = os.path.join(self.fonts_folder, self.template["stats"]["font"])
-            font = ImageFont.truetype(font_path, fs)
-
-            offset = 0
-            for label, key in st:
-                val = str(card_data.get(key, ""))
-                draw.text((tx, ty + offset), f"{label}: {val}", font=font, fill=(255,255,255,255))
-                offset += fs + 2
+        # Далі — лише підстановка даних картки у скомпільований план
+        for item, value in plan.bind(card_data):
+            if item.kind == "image":
+                art = self._load_art(value, item)
+                if art is not None:
+                    canvas.alpha_composite(art, (int(item.x), int(item.y)))
+            elif item.kind == "text":
+                text = item.text if value is None else value
+                draw.text((item.x, item.y), text, font=self._font(item.font), fill=item.color)
 
         return canvas
 
@@ -97,11 +112,11 @@ class CardRenderer:
     #   ДОБАВЛЕНІ ПРАВИЛЬНО ВИРІВНЯНІ МЕТОДИ
     # ==========================================
 
-    def save_png(self, card_image, out_path):
-        """Зберігає PNG-файл картки."""
+    def save_png(self, card_image, out_path, profile=None):
+        """Зберігає PNG-файл картки (профіль кодера — див. core.encoder_profiles)."""
         try:
             os.makedirs(os.path.dirname(out_path), exist_ok=True)
-            card_image.save(out_path, format="PNG")
+            get_profile(profile).save(card_image, out_path)
         except Exception as e:
             print(f"[Renderer] Error saving PNG: {e}")
             raise
@@ -113,3 +128,346 @@ class CardRenderer:
             file_name = f"{card['name'].replace(' ', '_')}.png"
             out_path = os.path.join(export_dir, file_name)
             self.save_png(img, out_path)
+
+
+# ==========================================
+#   РЕНДЕР template_layout.json БЕЗ Qt
+# ==========================================
+
+# QTextDocument.documentMargin() — відступ тексту QGraphicsTextItem.
+QT_DOCUMENT_MARGIN = 4
+DEFAULT_ART_COLOR = (45, 60, 75, 255)
+DEFAULT_ART_SIZE = (520, 320)
+CARD_BORDER_Z = -5
+FRAME_Z = -2
+
+
+class LayoutRenderer:
+    """Renders ``editor/template_layout.json`` with Pillow only.
+
+    Reproduces :meth:`CardSceneView.export_to_png`: the deck-coloured card
+    border, the unscaled frame and the layout items in z-order, with text
+    wrapping at ``text_width``, KeepAspectRatio images, rects, opacity,
+    drop shadows and relative bindings. The module imports no Qt, so it is
+    safe for headless render nodes and worker processes
+    (:func:`render_cards_parallel`).
+
+    Items without a data binding, the frame and the border are rasterized
+    once per deck colour and reused for every card; create a new renderer
+    when the layout or frame changes.
+    """
+
+    def __init__(self, layout, frame_path=None, fonts_folder=DEFAULT_FONTS_DIR, dpi=None, bleed=0,
+                 image_loader=None, art_cache=None, art_pack=None):
+        if isinstance(layout, str):
+            import json
+            with open(layout, "r", encoding="utf-8") as f:
+                layout = json.load(f)
+        self.frame_path = frame_path
+        self.images = image_loader or get_image_loader()
+        self.art_cache = art_cache or get_art_cache()
+        self.art_pack = art_pack
+        self.plan = compile_layout(layout, dpi=dpi, bleed=bleed, fonts_dir=fonts_folder)
+        self.scale = self.plan.dpi / (layout.get("meta", {}).get("dpi", 300) or 300)
+        self._fonts = {}
+        self._steps = self._plan_steps()
+        self._static_layers = {}
+
+    def render_card(self, card_data, deck_color="#FFFFFF"):
+        plan = self.plan
+        canvas = None
+        for index, (static, payload) in enumerate(self._steps):
+            if static:
+                layer, x, y = self._static_layer(index, payload, deck_color)
+                if canvas is None:
+                    canvas = layer.copy()
+                elif layer is not None:
+                    _composite(canvas, layer, x, y)
+                continue
+            if canvas is None:
+                canvas = Image.new("RGBA", (plan.width, plan.height), plan.background)
+            if payload.binding.visible(card_data):
+                self._draw_item(canvas, payload, payload.binding.resolve(card_data))
+        if canvas is None:
+            canvas = Image.new("RGBA", (plan.width, plan.height), plan.background)
+        return canvas
+
+    # ------------------------------------------------------------------
+    def _plan_steps(self):
+        """Split the z-ordered draw list into static runs and data-bound items.
+
+        The card border and the frame have fixed z values and are woven in
+        before plan items of the same z, as in the scene. Consecutive
+        static entries form one run that :meth:`_static_layer` rasterizes
+        once per deck colour.
+        """
+        fixed = [(CARD_BORDER_Z, self._draw_border), (FRAME_Z, self._draw_frame)]
+        steps = []
+
+        def add_static(entry):
+            if steps and steps[-1][0]:
+                steps[-1][1].append(entry)
+            else:
+                steps.append((True, [entry]))
+
+        for item in self.plan.items:
+            while fixed and fixed[0][0] <= item.z:
+                add_static(fixed.pop(0)[1])
+            if item.dynamic:
+                steps.append((False, item))
+            else:
+                add_static(item)
+        for _, draw_fixed in fixed:
+            add_static(draw_fixed)
+        return steps
+
+    def _static_layer(self, index, entries, deck_color):
+        """Rasterized static run; the first run stays full size and becomes the base."""
+        key = (index, deck_color)
+        if key not in self._static_layers:
+            plan = self.plan
+            layer = Image.new("RGBA", (plan.width, plan.height), plan.background)
+            for entry in entries:
+                if callable(entry):
+                    entry(layer, deck_color)
+                else:
+                    self._draw_item(layer, entry, None)
+            x = y = 0
+            if index > 0:
+                bbox = layer.getbbox()
+                if bbox is None:
+                    layer = None
+                else:
+                    layer, x, y = layer.crop(bbox), bbox[0], bbox[1]
+            self._static_layers[key] = (layer, x, y)
+        return self._static_layers[key]
+
+    def save_png(self, card_image, out_path, profile=None):
+        os.makedirs(os.path.dirname(out_path) or ".", exist_ok=True)
+        get_profile(profile).save(card_image, out_path, dpi=self.plan.dpi)
+
+    # ------------------------------------------------------------------
+    def _draw_border(self, canvas, deck_color):
+        # перо шириною 2 по краю card rect: усередині картки видно половину
+        width = max(1, round(self.scale))
+        bleed = self.plan.bleed
+        box = (bleed, bleed, self.plan.width - bleed - 1, self.plan.height - bleed - 1)
+        ImageDraw.Draw(canvas).rectangle(box, outline=parse_color(deck_color), width=width)
+
+    def _draw_frame(self, canvas, _deck_color):
+        if not self.frame_path:
+            return
+        frame = self.images.load(self.frame_path)
+        if frame is None:
+            return
+        if self.scale != 1:
+            frame = self.images.load_scaled(
+                self.frame_path, round(frame.width * self.scale), round(frame.height * self.scale)
+            )
+        _composite(canvas, frame, self.plan.bleed, self.plan.bleed)
+
+    # ------------------------------------------------------------------
+    def _draw_item(self, canvas, item, value):
+        if item.kind == "text":
+            layer, x, y = self._text_layer(item, item.text if value is None else value)
+        elif item.kind == "image":
+            layer, x, y = self._image_layer(item, value), item.x, item.y
+        else:
+            layer, x, y = self._rect_layer(item)
+        if layer is None:
+            return
+        if item.shadow is not None:
+            layer, x, y = _with_shadow(layer, x, y, item.shadow)
+        if item.opacity < 1:
+            alpha = layer.getchannel("A").point(lambda a: round(a * max(0.0, item.opacity)))
+            layer.putalpha(alpha)
+        _composite(canvas, layer, x, y)
+
+    def _font(self, spec):
+        """(font, line height, ascent) for a plan font, cached per file and size."""
+        # FreeType у Qt хінтить до цілого ppem — рендеримо тим самим розміром.
+        size = max(1, round(spec.pixel_size))
+        key = (spec.file, size)
+        cached = self._fonts.get(key)
+        if cached is None:
+            if spec.file:
+                font = ImageFont.truetype(spec.file, size)
+                # getmetrics() округлює вгору; дробові метрики беремо з 1000 px
+                ascent, descent = ImageFont.truetype(spec.file, 1000).getmetrics()
+                ascent, descent = ascent * size / 1000, descent * size / 1000
+            else:
+                font = ImageFont.load_default(size)
+                ascent, descent = font.getmetrics()
+            cached = (font, ascent + descent, ascent)
+            self._fonts[key] = cached
+        return cached
+
+    def _fitted_font(self, item, text):
+        """Plan font of ``item``, shrunk to its fit box when it has one."""
+        if item.fit is None or not text:
+            return item.font
+        fit = item.fit
+        margin = QT_DOCUMENT_MARGIN * self.scale
+        wrap_width = item.text_width - 2 * margin if item.text_width else None
+
+        def measure(points):
+            spec = replace(item.font, pixel_size=points * fit.px_per_point)
+            font, line_height, _ = self._font(spec)
+            return len(_wrap_text(text, font, wrap_width)) * line_height + 2 * margin
+
+        points = fit_font_size(
+            text,
+            ("pil", item.font.file, item.font.family, fit.px_per_point),
+            item.text_width,
+            fit.height,
+            fit.min_size,
+            fit.max_size,
+            measure,
+        )
+        return replace(item.font, pixel_size=points * fit.px_per_point)
+
+    def _text_layer(self, item, text):
+        spec = self._fitted_font(item, text)
+        font, line_height, ascent = self._font(spec)
+        margin = QT_DOCUMENT_MARGIN * self.scale
+        wrap_width = item.text_width - 2 * margin if item.text_width else None
+        lines = _wrap_text(text, font, wrap_width)
+        if item.text_width:
+            width = item.text_width
+        else:
+            width = max((font.getlength(line) for line in lines), default=0) + 2 * margin
+        height = len(lines) * line_height + 2 * margin
+        layer = Image.new("RGBA", (max(1, int(math.ceil(width))), max(1, int(math.ceil(height)))), (0, 0, 0, 0))
+        draw = ImageDraw.Draw(layer)
+        for index, line in enumerate(lines):
+            top = margin + index * line_height
+            draw.text((margin, top), line, font=font, fill=item.color, anchor="la")
+            if item.font.underline and line:
+                underline_y = top + ascent + max(1.0, (line_height - ascent) / 4)
+                draw.line((margin, underline_y, margin + font.getlength(line), underline_y),
+                          fill=item.color, width=max(1, round(spec.pixel_size / 14)))
+        return layer, item.x, item.y
+
+    def _image_layer(self, item, value):
+        box = (int(item.width), int(item.height))
+        has_box = box[0] > 0 and box[1] > 0
+        if item.binding is None:
+            if not item.asset:
+                return None
+            if has_box:
+                return self.images.load_scaled(item.asset, box[0], box[1], keep_aspect=True)
+            return self.images.load(item.asset)
+
+        art = None
+        if value and has_box:
+            if self.art_pack is not None and self.art_pack.matches(box[0], box[1], keep_aspect=True):
+                art = self.art_pack.image(value)
+            if art is None:
+                art = self.art_cache.load(value, box[0], box[1], dpi=self.plan.dpi, keep_aspect=True)
+        elif value:
+            art = self.images.load(value)
+        if art is None:
+            # як у CardSceneView: заглушка 520x320, вписана у слот
+            placeholder = tuple(round(v * self.scale) for v in DEFAULT_ART_SIZE)
+            size = fit_size(placeholder, box) if has_box else placeholder
+            art = Image.new("RGBA", size, DEFAULT_ART_COLOR)
+        return art
+
+    def _rect_layer(self, item):
+        pen_color, pen_width = item.pen or ((255, 255, 255, 255), 1.0)
+        # перо ширини 0 у Qt — косметичне (1 px)
+        pen = max(1, round(pen_width))
+        width = max(1, round(item.width)) + pen
+        height = max(1, round(item.height)) + pen
+        layer = Image.new("RGBA", (width, height), (0, 0, 0, 0))
+        ImageDraw.Draw(layer).rectangle((0, 0, width - 1, height - 1), fill=item.brush, outline=pen_color, width=pen)
+        return layer, item.x - pen / 2, item.y - pen / 2
+
+
+def _wrap_text(text, font, wrap_width):
+    """Word-wrap like QTextDocument: greedy by words, long words overflow."""
+    lines = []
+    for paragraph in text.split("\n"):
+        if not wrap_width:
+            lines.append(paragraph)
+            continue
+        current = ""
+        for word in paragraph.split(" "):
+            candidate = f"{current} {word}" if current else word
+            if current and font.getlength(candidate) > wrap_width:
+                lines.append(current)
+                current = word
+            else:
+                current = candidate
+        lines.append(current)
+    return lines
+
+
+def _with_shadow(layer, x, y, shadow):
+    """Layer with a blurred drop shadow underneath (QGraphicsDropShadowEffect)."""
+    pad = int(math.ceil(shadow.blur))
+    dx, dy = shadow.offset
+    left = pad + max(0, -int(math.floor(dx)))
+    top = pad + max(0, -int(math.floor(dy)))
+    width = layer.width + 2 * pad + int(math.ceil(abs(dx)))
+    height = layer.height + 2 * pad + int(math.ceil(abs(dy)))
+
+    mask = Image.new("L", (width, height), 0)
+    mask.paste(layer.getchannel("A"), (left + round(dx), top + round(dy)))
+    if shadow.blur > 0:
+        mask = mask.filter(ImageFilter.GaussianBlur(shadow.blur / 2))
+    if shadow.color[3] < 255:
+        mask = mask.point(lambda a: a * shadow.color[3] // 255)
+    combined = Image.new("RGBA", (width, height), shadow.color[:3] + (0,))
+    combined.putalpha(mask)
+    combined.alpha_composite(layer, (left, top))
+    return combined, x - left, y - top
+
+
+def _composite(canvas, layer, x, y):
+    """alpha_composite at a possibly negative / fractional position, clipped to the canvas."""
+    # округлення як у растеризатора Qt (0.5 — вгору, не до парного)
+    x, y = int(math.floor(x + 0.5)), int(math.floor(y + 0.5))
+    src_x, src_y = max(0, -x), max(0, -y)
+    if src_x >= layer.width or src_y >= layer.height or x >= canvas.width or y >= canvas.height:
+        return
+    canvas.alpha_composite(layer, (max(0, x), max(0, y)), (src_x, src_y))
+
+
+# ------------------------------------------------------------------
+# Паралельний рендер у процесах
+# ------------------------------------------------------------------
+# Стан процесу-воркера, заповнює _init_render_worker
+_worker_renderer = None
+_worker_profile = None
+
+
+def _init_render_worker(layout, frame_path, fonts_folder, dpi, bleed, profile=None):
+    global _worker_renderer, _worker_profile
+    _worker_renderer = LayoutRenderer(layout, frame_path, fonts_folder, dpi=dpi, bleed=bleed)
+    _worker_profile = profile
+
+
+def _render_job(job):
+    card_data, deck_color, out_path = job
+    _worker_renderer.save_png(_worker_renderer.render_card(card_data, deck_color), out_path, _worker_profile)
+    return out_path
+
+
+def render_cards_parallel(layout, jobs, frame_path=None, fonts_folder=DEFAULT_FONTS_DIR, dpi=None, bleed=0, workers=None,
+                          profile=None):
+    """Render ``(card_data, deck_color, out_path)`` jobs on a process pool.
+
+    Each worker builds its own :class:`LayoutRenderer` once; ``layout`` is a
+    path or a dict. ``profile`` names the encoder profile of the files
+    (:mod:`core.encoder_profiles`). ``workers=1`` renders in the calling
+    process. Returns the written paths in job order.
+    """
+    init_args = (layout, frame_path, fonts_folder, dpi, bleed, profile)
+    if workers == 1:
+        _init_render_worker(*init_args)
+        return [_render_job(job) for job in jobs]
+    from concurrent.futures import ProcessPoolExecutor
+
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_render_worker, initargs=init_args) as pool:
+        return list(pool.map(_render_job, jobs, chunksize=4))
@@ -2,18 +2,27 @@
 
 from __future__ import annotations
 
+import hashlib
+import json
 import os
 import re
-from typing import Callable, Optional, Set
-
-from PySide6.QtGui import QPixmap
+from typing import Callable, Dict, Iterable, Optional, Set, Tuple
 
+from PIL import Image
 from widgets.card_scene_view import CardSceneView
 
-from .models import DeckModel
+from .archive_export import CardArchive
+from .atlas_export import ATLAS_GRID, AtlasBuilder
+from .deck_diff import card_identities, card_identity
+from .encoder_profiles import DEFAULT_ENCODE_WORKERS, ProfileReport, get_profile
+from .export_pipeline import EncodeQueue
+from .models import CardModel, DeckModel
+from .qt_images import load_pixmap
 
 
 WINDOWS_FORBIDDEN = set('<>:"/\\|?*')
+MANIFEST_NAME = "export_manifest.json"
+MANIFEST_VERSION = 1
 
 
 def slugify_card_name(name: str) -> str:
@@ -29,8 +38,12 @@ def slugify_card_name(name: str) -> str:
 
 
 class SceneExporter:
-    def __init__(self, scene_view: CardSceneView):
+    def __init__(self, scene_view: CardSceneView, profile=None, encode_workers: int = DEFAULT_ENCODE_WORKERS):
         self.scene_view = scene_view
+        # профіль кодера (core.encoder_profiles) і кількість потоків кодування
+        self.profile = get_profile(profile)
+        self.encode_workers = encode_workers
+        self.last_report: Optional[ProfileReport] = None
 
     def export_deck(
         self,
@@ -38,26 +51,246 @@ class SceneExporter:
         export_dir: str,
         frame_path: Optional[str] = None,
         progress: Optional[Callable[[int, int, str], None]] = None,
+        cards: Optional[Iterable[CardModel]] = None,
+        partial: bool = False,
     ) -> str:
+        """Render the cards of ``deck`` into ``export_dir``.
+
+        Export is incremental: ``export_manifest.json`` in the directory maps
+        each card identity to its content hash and file name, so unchanged
+        cards are skipped, changed cards are overwritten in place and files
+        of cards no longer in the deck are deleted.
+
+        ``cards`` overrides ``deck.cards`` with any iterable, e.g. the
+        iterator returned by :meth:`JSONLoader.open_stream`, so export can
+        start before the deck file is fully read. The total passed to
+        ``progress`` is 0 while it is unknown. With ``partial`` only
+        ``cards`` — a subset of ``deck.cards`` — are rendered; the other
+        cards of ``deck`` keep their files and manifest entries as they are.
+
+        Cards are encoded with :attr:`profile` by ``encode_workers``
+        threads of an :class:`EncodeQueue` while the next card renders;
+        ``progress`` reports a card once it is queued, and the manifest is
+        written after the queue has drained. Bytes and encode time of the
+        run end up in :attr:`last_report`.
+        """
         os.makedirs(export_dir, exist_ok=True)
+        self._apply_frame(frame_path)
+
+        previous = self._read_manifest(export_dir)
+        reserved = {entry["file"] for entry in previous.values()}
+        entries: Dict[str, Dict[str, str]] = {}
+        name_counts: Dict[str, int] = {}
+        identity_of: Dict[int, str] = {}
+        if partial:
+            for card, identity in zip(deck.cards, card_identities(deck.cards)):
+                identity_of[card.index] = identity
+                if identity in previous:
+                    entries[identity] = previous[identity]
+        render_signature = self._render_signature(frame_path)
+        used_paths: Set[str] = set()
+        total = len(deck) if cards is None else 0
+        extension = self.profile.extension
+        with self.scene_view.export_batch(), EncodeQueue(
+            workers=self.encode_workers, profile=self.profile
+        ) as encoder:
+            for idx, card in enumerate(deck.cards if cards is None else cards):
+                payload = card.payload
+                identity = identity_of[card.index] if partial else card_identity(card.name, name_counts)
+                digest = self._content_hash(payload, deck.deck_color, render_signature)
+                old_entry = previous.get(identity)
+                old_path = os.path.join(export_dir, old_entry["file"]) if old_entry else None
+                if old_path and old_path not in used_paths and old_path.endswith(extension):
+                    out_path = old_path
+                    used_paths.add(out_path)
+                else:
+                    safe_name, suffix = self._card_stem(card, idx)
+                    out_path = self._build_unique_path(export_dir, safe_name, suffix, used_paths, reserved, extension)
+                entries[identity] = {"file": os.path.basename(out_path), "hash": digest}
+
+                unchanged = old_entry is not None and old_entry["hash"] == digest and out_path == old_path
+                if not (unchanged and os.path.exists(out_path)):
+                    self.scene_view.apply_card_data(payload, deck.deck_color)
+                    self.scene_view.export_to_png(out_path, encoder=encoder)
+                if progress:
+                    progress(idx + 1, total, out_path)
+
+        kept_files = {entry["file"] for entry in entries.values()}
+        for entry in previous.values():
+            if entry["file"] not in kept_files:
+                stale_path = os.path.join(export_dir, entry["file"])
+                if os.path.exists(stale_path):
+                    os.remove(stale_path)
+        self._write_manifest(export_dir, entries)
+        self.last_report = ProfileReport(
+            self.profile.name, encoder.written, encoder.bytes_written, encoder.encode_seconds, encoder.workers
+        )
+        return export_dir
+
+    # ------------------------------------------------------------------
+    def export_archive(
+        self,
+        deck: DeckModel,
+        archive_path: str,
+        frame_path: Optional[str] = None,
+        progress: Optional[Callable[[int, int, str], None]] = None,
+        cards: Optional[Iterable[CardModel]] = None,
+        fmt: Optional[str] = None,
+    ) -> str:
+        """Stream the cards of ``deck`` into a ZIP or TAR archive.
+
+        The format comes from ``fmt`` or the suffix of ``archive_path``
+        (``.zip``, ``.tar``, ``.tar.gz``). Cards are encoded in memory by
+        the :class:`EncodeQueue` workers and appended entry by entry, so no
+        files are written besides the archive and memory does not grow with
+        the deck. ``manifest.json`` at the end lists every card with its
+        name, content hash, SHA-256 of the file and the export DPI.
+        ``cards`` and ``progress`` work as in :meth:`export_deck`.
+        """
+        self._apply_frame(frame_path)
+        render_signature = self._render_signature(frame_path)
+        used_names: Set[str] = set()
+        total = len(deck) if cards is None else 0
+        extension = self.profile.extension
+        with CardArchive(archive_path, fmt) as archive:
+            with self.scene_view.export_batch(), EncodeQueue(
+                workers=self.encode_workers, profile=self.profile
+            ) as encoder:
+                for idx, card in enumerate(deck.cards if cards is None else cards):
+                    payload = card.payload
+                    safe_name, suffix = self._card_stem(card, idx)
+                    file_name = self._build_unique_path("", safe_name, suffix, used_names, extension=extension)
+                    digest = self._content_hash(payload, deck.deck_color, render_signature)
+                    write = archive.reserve(file_name, {"name": card.name, "hash": digest})
+                    self.scene_view.apply_card_data(payload, deck.deck_color)
+                    self.scene_view.export_to_png(write, encoder=encoder)
+                    if progress:
+                        progress(idx + 1, total, file_name)
+            archive.finish(
+                {
+                    "deck": deck.name,
+                    "deck_color": deck.deck_color,
+                    "dpi": getattr(self.scene_view, "dpi", None),
+                    "profile": self.profile.name,
+                }
+            )
+        self.last_report = ProfileReport(
+            self.profile.name, encoder.written, encoder.bytes_written, encoder.encode_seconds, encoder.workers
+        )
+        return archive_path
+
+    # ------------------------------------------------------------------
+    def export_atlas(
+        self,
+        deck: DeckModel,
+        out_dir: str,
+        frame_path: Optional[str] = None,
+        progress: Optional[Callable[[int, int, str], None]] = None,
+        cards: Optional[Iterable[CardModel]] = None,
+        mode: str = "grid",
+        grid: Tuple[int, int] = ATLAS_GRID,
+        reserve_back: bool = False,
+        back_path: Optional[str] = None,
+        card_width: Optional[int] = None,
+        **atlas_options,
+    ) -> str:
+        """Render ``deck`` into sprite sheets plus a JSON index of UV rects.
+
+        See :mod:`core.atlas_export` for ``mode`` (``grid`` / ``pack``),
+        the reserved back slot and further ``atlas_options``. With
+        ``card_width`` cards are rendered straight at that width instead of
+        full size. Only the sheets being filled and encoded are in memory.
+        Returns the path of the index (``<deck>-atlas.json``).
+        """
+        self._apply_frame(frame_path)
+        render_signature = self._render_signature(frame_path)
+        back = None
+        if back_path:
+            with Image.open(back_path) as img:
+                back = img.convert("RGBA")
+        total = len(deck) if cards is None else 0
+        basename = f"{slugify_card_name(deck.name)}-atlas"
+        with self.scene_view.export_batch(), AtlasBuilder(
+            out_dir,
+            basename,
+            mode=mode,
+            grid=grid,
+            reserve_back=reserve_back,
+            back=back,
+            profile=self.profile,
+            **atlas_options,
+        ) as atlas:
+            for idx, card in enumerate(deck.cards if cards is None else cards):
+                payload = card.payload
+                digest = self._content_hash(payload, deck.deck_color, render_signature)
+                self.scene_view.apply_card_data(payload, deck.deck_color)
+                if card_width:
+                    image = self.scene_view.render_thumbnail(card_width)
+                else:
+                    image = self.scene_view.render_card_image()
+                entry = atlas.add(card.name, image, {"index": idx, "hash": digest})
+                if progress:
+                    progress(idx + 1, total, atlas.sheets[entry["sheet"]].file)
+            return atlas.finish({"deck": deck.name, "deck_color": deck.deck_color, "profile": self.profile.name})
+
+    # ------------------------------------------------------------------
+    def _apply_frame(self, frame_path: Optional[str]) -> None:
         if frame_path:
-            pixmap = QPixmap(frame_path)
+            pixmap = load_pixmap(frame_path)
             if not pixmap.isNull():
                 self.scene_view.set_frame_pixmap(pixmap)
-        used_paths: Set[str] = set()
-        for idx, card in enumerate(deck.cards):
-            self.scene_view.apply_card_data(card.payload, deck.deck_color)
-            safe_name = slugify_card_name(card.name)
-            suffix = None
-            if hasattr(card, "index") and isinstance(card.index, int):
-                suffix = f"{card.index + 1:03d}"
-            else:
-                suffix = f"{idx + 1:03d}"
-            out_path = self._build_unique_path(export_dir, safe_name, suffix, used_paths)
-            self.scene_view.export_to_png(out_path)
-            if progress:
-                progress(idx + 1, len(deck), out_path)
-        return export_dir
+
+    # ------------------------------------------------------------------
+    def _card_stem(self, card: CardModel, idx: int) -> Tuple[str, str]:
+        safe_name = slugify_card_name(card.name)
+        if hasattr(card, "index") and isinstance(card.index, int):
+            suffix = f"{card.index + 1:03d}"
+        else:
+            suffix = f"{idx + 1:03d}"
+        return safe_name, suffix
+
+    # ------------------------------------------------------------------
+    def _render_signature(self, frame_path: Optional[str]) -> str:
+        """Describe everything except card data that affects the output."""
+        layout = getattr(self.scene_view, "layout", None)
+        parts = {
+            "layout": layout if isinstance(layout, dict) else {},
+            "frame": _file_signature(frame_path),
+        }
+        if not self.profile.native:
+            parts["profile"] = self.profile.name
+        return json.dumps(parts, sort_keys=True, ensure_ascii=False, default=str)
+
+    # ------------------------------------------------------------------
+    def _content_hash(self, payload: Dict, deck_color: str, render_signature: str) -> str:
+        return card_content_hash(payload, deck_color, render_signature)
+
+    # ------------------------------------------------------------------
+    def _read_manifest(self, export_dir: str) -> Dict[str, Dict[str, str]]:
+        path = os.path.join(export_dir, MANIFEST_NAME)
+        try:
+            with open(path, "r", encoding="utf-8") as fh:
+                data = json.load(fh)
+        except (OSError, ValueError):
+            return {}
+        if not isinstance(data, dict) or data.get("version") != MANIFEST_VERSION:
+            return {}
+        cards = data.get("cards")
+        if not isinstance(cards, dict):
+            return {}
+        return {
+            identity: entry
+            for identity, entry in cards.items()
+            if isinstance(entry, dict) and isinstance(entry.get("file"), str) and isinstance(entry.get("hash"), str)
+        }
+
+    # ------------------------------------------------------------------
+    def _write_manifest(self, export_dir: str, entries: Dict[str, Dict[str, str]]) -> None:
+        path = os.path.join(export_dir, MANIFEST_NAME)
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as fh:
+            json.dump({"version": MANIFEST_VERSION, "cards": entries}, fh, indent=2, ensure_ascii=False)
+        os.replace(tmp_path, path)
 
     # ------------------------------------------------------------------
     def _build_unique_path(
@@ -66,17 +299,48 @@ class SceneExporter:
         safe_name: str,
         suffix: Optional[str],
         used_paths: Set[str],
+        reserved_files: Set[str] = frozenset(),
+        extension: str = ".png",
     ) -> str:
+        """Pick a file name not taken in this run or owned by the manifest.
+
+        Files left over without a manifest entry are overwritten rather
+        than duplicated.
+        """
         stem = safe_name
         if suffix:
             stem = f"{safe_name}-{suffix}"
 
         candidate = stem
         counter = 1
-        path = os.path.join(export_dir, f"{candidate}.png")
-        while path in used_paths or os.path.exists(path):
+        path = os.path.join(export_dir, f"{candidate}{extension}")
+        while path in used_paths or f"{candidate}{extension}" in reserved_files:
             candidate = f"{stem}-{counter}"
-            path = os.path.join(export_dir, f"{candidate}.png")
+            path = os.path.join(export_dir, f"{candidate}{extension}")
             counter += 1
         used_paths.add(path)
         return path
+
+
+def card_content_hash(payload: Dict, deck_color: str, render_signature: str) -> str:
+    """Hash of everything that affects a rendered card.
+
+    ``render_signature`` describes the card-independent inputs (layout,
+    frame, output size); the art file is identified by size and mtime.
+    """
+    digest = hashlib.sha1()
+    digest.update(render_signature.encode("utf-8"))
+    digest.update(deck_color.encode("utf-8"))
+    digest.update(json.dumps(payload, sort_keys=True, ensure_ascii=False, default=str).encode("utf-8"))
+    digest.update(json.dumps(_file_signature(payload.get("art_path"))).encode("utf-8"))
+    return digest.hexdigest()
+
+
+def _file_signature(path: Optional[str]):
+    if not path:
+        return None
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return [path, None]
+    return [path, stat.st_size, stat.st_mtime_ns]
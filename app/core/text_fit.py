@@ -0,0 +1,88 @@
+"""Auto-shrink of card text into a fixed box with memoized measurements."""
+
+from __future__ import annotations
+
+from typing import Callable, Hashable, Optional
+
+from .lru import LRUCache, process_wide
+
+MEASURE_CACHE_SIZE = 50_000
+FIT_MODE_SHRINK = "shrink"
+DEFAULT_MIN_SIZE = 6
+
+
+class TextMeasureCache(LRUCache):
+    """LRU of text heights keyed by ``(text, font key, size, width)``.
+
+    A measurement is a full text layout (wrapping included), so repeated
+    candidates across cards — same descriptions, same sizes probed by the
+    binary search — are laid out only once. Safe to share between threads.
+    """
+
+    def __init__(self, maxsize: int = MEASURE_CACHE_SIZE):
+        super().__init__(maxsize)
+
+    # ------------------------------------------------------------------
+    def height(self, text: str, font_key: Hashable, size: int, width: float, measure: Callable[[int], float]) -> float:
+        return self.get_or_compute((text, font_key, size, width), lambda: float(measure(size)))
+
+    def clear(self, reset_stats: bool = True) -> None:
+        super().clear(reset_stats)
+
+
+def fit_font_size(
+    text: str,
+    font_key: Hashable,
+    width: float,
+    height: float,
+    min_size: int,
+    max_size: int,
+    measure: Callable[[int], float],
+    cache: Optional[TextMeasureCache] = None,
+) -> int:
+    """Largest integer size in ``[min_size, max_size]`` whose text fits ``height``.
+
+    ``measure(size)`` returns the laid-out text height at ``size``; results
+    are memoized in ``cache``. Text that does not fit even at ``min_size``
+    gets ``min_size``.
+    """
+    cache = cache or get_text_measure_cache()
+    min_size = int(min_size)
+    max_size = max(min_size, int(max_size))
+
+    def fits(size: int) -> bool:
+        return cache.height(text, font_key, size, width, measure) <= height
+
+    if fits(max_size):
+        return max_size
+    best, low, high = min_size, min_size, max_size - 1
+    while low <= high:
+        mid = (low + high) // 2
+        if fits(mid):
+            best, low = mid, mid + 1
+        else:
+            high = mid - 1
+    return best
+
+
+def parse_fit(cfg) -> Optional[dict]:
+    """Normalized ``fit`` config of a layout text item, or ``None`` if off.
+
+    Layout JSON: ``"fit": {"mode": "shrink", "height": 200, "min_size": 10}``;
+    the item's font size is the upper bound.
+    """
+    if not isinstance(cfg, dict) or cfg.get("mode", FIT_MODE_SHRINK) != FIT_MODE_SHRINK:
+        return None
+    try:
+        height = float(cfg["height"])
+    except (KeyError, TypeError, ValueError):
+        return None
+    if height <= 0:
+        return None
+    return {"height": height, "min_size": int(cfg.get("min_size", DEFAULT_MIN_SIZE))}
+
+
+@process_wide
+def get_text_measure_cache() -> TextMeasureCache:
+    """Process-wide :class:`TextMeasureCache`."""
+    return TextMeasureCache()
@@ -1,10 +1,12 @@
 import json
 import logging
+import multiprocessing
 import os
 import sys
 import traceback
+from itertools import islice
 
-from PySide6.QtGui import QPixmap
+from PySide6.QtCore import QTimer
 
 
 from core.paths import application_base_dir
@@ -69,13 +71,19 @@ def resource_path(*paths):
 from PySide6.QtWidgets import (
     QApplication,
     QFileDialog,
-    QListWidgetItem,
     QMessageBox,
     QMainWindow,
 )
 
+from core.art_cache import ART_CACHE_DIR_NAME, configure_art_cache
+from core.art_pack import ArtPack, art_pack_path
+from core.deck_cache import DeckCache
+from core.deck_diff import affected_card_indices, art_snapshot, card_identities, changed_art_files
+from core.deck_watcher import KIND_ARTS, KIND_DECK, KIND_FRAME, KIND_LAYOUT, DeckWatcher
+from core.encoder_profiles import DEFAULT_PROFILE, PROFILES
 from core.json_loader import JSONLoader
 from core.pdf_exporter import PDFExporter
+from core.qt_images import load_pixmap
 from core.scene_exporter import SceneExporter
 
 
@@ -93,6 +101,13 @@ def save_config(cfg):
     with open(config_path, "w", encoding="utf-8") as f:
         json.dump(cfg, f, indent=4, ensure_ascii=False)
 
+
+# Скільки карт додається до списку за один прохід event loop під час потокового читання
+CARD_STREAM_BATCH = 200
+# Ширина карти в атласі за замовчуванням: 10×7 аркуш повної роздільності
+# займає сотні мегабайт і не влазить у текстуру більшості рушіїв.
+ATLAS_CARD_WIDTH = 500
+
 class MainWindow(QMainWindow):
     def __init__(self):
         super().__init__()
@@ -107,6 +122,7 @@ class MainWindow(QMainWindow):
         self.base_dir = BASE_DIR
         self.logger = logger
         self.template_path = resource_path("editor", "template_layout.json")
+        self._configure_art_cache()
         self.frame_path = self.config.get(
             "frame_path", resource_path("frames", "base_frame.png")
         )
@@ -117,13 +133,22 @@ class MainWindow(QMainWindow):
             f"Рамка: {os.path.basename(self.frame_path)}"
         )
 
-        self.ui.sceneView.itemSelected.connect(self.ui.propertyPanel.bind_item)
-
         self.connect_buttons()
 
         self.current_deck = None
         self.current_deck_path = None
-        self.scene_exporter = SceneExporter(self.ui.sceneView)
+        self.deck_cache = DeckCache()
+        self._card_stream = None
+        self._card_stream_cache = None
+        self._card_stream_timer = QTimer(self)
+        self._card_stream_timer.setInterval(0)
+        self._card_stream_timer.timeout.connect(self._consume_card_stream)
+        self.scene_exporter = SceneExporter(self.ui.sceneView, profile=self._export_profile())
+
+        self._art_snapshot = {}
+        self.deck_watcher = DeckWatcher(self)
+        self.deck_watcher.changed.connect(self._on_watched_files_changed)
+        self._watch_current_files()
 
         self.setWindowTitle("CardGenerator — Alpha Build")
         self.resize(1400, 900)
@@ -146,12 +171,13 @@ class MainWindow(QMainWindow):
         self.ui.labelFrameStatus.setText(f"Рамка: {os.path.basename(path)}")
 
         self._apply_frame_to_scene(path)
+        self._watch_current_files()
 
         QMessageBox.information(self, "OK", f"Рамка вибрана:\n{path}")
         self._log(f"Frame selected: {path}")
 
     def _apply_frame_to_scene(self, path: str):
-        pixmap = QPixmap(path)
+        pixmap = load_pixmap(path)
         if pixmap.isNull():
             return
         self.ui.sceneView.set_frame_pixmap(pixmap)
@@ -163,8 +189,12 @@ class MainWindow(QMainWindow):
             self.ui.btnSelectFrame.clicked.connect(self.select_frame)
             self.ui.btnGeneratePreview.clicked.connect(self.generate_preview)
             self.ui.btnGenerateSet.clicked.connect(self.generate_set)
+            self.ui.btnGenerateArchive.clicked.connect(self.generate_archive)
+            self.ui.btnGenerateAtlas.clicked.connect(self.generate_atlas)
             self.ui.btnGeneratePDF.clicked.connect(self.generate_pdf)
-            self.ui.cardList.currentRowChanged.connect(self.update_preview_for_selection)
+            self.ui.cardList.selectionModel().currentChanged.connect(self.update_preview_for_selection)
+            self.ui.cardSearch.textChanged.connect(self._on_card_filter_changed)
+            self.ui.deckGallery.clicked.connect(self._on_gallery_clicked)
             self.ui.comboEditMode.currentTextChanged.connect(self._on_edit_mode_changed)
             self.ui.chkTemplateLock.toggled.connect(self.ui.sceneView.set_template_locked)
         except Exception as e:
@@ -179,6 +209,7 @@ class MainWindow(QMainWindow):
         if folder:
             self.config["workspace"] = folder
             save_config(self.config)
+            self._configure_art_cache()
             QMessageBox.information(self, "OK", f"Workspace встановлено:\n{folder}")
             self.ui.labelWorkspaceStatus.setText(f"Експорт: {folder}")
             self._log(f"Workspace set to: {folder}")
@@ -191,38 +222,129 @@ class MainWindow(QMainWindow):
 
         try:
             loader = JSONLoader(path)
-            deck = loader.load()
+            cache_key = self.deck_cache.snapshot_key(loader)
+            deck = self.deck_cache.load(loader, cache_key)
+            cards = None
+            if deck is None:
+                deck, cards = loader.open_stream()
             self.current_deck = deck
             self.current_deck_path = path
+            self._open_art_pack(loader)
 
             self.config["last_deck"] = path
             save_config(self.config)
 
-            QMessageBox.information(self, "OK", f"Колодa завантажена:\n{os.path.basename(path)}")
             self.ui.labelJsonStatus.setText(f"JSON: {os.path.basename(path)}")
+            self._stop_card_stream()
             self._populate_card_list(deck)
-            self.update_preview_for_selection()
-            self._log(f"Deck loaded: {path}")
+            if cards is not None:
+                self._start_card_stream(cards, cache=(loader, cache_key))
+            else:
+                self._watch_current_files()
+                self._log(f"Deck loaded from cache: {path} ({len(deck)} cards)")
+            QMessageBox.information(self, "OK", f"Колодa завантажена:\n{os.path.basename(path)}")
 
         except Exception as e:
             QMessageBox.critical(self, "Помилка", f"JSON не вдалося прочитати:\n{str(e)}")
             self._log(f"Failed to load deck {path}: {e}")
 
+    def _open_art_pack(self, loader):
+        """Підключає <колода>.artpack поруч із папкою arts, якщо його зібрано (python -m core.art_pack)."""
+        pack = ArtPack.open(art_pack_path(loader.arts_dir, loader.deck_name))
+        self.ui.sceneView.set_art_pack(pack)
+        if pack is not None:
+            self._log(f"Art pack opened: {pack.path} ({len(pack)} arts)")
+
+    # ---------------------------
+    # Потокове заповнення списку карт
+    # ---------------------------
+    def _start_card_stream(self, cards, cache=None):
+        """Fill the card list in batches while the deck file is still being parsed.
+
+        ``cache`` is an optional ``(loader, key)`` pair; the fully streamed
+        deck is then written to :attr:`deck_cache` for the next reopen.
+        """
+        self._stop_card_stream()
+        self._card_stream = cards
+        self._card_stream_cache = cache
+        self._consume_card_stream()
+        if self._card_stream is not None:
+            self._card_stream_timer.start()
+
+    def _stop_card_stream(self):
+        self._card_stream_timer.stop()
+        stream, self._card_stream = self._card_stream, None
+        self._card_stream_cache = None
+        # Недочитаний генератор тримає відкритим файл колоди — закриваємо явно.
+        close = getattr(stream, "close", None)
+        if close is not None:
+            close()
+
+    def _consume_card_stream(self):
+        deck = self.current_deck
+        if self._card_stream is None or deck is None:
+            self._stop_card_stream()
+            return
+        try:
+            batch = list(islice(self._card_stream, CARD_STREAM_BATCH))
+        except Exception as e:
+            self._stop_card_stream()
+            QMessageBox.critical(self, "Помилка", f"JSON не вдалося прочитати:\n{str(e)}")
+            self._log(f"Failed to stream deck {deck.path}: {e}")
+            return
+
+        was_empty = not deck.cards
+        deck.cards.extend(batch)
+        for model in self._card_models():
+            model.cards_appended()
+        if was_empty and deck.cards:
+            self._select_deck_index(0)
+
+        if len(batch) < CARD_STREAM_BATCH:
+            cache = self._card_stream_cache
+            self._stop_card_stream()
+            if cache is not None:
+                loader, cache_key = cache
+                self.deck_cache.store(loader, deck, cache_key)
+            self._watch_current_files()
+            self._log(f"Deck loaded: {deck.path} ({len(deck.cards)} cards)")
+
+    def _card_models(self):
+        return self.ui.cardModel, self.ui.deckGallery.gallery_model
+
     def _populate_card_list(self, deck, *, selected_index: int = 0):
-        self.ui.cardList.blockSignals(True)
-        self.ui.cardList.clear()
-        for card in deck.cards:
-            item = QListWidgetItem(card.name)
-            self.ui.cardList.addItem(item)
-        self.ui.cardList.blockSignals(False)
+        for model in self._card_models():
+            model.set_deck(deck)
         if deck.cards:
-            index = min(max(selected_index, 0), len(deck.cards) - 1)
-            self.ui.cardList.setCurrentRow(index)
+            self._select_deck_index(min(max(selected_index, 0), len(deck.cards) - 1))
+
+    def _select_deck_index(self, deck_index: int):
+        """Make ``deck_index`` current; the first visible card if it is filtered out."""
+        model = self.ui.cardModel
+        row = model.row_for_deck_index(deck_index)
+        if row < 0:
+            row = 0 if model.rowCount() else -1
+        self.ui.cardList.setCurrentIndex(model.index(row, 0))
+
+    def _current_deck_index(self) -> int:
+        return self.ui.cardModel.deck_index(self.ui.cardList.currentIndex().row())
+
+    def _on_card_filter_changed(self, text: str):
+        deck_index = self._current_deck_index()
+        for model in self._card_models():
+            model.set_filter(text)
+        if self.current_deck and self.current_deck.cards:
+            self._select_deck_index(deck_index)
+
+    def _on_gallery_clicked(self, index):
+        deck_index = self.ui.deckGallery.gallery_model.deck_index(index.row())
+        if deck_index >= 0:
+            self._select_deck_index(deck_index)
 
     def _current_card(self):
         if not self.current_deck or not self.current_deck.cards:
             return None
-        row = self.ui.cardList.currentRow()
+        row = self._current_deck_index()
         if row < 0:
             row = 0
         return self.current_deck.card_at(row) or self.current_deck.cards[0]
@@ -235,11 +357,13 @@ class MainWindow(QMainWindow):
             QMessageBox.warning(self, "Помилка", "Завантаж JSON колоди.")
             return
 
+        self._stop_card_stream()
         loader = JSONLoader(self.current_deck_path)
-        deck = loader.load()
-        current_row = self.ui.cardList.currentRow()
+        deck = self.deck_cache.load_or_build(loader)
+        current_row = self._current_deck_index()
         self.current_deck = deck
         self._populate_card_list(deck, selected_index=current_row)
+        self._watch_current_files()
 
         if not deck.cards:
             QMessageBox.warning(self, "Помилка", "У колоді немає карт.")
@@ -274,17 +398,178 @@ class MainWindow(QMainWindow):
             QMessageBox.warning(self, "Помилка", "Завантаж JSON колоди.")
             return
 
+        deck, cards = self._open_export_deck()
+        deck_export_dir = self._deck_export_dir(deck.name)
+        self.scene_exporter.export_deck(deck, deck_export_dir, frame_path=self.frame_path, cards=cards)
+
+        QMessageBox.information(self, "OK", f"Набір карт згенеровано:\n{deck_export_dir}")
+        self._log(f"Card set generated to: {deck_export_dir}")
+        self._log_export_report()
+
+    def generate_archive(self):
+        if not self.current_deck_path:
+            QMessageBox.warning(self, "Помилка", "Завантаж JSON колоди.")
+            return
+
+        deck_name = JSONLoader(self.current_deck_path).deck_name
+        default_path = os.path.join(os.path.dirname(self._deck_export_dir(deck_name)), f"{deck_name}.zip")
+        path, _ = QFileDialog.getSaveFileName(
+            self, "Зберегти архів", default_path, "ZIP (*.zip);;TAR (*.tar *.tar.gz *.tgz)"
+        )
+        if not path:
+            return
+        deck, cards = self._open_export_deck()
+        try:
+            self.scene_exporter.export_archive(deck, path, frame_path=self.frame_path, cards=cards)
+        except ValueError as e:
+            QMessageBox.warning(self, "Помилка", str(e))
+            return
+
+        QMessageBox.information(self, "OK", f"Архів збережено:\n{path}")
+        self._log(f"Card archive written to: {path}")
+        self._log_export_report()
+
+    def generate_atlas(self):
+        if not self.current_deck_path:
+            QMessageBox.warning(self, "Помилка", "Завантаж JSON колоди.")
+            return
+
+        deck, cards = self._open_export_deck()
+        atlas_dir = os.path.join(self._deck_export_dir(deck.name), "atlas")
+        index_path = self.scene_exporter.export_atlas(
+            deck,
+            atlas_dir,
+            frame_path=self.frame_path,
+            cards=cards,
+            reserve_back=True,
+            back_path=self.config.get("atlas_back") or None,
+            card_width=self.config.get("atlas_card_width", ATLAS_CARD_WIDTH) or None,
+        )
+
+        QMessageBox.information(self, "OK", f"Атлас збережено:\n{atlas_dir}")
+        self._log(f"Card atlas written to: {index_path}")
+
+    def _open_export_deck(self):
+        """Deck for export; without a fresh cache the cards are streamed."""
+        # Без актуального кешу експорт читає колоду потоково: рендер
+        # починається з першої картки, а в пам'яті тримається лише поточна.
         loader = JSONLoader(self.current_deck_path)
-        deck = loader.load()
-        self.current_deck = deck
+        deck = self.deck_cache.load(loader)
+        cards = None
+        if deck is None:
+            deck, cards = loader.open_stream()
+        return deck, cards
+
+    def _log_export_report(self):
+        report = self.scene_exporter.last_report
+        if report is not None and report.files:
+            self._log(
+                f"Export profile {report.profile}: {report.files} files, "
+                f"{report.bytes_per_file / 1024:.1f} KiB/file, {report.ms_per_file:.1f} ms/file encode "
+                f"({report.workers} workers)"
+            )
 
-        export_root = self.config.get("workspace") or os.path.join(self.base_dir, "export")
+    def _export_profile(self) -> str:
+        """Encoder profile from config.json ("export_profile"), see core.encoder_profiles."""
+        name = self.config.get("export_profile", DEFAULT_PROFILE)
+        if name not in PROFILES:
+            self._log(f"Unknown export profile {name!r}, using {DEFAULT_PROFILE}")
+            return DEFAULT_PROFILE
+        return name
 
-        deck_export_dir = os.path.join(export_root, deck.name)
-        self.scene_exporter.export_deck(deck, deck_export_dir, frame_path=self.frame_path)
+    def _export_root(self) -> str:
+        return self.config.get("workspace") or os.path.join(self.base_dir, "export")
 
-        QMessageBox.information(self, "OK", f"Набір карт згенеровано:\n{deck_export_dir}")
-        self._log(f"Card set generated to: {deck_export_dir}")
+    def _deck_export_dir(self, deck_name: str) -> str:
+        return os.path.join(self._export_root(), deck_name)
+
+    def _configure_art_cache(self):
+        """Кеш артів під слоти — у workspace; записи зниклих чи змінених артів видаляються."""
+        cache = configure_art_cache(os.path.join(self._export_root(), ART_CACHE_DIR_NAME))
+        removed = cache.prune()
+        if removed:
+            self._log(f"Art cache pruned: {removed} stale files in {cache.cache_dir}")
+
+    # ---------------------------
+    # Hot reload
+    # ---------------------------
+    def _watch_current_files(self):
+        """Point the watcher at the current deck, its arts, the frame and the layout."""
+        arts_dir = None
+        art_files = set()
+        if self.current_deck_path:
+            arts_dir = JSONLoader(self.current_deck_path).arts_dir
+            self._art_snapshot = art_snapshot(arts_dir)
+            if self.current_deck:
+                art_files = {card.get("art_path") for card in self.current_deck.cards if card.get("art_path")}
+        self.deck_watcher.watch(
+            deck_path=self.current_deck_path,
+            arts_dir=arts_dir,
+            frame_path=self.frame_path,
+            layout_path=self.ui.sceneView.get_layout_path(),
+            art_files=art_files,
+        )
+
+    def _layout_changed_on_disk(self) -> bool:
+        try:
+            with open(self.ui.sceneView.get_layout_path(), "r", encoding="utf-8") as f:
+                return json.load(f) != self.ui.sceneView.layout
+        except (OSError, ValueError):
+            # Файл ще дописується — дочекаємось наступної події.
+            return False
+
+    def _on_watched_files_changed(self, kinds):
+        """Re-render only the cards touched by a burst of file changes."""
+        refresh_all = False
+        if KIND_LAYOUT in kinds and self._layout_changed_on_disk():
+            self.ui.sceneView.reload_layout()
+            refresh_all = True
+        if KIND_FRAME in kinds:
+            self._apply_frame_to_scene(self.frame_path)
+            refresh_all = True
+
+        deck = self.current_deck
+        if deck is None or self._card_stream is not None:
+            if refresh_all:
+                self.update_preview_for_selection()
+            return
+
+        affected = set()
+        deck_replaced = False
+        if kinds & {KIND_DECK, KIND_ARTS}:
+            try:
+                loader = JSONLoader(self.current_deck_path)
+                new_deck = self.deck_cache.load_or_build(loader)
+            except Exception as e:
+                self._log(f"Hot reload skipped, deck not readable yet: {e}")
+                return
+            new_snapshot = art_snapshot(loader.arts_dir)
+            affected = affected_card_indices(deck, new_deck, changed_art_files(self._art_snapshot, new_snapshot))
+            self._art_snapshot = new_snapshot
+            # Порядок чи склад карт міг змінитися й без зміненого вмісту.
+            deck_replaced = bool(affected) or card_identities(deck.cards) != card_identities(new_deck.cards)
+            deck = new_deck
+        if refresh_all:
+            affected = set(range(len(deck)))
+        if not affected and not deck_replaced:
+            return
+
+        deck_export_dir = self._deck_export_dir(deck.name)
+        if os.path.isdir(deck_export_dir):
+            # Рендеряться лише зачеплені картки; файли вилучених видаляє маніфест.
+            cards = [deck.cards[index] for index in sorted(affected)]
+            self.scene_exporter.export_deck(
+                deck, deck_export_dir, frame_path=self.frame_path, cards=cards, partial=True
+            )
+            self._log(f"Hot reload refreshed export dir: {deck_export_dir}")
+
+        current_row = self._current_deck_index()
+        if deck_replaced:
+            self.current_deck = deck
+            self._populate_card_list(deck, selected_index=current_row)
+            self._watch_current_files()
+        self.update_preview_for_selection()
+        self._log(f"Hot reload: {', '.join(sorted(kinds))} changed, {len(affected)} card(s) affected")
 
     def _on_edit_mode_changed(self, mode_name: str):
         self.ui.sceneView.set_edit_mode(mode_name.lower())
@@ -297,10 +582,8 @@ class MainWindow(QMainWindow):
             QMessageBox.warning(self, "Помилка", "Завантаж JSON колоди.")
             return
 
-        export_root = self.config.get("workspace") or os.path.join(self.base_dir, "export")
-
         deck_name = os.path.splitext(os.path.basename(self.current_deck_path))[0]
-        deck_export_dir = os.path.join(export_root, deck_name)
+        deck_export_dir = self._deck_export_dir(deck_name)
 
         if not os.path.isdir(deck_export_dir):
             QMessageBox.warning(self, "Помилка", f"Не знайдено директорію:\n{deck_export_dir}")
@@ -308,14 +591,37 @@ class MainWindow(QMainWindow):
 
         pdf_path = os.path.join(deck_export_dir, f"{deck_name}.pdf")
 
-        exporter = PDFExporter()
-        exporter.export_pdf(deck_export_dir, pdf_path)
+        exporter = PDFExporter(dpi=self.config.get("dpi", 300))
+        try:
+            exporter.export_pdf(
+                deck_export_dir,
+                pdf_path,
+                bleed_mm=self.config.get("bleed_mm", 0),
+                paper=self.config.get("pdf_paper", "A4"),
+                crop_marks=self.config.get("pdf_crop_marks", False),
+                cut_lines=self.config.get("pdf_cut_lines", False),
+                back_path=self.config.get("pdf_back") or None,
+                duplex=self.config.get("pdf_duplex", "long"),
+                # Паралельна збірка — лише на явний запит (pdf_workers у config.json).
+                workers=self.config.get("pdf_workers", 1),
+            )
+        except ValueError as e:
+            QMessageBox.warning(self, "Помилка", str(e))
+            return
 
         QMessageBox.information(self, "OK", f"PDF створено:\n{pdf_path}")
-        self._log(f"PDF exported: {pdf_path}")
+        layout = exporter.last_imposition
+        self._log(
+            f"PDF exported: {pdf_path} ({layout.paper} {layout.orientation}, "
+            f"{layout.columns}x{layout.rows} cards per sheet)"
+        )
 
 
 if __name__ == "__main__":
+    # У зібраному PyInstaller exe процеси-воркери запускають той самий exe:
+    # freeze_support передає їм керування, замість того щоб відкрити ще одне вікно.
+    multiprocessing.freeze_support()
+
     try:
         with open(ERROR_LOG_PATH, "a", encoding="utf-8") as f:
             f.write("\n=== APP STARTED ===\n")
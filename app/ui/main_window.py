@@ -3,6 +3,8 @@ from PySide6.QtGui import *
 from PySide6.QtWidgets import *
 
 from widgets.card_scene_view import CardSceneView
+from widgets.deck_gallery import DeckGalleryView
+from widgets.deck_list_model import DeckListModel
 from widgets.property_panel import PropertyPanel
 
 class Ui_MainWindow(object):
@@ -73,12 +75,28 @@ class Ui_MainWindow(object):
         self.btnGenerateSet.setFont(font_buttons)
         self.leftPanel.addWidget(self.btnGenerateSet)
 
+        self.btnGenerateArchive = QPushButton("Експорт в архів")
+        self.btnGenerateArchive.setFont(font_buttons)
+        self.leftPanel.addWidget(self.btnGenerateArchive)
+
+        self.btnGenerateAtlas = QPushButton("Атлас для VTT")
+        self.btnGenerateAtlas.setFont(font_buttons)
+        self.leftPanel.addWidget(self.btnGenerateAtlas)
+
         self.btnGeneratePDF = QPushButton("Експорт у PDF")
         self.btnGeneratePDF.setFont(font_buttons)
         self.leftPanel.addWidget(self.btnGeneratePDF)
 
         self.leftPanel.addWidget(QLabel("Список карт"))
-        self.cardList = QListWidget()
+        self.cardSearch = QLineEdit()
+        self.cardSearch.setPlaceholderText("Пошук: назва, type:unit, atk>=3, cost<2")
+        self.cardSearch.setClearButtonEnabled(True)
+        self.leftPanel.addWidget(self.cardSearch)
+
+        self.cardModel = DeckListModel(MainWindow)
+        self.cardList = QListView()
+        self.cardList.setModel(self.cardModel)
+        self.cardList.setUniformItemSizes(True)
         self.cardList.setSelectionMode(QAbstractItemView.SingleSelection)
         self.leftPanel.addWidget(self.cardList)
 
@@ -94,9 +112,11 @@ class Ui_MainWindow(object):
 
         self.sceneView = CardSceneView()
         self.propertyPanel = PropertyPanel(self.sceneView)
+        self.deckGallery = DeckGalleryView(self.sceneView)
 
         self.sceneAndPanel = QHBoxLayout()
         self.sceneAndPanel.addWidget(self.sceneView, stretch=3)
+        self.sceneAndPanel.addWidget(self.deckGallery, stretch=1)
         self.sceneAndPanel.addWidget(self.propertyPanel, stretch=1)
 
         self.rightPanel.addLayout(self.sceneAndPanel)
@@ -4,7 +4,11 @@ from __future__ import annotations
 
 import copy
 import json
+import math
 import os
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass
 from pathlib import Path
 from typing import Dict, Optional, Tuple
 
@@ -16,25 +20,96 @@ from PySide6.QtGui import (
     QPainter,
     QPen,
     QPixmap,
+    QTextDocument,
+    QTransform,
 )
 from PySide6.QtWidgets import (
-    QGraphicsDropShadowEffect,
     QGraphicsItem,
     QGraphicsPixmapItem,
     QGraphicsRectItem,
     QGraphicsScene,
     QGraphicsTextItem,
     QGraphicsView,
+    QStyle,
 )
 
+from core.encoder_profiles import get_profile
+from core.export_pipeline import BufferPool, EncodeQueue
+from core.qt_images import load_art_pixmap, load_pixmap
+from core.qt_shadows import device_phase, get_shadow_cache
+from core.render_plan import compile_layout
+from core.text_fit import fit_font_size, parse_fit
+
 APP_DIR = Path(__file__).resolve().parent.parent
 DEFAULT_LAYOUT = APP_DIR / "editor" / "template_layout.json"
+# Рівні деталізації піксмап: 1/2, 1/4, 1/8; менші за LOD_MIN_SIZE не робимо.
+LOD_LEVELS = 3
+LOD_MIN_SIZE = 32
+# Політика кешування елементів у редакторі (meta.item_cache у лейауті).
+ITEM_CACHE_MODES = {
+    "none": QGraphicsItem.NoCache,
+    "item": QGraphicsItem.ItemCoordinateCache,
+    "device": QGraphicsItem.DeviceCoordinateCache,
+}
+DEFAULT_ITEM_CACHE = "device"
 
 
 def resource_path(*paths: str) -> str:
     return str(APP_DIR.joinpath(*paths))
 
 
+def _layout_point_size(item: QGraphicsTextItem) -> int:
+    """Font size to persist: the layout size, not the auto-fitted one."""
+    return getattr(item, "base_point_size", None) or item.font().pointSize()
+
+
+def _size_box(size_cfg: Optional[dict]) -> Optional[Tuple[int, int]]:
+    """Return ``(w, h)`` from a layout ``size`` dict when both are set."""
+    if not size_cfg or not size_cfg.get("w") or not size_cfg.get("h"):
+        return None
+    return int(size_cfg["w"]), int(size_cfg["h"])
+
+
+def _item_signature(item: QGraphicsItem) -> tuple:
+    """Everything about a static item that changes how it renders."""
+    parts = [id(item), item.isVisible(), item.isSelected(), item.pos().x(), item.pos().y(), item.zValue(), item.opacity()]
+    parts.append(id(item.graphicsEffect()) if item.graphicsEffect() else None)
+    if isinstance(item, QGraphicsPixmapItem):
+        parts.append(item.pixmap().cacheKey())
+    if isinstance(item, QGraphicsTextItem):
+        parts += [item.toPlainText(), item.font().key(), item.defaultTextColor().rgba(), item.textWidth()]
+        shadow = getattr(item, "text_shadow", None)
+        if shadow is not None:
+            parts += [shadow[0].rgba(), shadow[1].x(), shadow[1].y(), shadow[2]]
+    if isinstance(item, QGraphicsRectItem):
+        rect, pen, brush = item.rect(), item.pen(), item.brush()
+        parts += [rect.x(), rect.y(), rect.width(), rect.height(), pen.color().rgba(), pen.widthF()]
+        parts += [brush.style(), brush.color().rgba()]
+    return tuple(parts)
+
+
+@dataclass
+class PaintStats:
+    """Viewport paint timings of a :class:`CardSceneView`."""
+
+    frames: int = 0
+    total_ms: float = 0.0
+    last_ms: float = 0.0
+
+    @property
+    def average_ms(self) -> float:
+        return self.total_ms / self.frames if self.frames else 0.0
+
+    def add(self, elapsed_ms: float) -> None:
+        self.frames += 1
+        self.total_ms += elapsed_ms
+        self.last_ms = elapsed_ms
+
+    def reset(self) -> None:
+        self.frames = 0
+        self.total_ms = self.last_ms = 0.0
+
+
 class _CardItemBase:
     """Mixin that injects shared behaviour into interactive scene items."""
 
@@ -58,6 +133,9 @@ class _CardItemBase:
 
 
 class CardTextItem(_CardItemBase, QGraphicsTextItem):
+    # (колір, зсув, розмиття) тіні/обведення; малюється з ShadowCache
+    text_shadow: Optional[Tuple[QColor, QPointF, float]] = None
+
     def __init__(self, scene_view: "CardSceneView", item_id: str, config: dict):
         QGraphicsTextItem.__init__(self, config.get("text", ""))
         _CardItemBase.__init__(self, scene_view, item_id, config)
@@ -67,11 +145,15 @@ class CardTextItem(_CardItemBase, QGraphicsTextItem):
         font.setItalic(font_cfg.get("italic", False))
         font.setUnderline(font_cfg.get("underline", False))
         self.setFont(font)
+        # розмір із лейауту; font() може бути зменшеним авто-підгонкою
+        self.base_point_size = font.pointSize()
+        self.fit = parse_fit(config.get("fit"))
         color = QColor(config.get("color", "#FFFFFF"))
         self.setDefaultTextColor(color)
         text_width = config.get("text_width")
         if text_width:
             self.setTextWidth(text_width)
+        self.fit_text()
         self.setPos(config.get("pos", {}).get("x", 0), config.get("pos", {}).get("y", 0))
         self.setZValue(config.get("z", 5))
         self.setOpacity(config.get("opacity", 1.0))
@@ -81,18 +163,152 @@ class CardTextItem(_CardItemBase, QGraphicsTextItem):
 
     # ------------------------------------------------------------------
     def _apply_shadow(self, cfg: dict) -> None:
-        effect = QGraphicsDropShadowEffect()
-        effect.setColor(QColor(cfg.get("color", "#000000")))
         offset = cfg.get("offset", [0, 0])
-        effect.setOffset(offset[0], offset[1])
-        effect.setBlurRadius(cfg.get("blur", 0))
-        self.setGraphicsEffect(effect)
+        self.set_text_shadow(QColor(cfg.get("color", "#000000")), (offset[0], offset[1]), cfg.get("blur", 0))
+
+    def set_text_shadow(self, color: QColor, offset: Tuple[float, float], blur: float) -> None:
+        """Draw a cached drop shadow (zero offset: outline glow) under the text."""
+        self.prepareGeometryChange()
+        self.text_shadow = (QColor(color), QPointF(offset[0], offset[1]), max(0.0, float(blur)))
+        self.update()
+
+    def boundingRect(self) -> QRectF:  # type: ignore[override]
+        rect = QGraphicsTextItem.boundingRect(self)
+        if self.text_shadow is None:
+            return rect
+        _, offset, blur = self.text_shadow
+        return rect.united(rect.translated(offset).adjusted(-blur, -blur, blur, blur))
+
+    def paint(self, painter: QPainter, option, widget=None) -> None:  # type: ignore[override]
+        if self.text_shadow is None:
+            QGraphicsTextItem.paint(self, painter, option, widget)
+            return
+        color, offset, blur = self.text_shadow
+        transform = painter.worldTransform()
+        phase = device_phase(transform)
+        cache = get_shadow_cache()
+        if phase is None:
+            image, rect = cache.render(self.document(), self.defaultTextColor(), color, offset, blur, opacity=painter.opacity())
+            painter.drawImage(rect.topLeft(), image)
+        else:
+            # як і QGraphicsDropShadowEffect — растр у пікселях пристрою
+            image, rect = cache.render(
+                self.document(), self.defaultTextColor(), color, offset, blur, phase, painter.opacity()
+            )
+            scale_x, scale_y, frac_x, frac_y = phase
+            if scale_x == scale_y == 1.0:
+                painter.drawImage(rect.topLeft() - QPointF(frac_x, frac_y), image)
+            else:
+                painter.save()
+                painter.setWorldTransform(QTransform())
+                painter.drawImage(QPointF(math.floor(transform.dx()), math.floor(transform.dy())) + rect.topLeft(), image)
+                painter.restore()
+        if option.state & (QStyle.State_Selected | QStyle.State_HasFocus):
+            # курсор і рамка виділення малюються поверх готового растру
+            QGraphicsTextItem.paint(self, painter, option, widget)
+
+    def layout_font(self) -> QFont:
+        """The font as configured in the layout, before auto-fit."""
+        font = QFont(self.font())
+        font.setPointSize(self.base_point_size)
+        return font
+
+    def fit_text(self) -> None:
+        """Shrink the font until the text fits the ``fit`` box of the layout."""
+        font = self.layout_font()
+        text = self.toPlainText()
+        if self.fit is not None and text:
+            width = self.textWidth()
+            margin = self.document().documentMargin()
+
+            def measure(size: int) -> float:
+                probe = QFont(font)
+                probe.setPointSize(size)
+                document = _measure_document()
+                document.setDocumentMargin(margin)
+                document.setDefaultFont(probe)
+                document.setTextWidth(width)
+                document.setPlainText(text)
+                return document.size().height()
+
+            font_key = ("qt", font.family(), font.weight(), font.italic(), font.underline(), margin)
+            size = fit_font_size(
+                text, font_key, width, self.fit["height"], self.fit["min_size"], self.base_point_size, measure
+            )
+            font.setPointSize(size)
+        if font != self.font():
+            self.setFont(font)
+
+
+_measure_doc: Optional[QTextDocument] = None
+
+
+def _measure_document() -> QTextDocument:
+    """Scratch document for text measurements (GUI thread only)."""
+    global _measure_doc
+    if _measure_doc is None:
+        _measure_doc = QTextDocument()
+    return _measure_doc
+
+
+class LodPixmapItem(QGraphicsPixmapItem):
+    """Pixmap item that paints a pre-shrunk copy while the view is zoomed out.
+
+    Levels halve the pixmap (1/2 … 1/2**LOD_LEVELS) and are built lazily
+    from the previous level. The level is the smallest one that is still at
+    least as large as the pixmap on the device, so the painter only ever
+    shrinks it slightly. At scale 1 and above — exports, deep zoom — the
+    full-resolution pixmap is painted as usual.
+    """
+
+    def __init__(self, pixmap: Optional[QPixmap] = None):
+        QGraphicsPixmapItem.__init__(self, pixmap if pixmap is not None else QPixmap())
+        self._lods: Dict[int, QPixmap] = {}
 
+    # ------------------------------------------------------------------
+    def setPixmap(self, pixmap: QPixmap) -> None:  # type: ignore[override]
+        self._lods = {}
+        QGraphicsPixmapItem.setPixmap(self, pixmap)
+
+    def lod_level(self, scale: float) -> int:
+        pixmap = self.pixmap()
+        level = 0
+        while (
+            level < LOD_LEVELS
+            and scale * 2 ** (level + 1) <= 1.0
+            and min(pixmap.width(), pixmap.height()) >> (level + 1) >= LOD_MIN_SIZE
+        ):
+            level += 1
+        return level
+
+    def lod_pixmap(self, level: int) -> QPixmap:
+        if level <= 0:
+            return self.pixmap()
+        cached = self._lods.get(level)
+        if cached is None:
+            source = self.lod_pixmap(level - 1)
+            cached = source.scaled(
+                max(1, source.width() // 2), max(1, source.height() // 2), Qt.IgnoreAspectRatio, Qt.SmoothTransformation
+            )
+            self._lods[level] = cached
+        return cached
+
+    def paint(self, painter: QPainter, option, widget=None) -> None:  # type: ignore[override]
+        transform = painter.deviceTransform()
+        scale = max(math.hypot(transform.m11(), transform.m12()), math.hypot(transform.m21(), transform.m22()))
+        level = self.lod_level(scale)
+        if level == 0 or option.state & QStyle.State_Selected:
+            QGraphicsPixmapItem.paint(self, painter, option, widget)
+            return
+        lod = self.lod_pixmap(level)
+        painter.drawPixmap(QRectF(self.offset(), QSizeF(self.pixmap().size())), lod, QRectF(lod.rect()))
 
-class CardPixmapItem(_CardItemBase, QGraphicsPixmapItem):
+
+class CardPixmapItem(_CardItemBase, LodPixmapItem):
     def __init__(self, scene_view: "CardSceneView", item_id: str, config: dict):
-        pixmap = QPixmap(config.get("asset", "")) if config.get("asset") else QPixmap()
-        QGraphicsPixmapItem.__init__(self, pixmap)
+        asset = config.get("asset")
+        pixmap = load_pixmap(asset, _size_box(config.get("size"))) if asset else QPixmap()
+        LodPixmapItem.__init__(self, pixmap)
         _CardItemBase.__init__(self, scene_view, item_id, config)
         self.setTransformationMode(Qt.SmoothTransformation)
         self.setPos(config.get("pos", {}).get("x", 0), config.get("pos", {}).get("y", 0))
@@ -146,18 +362,30 @@ class CardSceneView(QGraphicsView):
         self.snap_size = 5
 
         self._background_color = QColor(26, 26, 26)
+        # DeviceCoordinateCache під час редагування; експорт малює без кешу
+        self.item_cache_mode = ITEM_CACHE_MODES[DEFAULT_ITEM_CACHE]
+        self.paint_stats = PaintStats()
         self._card_rect_item = QGraphicsRectItem(0, 0, self.card_size.width(), self.card_size.height())
         self._card_rect_item.setPen(QPen(QColor(240, 240, 240), 2))
         self._card_rect_item.setBrush(Qt.NoBrush)
         self._card_rect_item.setZValue(-5)
         self._scene.addItem(self._card_rect_item)
 
-        self._frame_item = QGraphicsPixmapItem()
+        self._frame_item = LodPixmapItem()
         self._frame_item.setZValue(-2)
         self._frame_item.setTransformationMode(Qt.SmoothTransformation)
         self._scene.addItem(self._frame_item)
+        self._card_rect_item.setCacheMode(self.item_cache_mode)
+        self._frame_item.setCacheMode(self.item_cache_mode)
 
         self._art_item_id = "artwork"
+        # необов'язковий ArtPack колоди (див. set_art_pack)
+        self.art_pack = None
+        self.render_plan = compile_layout({})
+        # (сигнатура статичних елементів, базовий шар, верхній шар)
+        self._static_cache = None
+        # буфери експорту за ключем (ширина, висота, dpi)
+        self._export_pool = BufferPool(self._new_export_buffer)
         self._default_art_pixmap = QPixmap(520, 320)
         self._default_art_pixmap.fill(QColor(45, 60, 75))
 
@@ -187,9 +415,8 @@ class CardSceneView(QGraphicsView):
         self._emit_selected_item()
 
     # ------------------------------------------------------------------
-    def apply_card_data(self, card: dict, deck_color: str):
-        """Populate scene items using card data from JSON."""
-        if not card:
+    def reload_layout(self):
+        """Reload the layout from disk, creating the default one if missing."""
         if not os.path.exists(self.layout_path):
             self._ensure_default_layout()
         self.load_template(self.layout_path)
@@ -252,7 +479,12 @@ class CardSceneView(QGraphicsView):
             return
         self.layout_path = template_path
         with open(template_path, "r", encoding="utf-8") as fh:
-            self.layout = json.load(fh)
+            self.load_layout(json.load(fh))
+
+    # ------------------------------------------------------------------
+    def load_layout(self, layout: dict):
+        """Show an in-memory ``layout`` (the view takes ownership of the dict)."""
+        self.layout = layout
         self._apply_layout_meta()
         self._build_scene_items()
         self.layoutLoaded.emit(copy.deepcopy(self.layout))
@@ -274,6 +506,8 @@ class CardSceneView(QGraphicsView):
         self.grid_size = meta.get("grid", 25)
         self.snap_size = meta.get("snap", 5)
         self._background_color = QColor(meta.get("background", "#1a1a1a"))
+        self.set_item_cache_mode(ITEM_CACHE_MODES.get(meta.get("item_cache"), ITEM_CACHE_MODES[DEFAULT_ITEM_CACHE]))
+        self._export_pool.clear()
         self._card_rect_item.setRect(QRectF(0, 0, self.card_size.width(), self.card_size.height()))
         self._scene.setSceneRect(self._card_rect_item.rect().adjusted(-250, -250, 250, 250))
         self.fit_card_to_view()
@@ -284,10 +518,12 @@ class CardSceneView(QGraphicsView):
         for item in list(self.scene_items.values()):
             self._scene.removeItem(item)
         self.scene_items.clear()
+        self.render_plan = compile_layout(self.layout)
         items = self.layout.get("items", {})
         for item_id, cfg in items.items():
             created = self._create_item(item_id, cfg)
             if created:
+                created.setCacheMode(self.item_cache_mode)
                 self.scene_items[item_id] = created
                 self._scene.addItem(created)
         art_item = self.scene_items.get(self._art_item_id)
@@ -350,7 +586,7 @@ class CardSceneView(QGraphicsView):
             if isinstance(item, QGraphicsTextItem):
                 cfg["text"] = item.toPlainText()
                 cfg.setdefault("font", {})["family"] = item.font().family()
-                cfg["font"]["size"] = item.font().pointSize()
+                cfg["font"]["size"] = _layout_point_size(item)
                 cfg["font"]["bold"] = item.font().bold()
                 cfg["font"]["italic"] = item.font().italic()
                 cfg["font"]["underline"] = item.font().underline()
@@ -394,6 +630,10 @@ class CardSceneView(QGraphicsView):
         self._frame_item.setTransformationMode(Qt.SmoothTransformation)
         self._scene.update()
 
+    # ------------------------------------------------------------------
+    def frame_pixmap(self) -> QPixmap:
+        return self._frame_item.pixmap()
+
     # ------------------------------------------------------------------
     def set_template_locked(self, locked: bool):
         self.template_locked = locked
@@ -427,12 +667,6 @@ class CardSceneView(QGraphicsView):
         self._emit_selected_item()
 
     # ------------------------------------------------------------------
-    def drawBackground(self, painter: QPainter, rect: QRectF):
-        painter.fillRect(rect, QColor(26, 26, 26))
-
-        grid_size = 50
-        left = int(rect.left()) - (int(rect.left()) % grid_size)
-        top = int(rect.top()) - (int(rect.top()) % grid_size)
     def _handle_item_selected(self, item: QGraphicsItem):
         item_id = self._lookup_item_id(item)
         if item_id:
@@ -478,43 +712,33 @@ class CardSceneView(QGraphicsView):
             self.layout.setdefault("items", {})[item_id] = copy.deepcopy(cfg)
         self.itemUpdated.emit(item_id, cfg)
 
+    # ------------------------------------------------------------------
+    def set_art_pack(self, art_pack) -> None:
+        """Serve artwork from ``art_pack`` when it matches the artwork slot."""
+        if self.art_pack is not None and self.art_pack is not art_pack:
+            self.art_pack.close()
+        self.art_pack = art_pack
+
     # ------------------------------------------------------------------
     def apply_card_data(self, card: dict, deck_color: str):
         if not card:
             return
 
-        if not self._preview_item:
-            self._preview_item = QGraphicsPixmapItem(pixmap)
-            self._preview_item.setTransformationMode(Qt.SmoothTransformation)
-            self._preview_item.setZValue(20)
-            self._scene.addItem(self._preview_item)
         self._deck_color = QColor(deck_color) if QColor.isValidColor(deck_color) else QColor("#FFFFFF")
-        # Textual content
-        self._set_text("title", card.get("name", ""), persist=False)
-        self._set_text("type", card.get("type", "").upper(), persist=False)
-        desc = card.get("description") or card.get("text") or card.get("effect", "")
-        self._set_text("description", desc, persist=False)
-        stats = {
-            "atk": card.get("atk", "-"),
-            "def": card.get("def", "-"),
-            "stb": card.get("stb", "-"),
-            "init": card.get("init", "-"),
-            "rng": card.get("rng", "-"),
-            "move": card.get("move", "-"),
-        }
-        for key, value in stats.items():
-            label = key.upper()
-            self._set_text(f"stat_{key}", f"{label} {value}", persist=False)
-        cost = card.get("cost")
-        if cost is not None:
-            self._set_text("cost", str(cost), persist=False)
-        cost_type = card.get("cost_type")
-        if cost_type:
-            self._set_text("cost_type", cost_type, persist=False)
+        # Лейаут скомпільовано в load_template — тут лише підстановка даних.
+        art_path = None
+        for plan_item, value in self.render_plan.bind(card):
+            if plan_item.item_id == self._art_item_id:
+                art_path = value
+            elif plan_item.kind == "text" and value is not None:
+                self._set_text(plan_item.item_id, value, persist=False)
         # Artwork
-        art_path = card.get("art_path")
         if art_path and os.path.exists(art_path):
-            pix = QPixmap(art_path)
+            box = _size_box(self.layout.get("items", {}).get(self._art_item_id, {}).get("size"))
+            if box:
+                pix = load_art_pixmap(art_path, box, dpi=self.dpi, art_pack=self.art_pack)
+            else:
+                pix = load_pixmap(art_path)
             self._set_image(self._art_item_id, pix, persist=False)
         else:
             self._set_image(self._art_item_id, self._default_art_pixmap, persist=False)
@@ -525,6 +749,8 @@ class CardSceneView(QGraphicsView):
         item = self.scene_items.get(item_id)
         if isinstance(item, QGraphicsTextItem):
             item.setPlainText(text)
+            if isinstance(item, CardTextItem):
+                item.fit_text()
             if persist and self.edit_mode == "template":
                 cfg = self.layout.setdefault("items", {}).setdefault(item_id, {})
                 cfg["text"] = text
@@ -554,19 +780,208 @@ class CardSceneView(QGraphicsView):
         self._card_rect_item.setPen(pen)
 
     # ------------------------------------------------------------------
-    def export_to_png(self, path: str):
+    def export_to_png(self, path, encoder: Optional[EncodeQueue] = None, profile=None):
+        """Render the card into a pooled buffer and write it.
+
+        ``path`` is a file path or a ``write(data)`` callable that takes the
+        encoded bytes. ``profile`` is an encoder profile or its name (see
+        :mod:`core.encoder_profiles`), PNG with default settings if omitted.
+        With ``encoder`` the buffer is queued for encoding on its worker
+        threads with the queue's profile and returned to the pool once
+        written, so the caller can render the next card meanwhile.
+        """
         if not path:
             return
-        width = int(self.card_size.width())
-        height = int(self.card_size.height())
-        image = QImage(width, height, QImage.Format_ARGB32)
-        image.setDotsPerMeterX(int(self.dpi / 25.4 * 1000))
-        image.setDotsPerMeterY(int(self.dpi / 25.4 * 1000))
+        if encoder is not None:
+            # рендер + усе, що може бути в черзі чи кодуватися
+            self._export_pool.maxsize = max(self._export_pool.maxsize, encoder.capacity + 1)
+        image = self._export_pool.acquire(self._export_buffer_key())
+        try:
+            self.render_card_into(image)
+        except Exception:
+            self._export_pool.release(image)
+            raise
+        if encoder is not None:
+            encoder.submit(image, path, done=self._export_pool.release)
+            return
+        try:
+            if callable(path):
+                path(get_profile(profile).encode(image))
+            else:
+                get_profile(profile).save(image, path)
+        finally:
+            self._export_pool.release(image)
+
+    # ------------------------------------------------------------------
+    def render_card_image(self) -> QImage:
+        """Render the card into a new image (see :meth:`render_card_into`)."""
+        below, above = self._static_split()
+        base, overlay = self._static_layers(below, above)
+        # Неглибока копія — дані бази копіюються лише при першому малюванні.
+        image = QImage(base)
+        self._paint_card_items(image, below + above, overlay)
+        return image
+
+    # ------------------------------------------------------------------
+    def render_card_into(self, image: QImage) -> None:
+        """Render the card into ``image``, reusing pre-composed static layers.
+
+        Static items (frame, card border and layout items without a data
+        binding) below every data-bound item are cached as one base image,
+        those above every data-bound item as one overlay. Per card only the
+        remaining items are rendered between the two. ``image`` must come
+        from the export pool (card size and format); its previous content
+        is overwritten.
+        """
+        below, above = self._static_split()
+        base, overlay = self._static_layers(below, above)
+        # Буфер того ж розміру й формату, що й база: байтова копія без
+        # QPainter і перемикання режимів композиції.
+        image.bits()[:] = base.constBits()
+        self._paint_card_items(image, below + above, overlay)
+
+    # ------------------------------------------------------------------
+    def _paint_card_items(self, image: QImage, static: list, overlay: Optional[QImage]) -> None:
+        painter = QPainter(image)
+        self._render_scene_items(painter, exclude=static)
+        if overlay is not None:
+            painter.drawImage(0, 0, overlay)
+        painter.end()
+
+    # ------------------------------------------------------------------
+    def render_thumbnail(self, width: int) -> QImage:
+        """Render the card ``width`` pixels wide straight from the scene.
+
+        Drawing at the target size skips the full-size raster of an export
+        and lets pixmap items paint from their LOD levels.
+        """
+        height = max(1, round(width * self.card_size.height() / max(1.0, self.card_size.width())))
+        image = QImage(width, height, QImage.Format_ARGB32_Premultiplied)
         image.fill(Qt.transparent)
         painter = QPainter(image)
-        self._scene.render(painter, QRectF(0, 0, width, height), self._card_rect_item.rect())
+        painter.setRenderHints(QPainter.Antialiasing | QPainter.TextAntialiasing | QPainter.SmoothPixmapTransform)
+        self._render_scene_items(painter, target=QRectF(image.rect()))
         painter.end()
-        image.save(path, "PNG")
+        return image
+
+    # ------------------------------------------------------------------
+    def _export_buffer_key(self) -> Tuple[int, int, int]:
+        return int(self.card_size.width()), int(self.card_size.height()), int(self.dpi)
+
+    # ------------------------------------------------------------------
+    def _new_export_buffer(self, key: Tuple[int, int, int]) -> QImage:
+        width, height, dpi = key
+        image = QImage(width, height, QImage.Format_ARGB32)
+        image.setDotsPerMeterX(int(dpi / 25.4 * 1000))
+        image.setDotsPerMeterY(int(dpi / 25.4 * 1000))
+        return image
+
+    # ------------------------------------------------------------------
+    def _new_card_image(self) -> QImage:
+        image = self._new_export_buffer(self._export_buffer_key())
+        image.fill(Qt.transparent)
+        return image
+
+    # ------------------------------------------------------------------
+    def _render_scene_items(self, painter: QPainter, exclude=(), only=None, target: Optional[QRectF] = None):
+        """Render the card rect of the scene with some items temporarily hidden.
+
+        ``target`` defaults to the card size at 1:1.
+
+        Item caches are bypassed, so the output never comes from a
+        device-resolution cache of the editor view; batch exports do it
+        once in :meth:`export_batch`.
+        """
+        hidden = []
+        cached = []
+        exclude = set(exclude)
+        for item in self._scene.items():
+            skip = item in exclude if only is None else item not in only
+            if skip and item.isVisible():
+                item.setVisible(False)
+                hidden.append(item)
+            elif not skip and item.cacheMode() != QGraphicsItem.NoCache:
+                cached.append((item, item.cacheMode()))
+                item.setCacheMode(QGraphicsItem.NoCache)
+        try:
+            if target is None:
+                target = QRectF(0, 0, int(self.card_size.width()), int(self.card_size.height()))
+            self._scene.render(painter, target, self._card_rect_item.rect())
+        finally:
+            for item in hidden:
+                item.setVisible(True)
+            for item, mode in cached:
+                item.setCacheMode(mode)
+
+    # ------------------------------------------------------------------
+    def _static_split(self) -> Tuple[list, list]:
+        """Static items strictly below / above all data-bound items."""
+        bound_ids = {plan_item.item_id for plan_item in self.render_plan.bound_items}
+        dynamic = [item for item_id, item in self.scene_items.items() if item_id in bound_ids]
+        static = [self._card_rect_item, self._frame_item]
+        static += [item for item_id, item in self.scene_items.items() if item_id not in bound_ids]
+        if not dynamic:
+            return static, []
+        low = min(item.zValue() for item in dynamic)
+        high = max(item.zValue() for item in dynamic)
+        below = [item for item in static if item.zValue() < low]
+        above = [item for item in static if item.zValue() > high]
+        return below, above
+
+    # ------------------------------------------------------------------
+    def _static_layers(self, below: list, above: list) -> Tuple[QImage, Optional[QImage]]:
+        signature = (
+            self.card_size.width(),
+            self.card_size.height(),
+            self.dpi,
+            tuple(_item_signature(item) for item in below),
+            tuple(_item_signature(item) for item in above),
+        )
+        if self._static_cache is None or self._static_cache[0] != signature:
+            base = self._new_card_image()
+            painter = QPainter(base)
+            self._render_scene_items(painter, only=set(below))
+            painter.end()
+            overlay = None
+            if above:
+                overlay = self._new_card_image()
+                painter = QPainter(overlay)
+                self._render_scene_items(painter, only=set(above))
+                painter.end()
+            self._static_cache = (signature, base, overlay)
+        return self._static_cache[1], self._static_cache[2]
+
+    # ------------------------------------------------------------------
+    def set_item_cache_mode(self, mode: QGraphicsItem.CacheMode) -> None:
+        """Cache mode of all card items while editing (exports never use it)."""
+        self.item_cache_mode = mode
+        for item in [self._card_rect_item, self._frame_item, *self.scene_items.values()]:
+            item.setCacheMode(mode)
+
+    # ------------------------------------------------------------------
+    @contextmanager
+    def export_batch(self):
+        """Bypass item caches once for a run of exports.
+
+        Outside a batch every render switches cached items to ``NoCache``
+        and back, which drops their device caches once per card. Inside it
+        the editor's cache mode is restored only when the batch ends.
+        """
+        mode = self.item_cache_mode
+        if mode == QGraphicsItem.NoCache:
+            yield self
+            return
+        self.set_item_cache_mode(QGraphicsItem.NoCache)
+        try:
+            yield self
+        finally:
+            self.set_item_cache_mode(mode)
+
+    # ------------------------------------------------------------------
+    def paintEvent(self, event):  # type: ignore[override]
+        started = time.perf_counter()
+        super().paintEvent(event)
+        self.paint_stats.add((time.perf_counter() - started) * 1000)
 
     # ------------------------------------------------------------------
     def drawBackground(self, painter: QPainter, rect: QRectF):  # type: ignore[override]
@@ -615,6 +1030,8 @@ class CardSceneView(QGraphicsView):
         item = self.scene_items.get(item_id)
         if isinstance(item, QGraphicsTextItem):
             item.setTextWidth(width)
+            if isinstance(item, CardTextItem):
+                item.fit_text()
             if self.edit_mode == "template":
                 cfg = self.layout.setdefault("items", {}).setdefault(item_id, {})
                 cfg["text_width"] = width
@@ -624,6 +1041,9 @@ class CardSceneView(QGraphicsView):
         item = self.scene_items.get(item_id)
         if isinstance(item, QGraphicsTextItem):
             item.setFont(font)
+            if isinstance(item, CardTextItem):
+                item.base_point_size = font.pointSize()
+                item.fit_text()
             if self.edit_mode == "template":
                 cfg = self.layout.setdefault("items", {}).setdefault(item_id, {})
                 cfg.setdefault("font", {})
@@ -688,13 +1108,9 @@ class CardSceneView(QGraphicsView):
     # ------------------------------------------------------------------
     def apply_outline(self, item_id: str, color: QColor, width: float):
         item = self.scene_items.get(item_id)
-        if not isinstance(item, QGraphicsTextItem):
+        if not isinstance(item, CardTextItem):
             return
-        effect = QGraphicsDropShadowEffect()
-        effect.setOffset(0, 0)
-        effect.setBlurRadius(max(0.0, width * 2))
-        effect.setColor(color)
-        item.setGraphicsEffect(effect)
+        item.set_text_shadow(color, (0, 0), max(0.0, width * 2))
         if self.edit_mode == "template":
             cfg = self.layout.setdefault("items", {}).setdefault(item_id, {})
             cfg.setdefault("shadow", {})
@@ -705,10 +1121,10 @@ class CardSceneView(QGraphicsView):
         item = self.scene_items.get(item_id)
         if not isinstance(item, QGraphicsPixmapItem):
             return
-        pix = QPixmap(asset_path)
+        size = self.layout.get("items", {}).get(item_id, {}).get("size")
+        pix = load_pixmap(asset_path, _size_box(size))
         if pix.isNull():
             return
-        size = self.layout.get("items", {}).get(item_id, {}).get("size")
         if size:
             pix = pix.scaled(size.get("w", pix.width()), size.get("h", pix.height()), Qt.KeepAspectRatio, Qt.SmoothTransformation)
         item.setPixmap(pix)
@@ -731,7 +1147,7 @@ class CardSceneView(QGraphicsView):
                 cfg["font"].update(
                     {
                         "family": item.font().family(),
-                        "size": item.font().pointSize(),
+                        "size": _layout_point_size(item),
                         "bold": item.font().bold(),
                         "italic": item.font().italic(),
                         "underline": item.font().underline(),
@@ -786,13 +1202,9 @@ class CardSceneView(QGraphicsView):
     # ------------------------------------------------------------------
     def apply_shadow(self, item_id: str, color: QColor, offset: Tuple[float, float], blur: float):
         item = self.scene_items.get(item_id)
-        if not isinstance(item, QGraphicsTextItem):
+        if not isinstance(item, CardTextItem):
             return
-        effect = QGraphicsDropShadowEffect()
-        effect.setColor(color)
-        effect.setOffset(offset[0], offset[1])
-        effect.setBlurRadius(blur)
-        item.setGraphicsEffect(effect)
+        item.set_text_shadow(color, offset, blur)
         if self.edit_mode == "template":
             cfg = self.layout.setdefault("items", {}).setdefault(item_id, {})
             cfg.setdefault("shadow", {})
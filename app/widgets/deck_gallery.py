@@ -0,0 +1,207 @@
+"""Thumbnail grid of the whole deck rendered lazily from the editor layout."""
+
+from __future__ import annotations
+
+import copy
+import json
+import time
+from collections import OrderedDict
+from typing import Dict, Optional
+
+from PySide6.QtCore import QSize, Qt, QTimer, Signal
+from PySide6.QtGui import QColor, QImage
+from PySide6.QtWidgets import QAbstractItemView, QGraphicsItem, QListView
+
+from core.lru import LRUCache
+from core.scene_exporter import card_content_hash
+
+from .card_scene_view import CardSceneView
+from .deck_list_model import DeckListModel
+
+THUMBNAIL_WIDTH = 120
+THUMBNAIL_CACHE_SIZE = 2048
+# Скільки мілісекунд рендеру за один прохід event loop.
+THUMBNAIL_BATCH_MS = 15
+# Пауза після змін у редакторі, перш ніж звіряти лейаут.
+LAYOUT_SYNC_DELAY_MS = 300
+
+
+class ThumbnailCache(LRUCache):
+    """LRU of thumbnails keyed by card content hash."""
+
+    def __init__(self, maxsize: int = THUMBNAIL_CACHE_SIZE):
+        super().__init__(maxsize)
+
+
+class DeckGalleryModel(DeckListModel):
+    """:class:`DeckListModel` whose rows also carry a card thumbnail.
+
+    A thumbnail is requested when the view asks for the decoration of a
+    row, i.e. only for rows being painted. Requests are rendered during
+    idle time of the event loop in a private offscreen
+    :class:`CardSceneView` that mirrors the editor's in-memory layout and
+    frame; QGraphicsScene items cannot be painted outside the GUI thread,
+    so the work is sliced into short batches instead of a thread.
+
+    Thumbnails are cached by the content hash the exporter uses, salted
+    with the layout, frame and thumbnail size: editing a layout item or a
+    card changes the hash, and only affected cards are re-rendered.
+    """
+
+    thumbnailReady = Signal(int)
+
+    def __init__(self, editor: CardSceneView, parent=None, thumbnail_width: int = THUMBNAIL_WIDTH):
+        super().__init__(parent)
+        self.editor = editor
+        self.thumbnail_width = thumbnail_width
+        self.cache = ThumbnailCache()
+        self.rendered = 0
+        self._renderer: Optional[CardSceneView] = None
+        self._render_signature: Optional[str] = None
+        self._hashes: Dict[int, str] = {}
+        # deck index → None; останні запити рендеряться першими
+        self._pending: "OrderedDict[int, None]" = OrderedDict()
+        self._placeholder = self._make_placeholder()
+
+        self._render_timer = QTimer(self)
+        self._render_timer.setInterval(0)
+        self._render_timer.timeout.connect(self._render_pending)
+        self._sync_timer = QTimer(self)
+        self._sync_timer.setSingleShot(True)
+        self._sync_timer.setInterval(LAYOUT_SYNC_DELAY_MS)
+        self._sync_timer.timeout.connect(self.sync_layout)
+        editor.scene().changed.connect(self._schedule_sync)
+        editor.layoutLoaded.connect(self._schedule_sync)
+
+    # ------------------------------------------------------------------
+    def data(self, index, role=Qt.DisplayRole):
+        if role != Qt.DecorationRole or not index.isValid():
+            return super().data(index, role)
+        deck_index = self.deck_index(index.row())
+        if deck_index < 0:
+            return None
+        image = self.cache.get(self._card_hash(deck_index))
+        if image is not None:
+            return image
+        self._pending[deck_index] = None
+        self._pending.move_to_end(deck_index)
+        self._render_timer.start()
+        return self._placeholder
+
+    def set_deck(self, deck):
+        self._sync_renderer()
+        self._hashes.clear()
+        self._pending.clear()
+        super().set_deck(deck)
+
+    def drop_pending(self):
+        """Forget queued rows, e.g. after scrolling; visible ones ask again."""
+        self._pending.clear()
+        self._render_timer.stop()
+
+    def thumbnail_size(self) -> QSize:
+        return self._placeholder.size()
+
+    # ------------------------------------------------------------------
+    # Синхронізація з редактором
+    # ------------------------------------------------------------------
+    def _schedule_sync(self, *_):
+        self._sync_timer.start()
+
+    def sync_layout(self):
+        """Mirror the editor layout and frame; re-hash every card if they changed."""
+        if not self._sync_renderer():
+            return
+        self._hashes.clear()
+        self._pending.clear()
+        # Розмір мініатюр міг змінитися разом із розміром картки.
+        self.layoutAboutToBeChanged.emit()
+        self.layoutChanged.emit()
+
+    def _sync_renderer(self) -> bool:
+        signature = self._current_signature()
+        if signature == self._render_signature:
+            return False
+        self._render_signature = signature
+        renderer = self._ensure_renderer()
+        renderer.load_layout(copy.deepcopy(self.editor.layout))
+        renderer.set_item_cache_mode(QGraphicsItem.NoCache)
+        renderer.set_frame_pixmap(self.editor.frame_pixmap())
+        self._placeholder = self._make_placeholder()
+        return True
+
+    def _current_signature(self) -> str:
+        parts = {
+            "layout": self.editor.layout,
+            "frame": self.editor.frame_pixmap().cacheKey(),
+            "width": self.thumbnail_width,
+        }
+        return json.dumps(parts, sort_keys=True, ensure_ascii=False, default=str)
+
+    def _ensure_renderer(self) -> CardSceneView:
+        if self._renderer is None:
+            self._renderer = CardSceneView()
+        return self._renderer
+
+    # ------------------------------------------------------------------
+    # Рендер
+    # ------------------------------------------------------------------
+    def _card_hash(self, deck_index: int) -> str:
+        digest = self._hashes.get(deck_index)
+        if digest is None:
+            card = self._deck.cards[deck_index]
+            digest = card_content_hash(card.payload, self._deck.deck_color, self._render_signature)
+            self._hashes[deck_index] = digest
+        return digest
+
+    def _render_pending(self):
+        deadline = time.perf_counter() + THUMBNAIL_BATCH_MS / 1000
+        while self._pending and time.perf_counter() < deadline:
+            deck_index, _ = self._pending.popitem(last=True)
+            if self._deck is None or deck_index >= len(self._deck.cards):
+                continue
+            digest = self._card_hash(deck_index)
+            if self.cache.get(digest) is not None:
+                continue
+            renderer = self._ensure_renderer()
+            renderer.art_pack = self.editor.art_pack
+            renderer.apply_card_data(self._deck.cards[deck_index].payload, self._deck.deck_color)
+            self.cache.put(digest, renderer.render_thumbnail(self.thumbnail_width))
+            self.rendered += 1
+            row = self.row_for_deck_index(deck_index)
+            if row >= 0:
+                index = self.index(row, 0)
+                self.dataChanged.emit(index, index, [Qt.DecorationRole])
+            self.thumbnailReady.emit(deck_index)
+        if not self._pending:
+            self._render_timer.stop()
+
+    def _make_placeholder(self) -> QImage:
+        card_size = self.editor.card_size
+        height = max(1, round(self.thumbnail_width * card_size.height() / max(1.0, card_size.width())))
+        image = QImage(self.thumbnail_width, height, QImage.Format_ARGB32_Premultiplied)
+        image.fill(QColor(45, 60, 75))
+        return image
+
+
+class DeckGalleryView(QListView):
+    """Grid of :class:`DeckGalleryModel` thumbnails."""
+
+    def __init__(self, editor: CardSceneView, parent=None):
+        super().__init__(parent)
+        self.gallery_model = DeckGalleryModel(editor, self)
+        self.setModel(self.gallery_model)
+        self.setViewMode(QListView.IconMode)
+        self.setMovement(QListView.Static)
+        self.setResizeMode(QListView.Adjust)
+        self.setUniformItemSizes(True)
+        self.setSelectionMode(QAbstractItemView.SingleSelection)
+        self.setSpacing(6)
+        self._apply_icon_size()
+        self.gallery_model.modelReset.connect(self._apply_icon_size)
+        self.gallery_model.layoutChanged.connect(self._apply_icon_size)
+        # Прокручені за межі вікна рядки не рендеримо — видимі попросять знову.
+        self.verticalScrollBar().valueChanged.connect(self.gallery_model.drop_pending)
+
+    def _apply_icon_size(self):
+        self.setIconSize(self.gallery_model.thumbnail_size())
@@ -0,0 +1,107 @@
+"""Virtualized card list model backed by a deck search index."""
+
+from __future__ import annotations
+
+from bisect import bisect_left
+
+from PySide6.QtCore import QAbstractListModel, QModelIndex, Qt
+
+from core.deck_index import DeckSearchIndex
+
+# Роль з індексом картки в колоді (рядок моделі ≠ індекс, коли діє фільтр).
+DeckIndexRole = Qt.UserRole + 1
+
+
+class DeckListModel(QAbstractListModel):
+    """Lazy list model over ``DeckModel.cards`` with an optional filter.
+
+    Rows are produced on demand in :meth:`data`, so a 10k-card deck costs
+    no per-card widgets. While a filter is active ``_rows`` holds the
+    matching deck indices in ascending order; mapping a deck index back to
+    a row is a binary search over it.
+    """
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._deck = None
+        self._index = DeckSearchIndex()
+        self._query = ""
+        self._rows = None  # None — без фільтра, рядок == індекс у колоді
+
+    # ------------------------------------------------------------------
+    # Qt API
+    # ------------------------------------------------------------------
+    def rowCount(self, parent=QModelIndex()):
+        if parent.isValid() or self._deck is None:
+            return 0
+        return len(self._index) if self._rows is None else len(self._rows)
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        deck_index = self.deck_index(index.row())
+        if deck_index < 0:
+            return None
+        if role == Qt.DisplayRole:
+            return self._deck.cards[deck_index].name
+        if role == DeckIndexRole:
+            return deck_index
+        return None
+
+    # ------------------------------------------------------------------
+    # Колода
+    # ------------------------------------------------------------------
+    def set_deck(self, deck):
+        """Show ``deck`` (or nothing for ``None``) keeping the current filter."""
+        self.beginResetModel()
+        self._deck = deck
+        self._index = DeckSearchIndex(deck.cards if deck is not None else ())
+        self._rows = self._index.filter(self._query)
+        self.endResetModel()
+
+    def cards_appended(self):
+        """Index the cards appended to ``deck.cards`` since the last call."""
+        if self._deck is None:
+            return
+        first = len(self._index)
+        cards = self._deck.cards
+        if len(cards) <= first:
+            return
+        if self._rows is not None:
+            self.beginResetModel()
+            self._index.extend(cards[first:])
+            self._rows = self._index.filter(self._query)
+            self.endResetModel()
+            return
+        self.beginInsertRows(QModelIndex(), first, len(cards) - 1)
+        self._index.extend(cards[first:])
+        self.endInsertRows()
+
+    def set_filter(self, query: str):
+        query = query.strip()
+        if query == self._query:
+            return
+        self.beginResetModel()
+        self._query = query
+        self._rows = self._index.filter(query)
+        self.endResetModel()
+
+    # ------------------------------------------------------------------
+    # Рядок ↔ індекс у колоді
+    # ------------------------------------------------------------------
+    def deck_index(self, row: int) -> int:
+        """Deck index shown in ``row`` or ``-1``."""
+        if not 0 <= row < self.rowCount():
+            return -1
+        return row if self._rows is None else self._rows[row]
+
+    def row_for_deck_index(self, deck_index: int) -> int:
+        """Row that shows ``deck_index`` or ``-1`` if it is filtered out."""
+        if not 0 <= deck_index < len(self._index):
+            return -1
+        if self._rows is None:
+            return deck_index
+        row = bisect_left(self._rows, deck_index)
+        if row < len(self._rows) and self._rows[row] == deck_index:
+            return row
+        return -1
@@ -0,0 +1,80 @@
+"""Compare full-resolution and reduced decode paths of ImageLoader.load_scaled.
+
+Usage: python benchmarks/bench_image_decode.py [--size 4096] [--repeat 5]
+
+Prints per-format timings for both paths plus the quality of the reduced
+result against the full path (mean absolute difference and PSNR).
+"""
+
+from __future__ import annotations
+
+import argparse
+import math
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+from PIL import Image, ImageChops, ImageDraw, ImageStat
+
+from app.core.image_loader import ImageLoader
+
+SLOT = (520, 320)
+
+
+def make_art(size: int) -> Image.Image:
+    img = Image.radial_gradient("L").resize((size, size)).convert("RGB")
+    draw = ImageDraw.Draw(img)
+    for x in range(0, size, 29):
+        draw.line([(x, 0), (size - x, size)], fill=(220, 60, 40), width=4)
+    return img
+
+
+def time_path(path: Path, reduced: bool, repeat: int):
+    best = math.inf
+    result = None
+    for _ in range(repeat):
+        loader = ImageLoader(reduced_decode=reduced)
+        start = time.perf_counter()
+        result = loader.load_scaled(str(path), *SLOT, keep_aspect=True)
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def quality(reference: Image.Image, candidate: Image.Image):
+    diff = ImageChops.difference(reference.convert("RGB"), candidate.convert("RGB"))
+    stat = ImageStat.Stat(diff)
+    mae = sum(stat.mean) / 3
+    mse = sum(stat.rms[i] ** 2 for i in range(3)) / 3
+    psnr = math.inf if mse == 0 else 10 * math.log10(255 ** 2 / mse)
+    return mae, psnr
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--size", type=int, default=4096)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    art = make_art(args.size)
+    with tempfile.TemporaryDirectory() as tmp:
+        print(f"source {args.size}x{args.size} -> slot {SLOT[0]}x{SLOT[1]}, best of {args.repeat}")
+        print(f"{'format':<6} {'full ms':>9} {'reduced ms':>11} {'speedup':>8} {'MAE':>6} {'PSNR dB':>8}")
+        for ext, options in (("jpg", {"quality": 92}), ("png", {"compress_level": 1})):
+            path = Path(tmp) / f"art.{ext}"
+            art.save(path, **options)
+            full_s, full = time_path(path, reduced=False, repeat=args.repeat)
+            reduced_s, reduced = time_path(path, reduced=True, repeat=args.repeat)
+            mae, psnr = quality(full, reduced)
+            print(
+                f"{ext:<6} {full_s * 1000:9.1f} {reduced_s * 1000:11.1f} "
+                f"{full_s / reduced_s:7.1f}x {mae:6.2f} {psnr:8.1f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,124 @@
+import os
+import sys
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+from PIL import Image
+
+from app.core.art_cache import ART_CACHE_DIR_NAME, DEFAULT_ART_CACHE_DIR, ArtDerivativeCache
+from app.core.image_loader import ImageLoader
+
+
+def _save(path: Path, size=(200, 100), color=(255, 0, 0, 255)) -> Path:
+    Image.new("RGBA", size, color=color).save(path)
+    return path
+
+
+def test_derivative_is_written_outside_the_source_folder_and_reused(tmp_path):
+    arts = tmp_path / "arts"
+    arts.mkdir()
+    art = _save(arts / "art.png")
+    cache_dir = tmp_path / "workspace" / ART_CACHE_DIR_NAME
+    cache = ArtDerivativeCache(cache_dir=str(cache_dir), image_loader=ImageLoader())
+
+    img = cache.load(str(art), 50, 50, dpi=300)
+    assert img.size == (50, 25)
+    assert img.getpixel((0, 0)) == (255, 0, 0, 255)
+
+    assert os.listdir(arts) == ["art.png"]
+    files = os.listdir(cache_dir)
+    assert sorted(os.path.splitext(name)[1] for name in files) == [".rgba", ".src"]
+
+    # Друге звернення читає похідний файл і не декодує джерело.
+    loader = ImageLoader()
+    again = ArtDerivativeCache(cache_dir=str(cache_dir), image_loader=loader).load(str(art), 50, 50, dpi=300)
+    assert again.tobytes() == img.tobytes()
+    assert loader.stats().misses == 0
+    assert ArtDerivativeCache(image_loader=loader).cache_dir == DEFAULT_ART_CACHE_DIR
+
+
+def test_prune_drops_derivatives_of_removed_and_changed_sources(tmp_path):
+    kept = _save(tmp_path / "kept.png")
+    touched = _save(tmp_path / "touched.png", color=(0, 255, 0, 255))
+    changed = _save(tmp_path / "changed.png", color=(0, 0, 255, 255))
+    removed = _save(tmp_path / "removed.png", color=(9, 9, 9, 255))
+    cache = ArtDerivativeCache(cache_dir=str(tmp_path / "cache"), image_loader=ImageLoader())
+    paths = {}
+    for art in (kept, touched, changed, removed):
+        cache.load(str(art), 40, 40)
+        cache.load(str(art), 20, 20)
+        paths[art] = cache.derivative_path(str(art), 40, 40)
+    assert cache.prune() == 0
+
+    os.utime(touched, ns=(1, os.stat(touched).st_mtime_ns + 1_000_000))
+    _save(changed, color=(1, 2, 3, 255))
+    os.remove(removed)
+    # два похідні й маркер на кожне зникле джерело
+    assert cache.prune() == 6
+    assert os.path.exists(paths[kept]) and os.path.exists(paths[touched])
+    assert not os.path.exists(paths[changed]) and not os.path.exists(paths[removed])
+    assert cache.prune() == 0
+    assert cache.load(str(changed), 40, 40).getpixel((0, 0)) == (1, 2, 3, 255)
+
+
+def test_prune_keeps_derivatives_shared_by_files_with_equal_content(tmp_path):
+    first = _save(tmp_path / "first.png")
+    (tmp_path / "second.png").write_bytes(first.read_bytes())
+    second = tmp_path / "second.png"
+    cache = ArtDerivativeCache(cache_dir=str(tmp_path / "cache"), image_loader=ImageLoader())
+    cache.load(str(first), 40, 40)
+    # друге джерело лише читає готовий похідний файл, але теж отримує маркер
+    cache.load(str(second), 40, 40)
+    derivative = cache.derivative_path(str(first), 40, 40)
+    assert derivative == cache.derivative_path(str(second), 40, 40)
+
+    os.remove(first)
+    assert cache.prune() == 1
+    assert os.path.exists(derivative)
+    os.remove(second)
+    assert cache.prune() == 2
+    assert not os.path.exists(derivative)
+
+
+def test_key_covers_slot_geometry_and_source_content(tmp_path):
+    art = _save(tmp_path / "art.png")
+    cache = ArtDerivativeCache(cache_dir=str(tmp_path / "cache"), image_loader=ImageLoader())
+
+    fitted = cache.derivative_path(str(art), 50, 50, 300, keep_aspect=True)
+    assert fitted != cache.derivative_path(str(art), 50, 50, 600, keep_aspect=True)
+    assert fitted != cache.derivative_path(str(art), 60, 50, 300, keep_aspect=True)
+    assert fitted != cache.derivative_path(str(art), 50, 50, 300, keep_aspect=False)
+
+    assert cache.load(str(art), 50, 50, keep_aspect=False).size == (50, 50)
+
+    _save(art, color=(0, 0, 255, 255))
+    os.utime(art, ns=(1, os.stat(art).st_mtime_ns + 1_000_000))
+    assert cache.derivative_path(str(art), 50, 50, 300) != fitted
+    assert cache.load(str(art), 50, 50).getpixel((0, 0)) == (0, 0, 255, 255)
+
+
+def test_premultiplied_pixels_and_missing_source(tmp_path):
+    art = _save(tmp_path / "art.png", color=(200, 100, 50, 128))
+    cache = ArtDerivativeCache(cache_dir=str(tmp_path / "cache"), image_loader=ImageLoader())
+
+    width, height, data = cache.load_premultiplied(str(art), 20, 10)
+    assert (width, height) == (20, 10)
+    r, g, b, a = data[:4]
+    assert a == 128 and abs(r - 100) <= 1 and abs(g - 50) <= 1
+
+    assert cache.load(str(tmp_path / "missing.png"), 20, 10) is None
+    assert cache.load(None, 20, 10) is None
+
+
+def test_corrupt_derivative_is_regenerated(tmp_path):
+    art = _save(tmp_path / "art.png")
+    cache = ArtDerivativeCache(cache_dir=str(tmp_path / "cache"), image_loader=ImageLoader())
+    path = cache.derivative_path(str(art), 40, 40)
+    os.makedirs(os.path.dirname(path))
+    Path(path).write_bytes(b"garbage")
+
+    assert cache.load(str(art), 40, 40).size == (40, 20)
+    assert Path(path).stat().st_size > 100
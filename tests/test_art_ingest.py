@@ -0,0 +1,118 @@
+import json
+import os
+import sys
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+from PIL import Image
+
+from app.core.art_ingest import ingest_arts, match_arts, match_key, normalize_art
+from app.core.json_loader import JSONLoader
+
+
+def _deck(tmp_path: Path, names) -> str:
+    decks = tmp_path / "decks"
+    decks.mkdir()
+    path = decks / "deck.json"
+    path.write_text(json.dumps({"cards": [{"name": n, "type": "unit"} for n in names]}), encoding="utf-8")
+    return str(path)
+
+
+def _raw(folder: Path, name: str, size=(300, 200), fmt=None) -> str:
+    folder.mkdir(exist_ok=True)
+    img = Image.new("RGB", size, color=(10, 20, 30))
+    path = folder / name
+    extra = {"exif": b"Exif\x00\x00fake"} if fmt == "JPEG" else {}
+    img.save(path, format=fmt, **extra)
+    return str(path)
+
+
+def test_match_key_ignores_case_separators_and_accents():
+    assert match_key("Fire_Ball-II") == match_key("fire ball ii")
+    assert match_key("Café  Guard") == "cafe guard"
+    assert match_key("Лицар Світла") == "лицар світла"
+
+
+def test_match_arts_prefers_exact_then_fuzzy():
+    files = ["/raw/fire_ball.jpg", "/raw/Ice Shard v2.png", "/raw/random.png"]
+    matches, fuzzy, unmatched, unused = match_arts(["Fire Ball", "Ice Shard", "Ghost"], files)
+    assert matches == {"Fire Ball": "/raw/fire_ball.jpg", "Ice Shard": "/raw/Ice Shard v2.png"}
+    assert fuzzy == {"Ice Shard"}
+    assert unmatched == ["Ghost"]
+    assert unused == ["/raw/random.png"]
+
+
+def test_ingest_normalizes_and_reports(tmp_path):
+    deck_path = _deck(tmp_path, ["Fire Ball", "Ice Shard", "Ghost"])
+    raw = tmp_path / "raw"
+    _raw(raw, "FIRE_BALL.jpg", size=(3000, 1000), fmt="JPEG")
+    _raw(raw, "ice-shard.webp", fmt="WEBP")
+    _raw(raw, "notes.txt.png")
+
+    report = ingest_arts(deck_path, str(raw), max_size=(600, 600), workers=2)
+
+    arts = tmp_path / "arts"
+    assert set(report.matched) == {"Fire Ball", "Ice Shard"}
+    assert report.unmatched_cards == ["Ghost"]
+    assert report.unused_files == [str(raw / "notes.txt.png")]
+    assert not report.failed
+    with Image.open(arts / "Fire Ball.png") as img:
+        assert img.format == "PNG" and img.mode == "RGBA"
+        assert img.size == (600, 200)
+        assert "exif" not in img.info
+
+    # Виходи знаходить звичайне автовизначення артів.
+    deck = JSONLoader(deck_path).load()
+    assert deck.cards[0].payload["art_path"].endswith("Fire Ball.png")
+
+    again = ingest_arts(deck_path, str(raw), max_size=(600, 600), workers=1)
+    assert sorted(again.skipped) == ["Fire Ball", "Ice Shard"]
+
+
+def test_ingest_redoes_outputs_whose_source_changed_even_if_older(tmp_path):
+    deck_path = _deck(tmp_path, ["Fire Ball"])
+    raw = tmp_path / "raw"
+    src = _raw(raw, "fire_ball.png")
+    ingest_arts(deck_path, str(raw), workers=1)
+    out = tmp_path / "arts" / "Fire Ball.png"
+    with open(tmp_path / "arts" / "ingest_report.json", encoding="utf-8") as fh:
+        assert json.load(fh)["sources"]["Fire Ball.png"]["path"] == os.path.abspath(src)
+
+    # Новий вміст, але mtime старіший за вихід — порівняння mtime його б пропустило.
+    _raw(raw, "fire_ball.png", size=(120, 60))
+    old = os.stat(out).st_mtime_ns - 10**9
+    os.utime(src, ns=(old, old))
+
+    report = ingest_arts(deck_path, str(raw), workers=1)
+    assert report.skipped == []
+    with Image.open(out) as img:
+        assert img.size == (120, 60)
+
+
+def test_normalize_shrinks_palette_and_16_bit_sources(tmp_path):
+    palette = Image.new("RGB", (1200, 900), (200, 30, 30)).convert("P", palette=Image.ADAPTIVE)
+    palette.save(tmp_path / "palette.png")
+    Image.new("I;16", (1200, 900), 4000).save(tmp_path / "deep.png")
+
+    for name in ("palette", "deep"):
+        size = normalize_art(str(tmp_path / f"{name}.png"), str(tmp_path / f"{name}-out.png"), max_size=(300, 300))
+        assert size == (300, 225)
+        with Image.open(tmp_path / f"{name}-out.png") as img:
+            assert img.mode == "RGBA"
+    with Image.open(tmp_path / "palette-out.png") as img:
+        assert img.getpixel((150, 100)) == (200, 30, 30, 255)
+
+
+def test_broken_source_is_reported_as_failed(tmp_path):
+    deck_path = _deck(tmp_path, ["Ghost"])
+    raw = tmp_path / "raw"
+    raw.mkdir()
+    (raw / "ghost.png").write_bytes(b"not a png")
+
+    report = ingest_arts(deck_path, str(raw), workers=1)
+    assert str(raw / "ghost.png") in report.failed
+    assert report.unmatched_cards == ["Ghost"]
+    assert not os.path.exists(tmp_path / "arts" / "Ghost.png")
@@ -0,0 +1,115 @@
+import json
+import os
+import struct
+import sys
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+from PIL import Image
+
+from app.core.art_cache import ArtDerivativeCache
+from app.core.art_pack import PACK_ALIGNMENT, PACK_FORMAT_VERSION, PACK_MAGIC, ArtPack, art_pack_path, write_art_pack
+from app.core.image_loader import ImageLoader
+
+
+def _save(path: Path, size, color) -> str:
+    Image.new("RGBA", size, color=color).save(path)
+    return str(path)
+
+
+def _cache(tmp_path) -> ArtDerivativeCache:
+    return ArtDerivativeCache(cache_dir=str(tmp_path / "cache"), image_loader=ImageLoader())
+
+
+def test_pack_roundtrip_serves_fitted_pixels(tmp_path):
+    red = _save(tmp_path / "red.png", (200, 100), (255, 0, 0, 255))
+    blue = _save(tmp_path / "blue.png", (100, 200), (0, 0, 255, 255))
+    pack_path = str(tmp_path / "deck.artpack")
+
+    count = write_art_pack(pack_path, [red, blue, red, None], 40, 40, art_cache=_cache(tmp_path))
+    assert count == 2
+
+    pack = ArtPack.open(pack_path)
+    assert len(pack) == 2 and pack.matches(40, 40, keep_aspect=True)
+    assert not pack.matches(40, 40, keep_aspect=False)
+
+    img = pack.image(red)
+    assert img.mode == "RGBA" and img.size == (40, 20)
+    assert img.getpixel((5, 5)) == (255, 0, 0, 255)
+    assert pack.image(blue).size == (20, 40)
+    assert pack.image(str(tmp_path / "other.png")) is None
+    for entry in pack._entries.values():
+        assert entry["offset"] % PACK_ALIGNMENT == 0
+    del img
+    pack.close()
+
+
+def test_changed_source_misses_pack(tmp_path):
+    art = _save(tmp_path / "art.png", (50, 50), (0, 255, 0, 255))
+    pack_path = str(tmp_path / "deck.artpack")
+    write_art_pack(pack_path, [art], 10, 10, keep_aspect=False, art_cache=_cache(tmp_path))
+
+    pack = ArtPack.open(pack_path)
+    assert art in pack
+    _save(tmp_path / "art.png", (50, 50), (0, 0, 0, 255))
+    os.utime(art, ns=(1, os.stat(art).st_mtime_ns + 1_000_000))
+    assert art not in pack
+    assert pack.image(art) is None
+    pack.close()
+
+
+def test_open_rejects_missing_and_foreign_files(tmp_path):
+    assert ArtPack.open(str(tmp_path / "none.artpack")) is None
+    assert ArtPack.open(None) is None
+    bogus = tmp_path / "bogus.artpack"
+    bogus.write_bytes(b"not a pack at all")
+    assert ArtPack.open(str(bogus)) is None
+
+
+def test_open_rejects_packs_with_a_broken_index(tmp_path):
+    indexes = [
+        {"version": PACK_FORMAT_VERSION, "width": 10, "height": 10},
+        {"version": PACK_FORMAT_VERSION, "width": 10, "height": 10, "keep_aspect": True, "dpi": 300, "entries": None},
+        [PACK_FORMAT_VERSION],
+    ]
+    for i, index in enumerate(indexes):
+        data = json.dumps(index).encode("utf-8")
+        broken = tmp_path / f"broken-{i}.artpack"
+        broken.write_bytes(PACK_MAGIC + struct.pack("<I", len(data)) + data)
+        assert ArtPack.open(str(broken)) is None
+    truncated = tmp_path / "truncated.artpack"
+    truncated.write_bytes(PACK_MAGIC + b"\x01")
+    assert ArtPack.open(str(truncated)) is None
+
+
+def test_open_rejects_entries_outside_the_file(tmp_path):
+    art = _save(tmp_path / "art.png", (40, 20), (255, 0, 0, 255))
+    pack_path = tmp_path / "deck.artpack"
+    write_art_pack(str(pack_path), [art], 20, 20, art_cache=_cache(tmp_path))
+    data = pack_path.read_bytes()
+
+    truncated = tmp_path / "truncated.artpack"
+    truncated.write_bytes(data[:-1])
+    assert ArtPack.open(str(truncated)) is None
+
+    head = len(PACK_MAGIC) + 4
+    (index_len,) = struct.unpack("<I", data[len(PACK_MAGIC):head])
+    index = json.loads(data[head:head + index_len])
+    for entry in index["entries"].values():
+        entry["offset"] = -entry["offset"]
+    patched = json.dumps(index).encode("utf-8")
+    negative = tmp_path / "negative.artpack"
+    negative.write_bytes(PACK_MAGIC + struct.pack("<I", len(patched)) + patched + data[head + index_len:])
+    assert ArtPack.open(str(negative)) is None
+
+    pack = ArtPack.open(str(pack_path))
+    assert pack is not None and pack.image(art).size == (20, 10)
+    pack.close()
+
+
+def test_pack_lives_next_to_the_arts_folder(tmp_path):
+    arts = tmp_path / "arts"
+    assert art_pack_path(str(arts), "deck") == str(tmp_path / "deck.artpack")
@@ -0,0 +1,84 @@
+import json
+import sys
+from pathlib import Path
+
+import pytest
+from PIL import Image
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+from app.core.atlas_export import AtlasBuilder, ShelfPacker
+
+
+def _card(i, size=(10, 14)):
+    return Image.new("RGBA", size, (i * 20 % 256, 100, 200, 255))
+
+
+def test_grid_sheets_reserve_back_slot_and_index_uvs(tmp_path):
+    back = Image.new("RGB", (20, 28), "black")
+    with AtlasBuilder(str(tmp_path), "deck", grid=(3, 2), back=back) as atlas:
+        for i in range(7):
+            atlas.add(f"Card {i}", _card(i), {"index": i})
+        index_path = atlas.finish({"deck": "Deck"})
+    index = json.loads(Path(index_path).read_text(encoding="utf-8"))
+
+    assert [s["file"] for s in index["sheets"]] == ["deck-01.png", "deck-02.png"]
+    assert [s["cards"] for s in index["sheets"]] == [5, 2]
+    assert index["cell"] == [10, 14] and index["grid"] == [3, 2] and index["deck"] == "Deck"
+    assert index["sheets"][1]["back"] == {"rect": [20, 14, 10, 14], "uv": [round(2 / 3, 6), 0.5, 1.0, 1.0]}
+    card = index["cards"][6]
+    assert (card["name"], card["index"], card["sheet"], card["rect"]) == ("Card 6", 6, 1, [10, 0, 10, 14])
+    assert card["uv"] == [round(1 / 3, 6), 0.0, round(2 / 3, 6), 0.5]
+    # мала картка-зворот вписана в клітинку, порожні клітинки прозорі
+    with Image.open(tmp_path / "deck-02.png") as sheet:
+        assert sheet.size == (30, 28)
+        assert sheet.getpixel((25, 20)) == (0, 0, 0, 255)
+        assert sheet.getpixel((5, 20))[3] == 0
+        assert sheet.getpixel((15, 5)) == (120, 100, 200, 255)
+    # аркуші беруться з пулу: стільки, скільки в польоті, а не на всю колоду
+    assert atlas._pool.created <= 2
+
+
+def test_pack_mode_trims_sheets_and_mixes_sizes(tmp_path):
+    with AtlasBuilder(str(tmp_path), "deck", mode="pack", max_sheet_size=(32, 32), padding=1) as atlas:
+        atlas.add("big", _card(1, (20, 14)))
+        atlas.add("small", _card(2, (10, 10)))
+        atlas.add("next row", _card(3, (30, 10)))
+        atlas.add("new sheet", _card(4, (20, 14)))
+        index = json.loads(Path(atlas.finish()).read_text(encoding="utf-8"))
+
+    assert [c["rect"] for c in index["cards"]] == [[0, 0, 20, 14], [21, 0, 10, 10], [0, 15, 30, 10], [0, 0, 20, 14]]
+    assert [s["size"] for s in index["sheets"]] == [[31, 25], [20, 14]]
+    assert "grid" not in index
+    with Image.open(tmp_path / "deck-02.png") as sheet:
+        assert sheet.size == (20, 14)
+    with pytest.raises(ValueError):
+        ShelfPacker((16, 16)).place((20, 10))
+    with pytest.raises(ValueError):
+        AtlasBuilder(str(tmp_path), "deck", mode="hex")
+    back = Image.new("RGBA", (100, 60), "black")
+    with AtlasBuilder(str(tmp_path / "back"), "deck", mode="pack", max_sheet_size=(100, 100), back=back) as atlas:
+        with pytest.raises(ValueError, match="next to the back"):
+            atlas.add("wide", _card(5, (100, 60)))
+
+
+def test_pack_mode_holds_the_buffer_until_its_trimmed_copy_is_written(tmp_path):
+    with AtlasBuilder(str(tmp_path), "deck", mode="pack", max_sheet_size=(32, 32)) as atlas:
+        release = atlas._pool.release
+        written_at_release = []
+
+        def record(buffer):
+            written_at_release.append(sorted(p.name for p in tmp_path.glob("deck-*.png")))
+            release(buffer)
+
+        atlas._pool.release = record
+        for i in range(5):
+            atlas.add(f"Card {i}", _card(i, (20, 20)))
+        atlas.finish()
+
+    # Буфер аркуша N повертається, коли його копію вже записано.
+    assert [names[-1] for names in written_at_release] == [f"deck-{n:02d}.png" for n in range(1, 6)]
+    assert atlas._pool.created <= 2
+
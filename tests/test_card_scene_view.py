@@ -0,0 +1,237 @@
+import importlib.machinery
+import json
+import os
+import subprocess
+import sys
+import textwrap
+from pathlib import Path
+
+import pytest
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+APP_DIR = PROJECT_ROOT / "app"
+
+# PathFinder шукає на диску: test_scene_exporter підміняє PySide6 у sys.modules.
+pytestmark = pytest.mark.skipif(
+    importlib.machinery.PathFinder.find_spec("PySide6") is None, reason="PySide6 not installed"
+)
+
+
+def _run_qt(script: str, tmp_path: Path) -> dict:
+    env = dict(os.environ, QT_QPA_PLATFORM="offscreen")
+    output = subprocess.run(
+        [sys.executable, "-c", textwrap.dedent(script), str(APP_DIR), str(tmp_path)],
+        check=True,
+        env=env,
+        cwd=str(APP_DIR),
+        capture_output=True,
+        text=True,
+    ).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+LOD_SCRIPT = """
+import json, sys
+app_dir, tmp_dir = sys.argv[1:3]
+sys.path.insert(0, app_dir)
+from PySide6.QtCore import QRectF, Qt
+from PySide6.QtGui import QColor, QImage, QLinearGradient, QPainter, QPixmap
+from PySide6.QtWidgets import QApplication
+app = QApplication([])
+from widgets.card_scene_view import CardSceneView
+
+layout = {"meta": {"width": 744, "height": 1038, "dpi": 300}, "items": {}}
+with open(tmp_dir + "/layout.json", "w", encoding="utf-8") as fh:
+    json.dump(layout, fh)
+view = CardSceneView(tmp_dir + "/layout.json")
+frame = QImage(744, 1038, QImage.Format_ARGB32_Premultiplied)
+painter = QPainter(frame)
+gradient = QLinearGradient(0, 0, 744, 1038)
+gradient.setColorAt(0, QColor("#C03020"))
+gradient.setColorAt(1, QColor("#2040C0"))
+painter.fillRect(frame.rect(), gradient)
+painter.end()
+view.set_frame_pixmap(QPixmap.fromImage(frame))
+item = view._frame_item
+view._card_rect_item.setVisible(False)
+
+def render(width, height):
+    image = QImage(width, height, QImage.Format_ARGB32_Premultiplied)
+    image.fill(Qt.transparent)
+    painter = QPainter(image)
+    painter.setRenderHint(QPainter.SmoothPixmapTransform, True)
+    view._scene.render(painter, QRectF(0, 0, width, height), QRectF(0, 0, 744, 1038))
+    painter.end()
+    return image
+
+result = {"levels": [item.lod_level(s) for s in (2.0, 1.0, 0.6, 0.5, 0.3, 0.2, 0.05)]}
+view.render_card_image()
+result["lods_after_export"] = sorted(item._lods)
+small = render(186, 259)  # масштаб 0.25
+result["lods_after_zoom_out"] = sorted(item._lods)
+result["lod_size"] = [item._lods[2].width(), item._lods[2].height()]
+small.save(tmp_dir + "/lod.png")
+item.setPixmap(item.pixmap())
+result["lods_after_set_pixmap"] = sorted(item._lods)
+print(json.dumps(result))
+"""
+
+
+def test_pixmaps_use_lod_only_when_zoomed_out(tmp_path):
+    from PIL import Image, ImageStat
+
+    result = _run_qt(LOD_SCRIPT, tmp_path)
+    assert result["levels"] == [0, 0, 0, 1, 1, 2, 3]
+    assert result["lods_after_export"] == []
+    assert result["lods_after_zoom_out"] == [1, 2]
+    assert result["lod_size"] == [186, 259]
+    assert result["lods_after_set_pixmap"] == []
+
+    with Image.open(tmp_path / "lod.png") as lod:
+        corner = lod.convert("RGB").crop((0, 0, 20, 20))
+    assert ImageStat.Stat(corner).mean[0] > ImageStat.Stat(corner).mean[2]
+
+
+CACHE_SCRIPT = """
+import json, sys
+app_dir, tmp_dir = sys.argv[1:3]
+sys.path.insert(0, app_dir)
+from PySide6.QtGui import QFont
+from PySide6.QtWidgets import QApplication
+app = QApplication([])
+from widgets.card_scene_view import CardSceneView
+
+items = {}
+for i in range(12):
+    items[f"t{i}"] = {"type": "text", "text": f"Ability {i}", "pos": {"x": 20, "y": 20 + i * 60},
+                      "font": {"family": "DejaVu Sans", "size": 12}, "text_width": 300, "z": 6}
+    items[f"r{i}"] = {"type": "rect", "pos": {"x": 10, "y": 10 + i * 60}, "size": {"w": 320, "h": 50}, "z": 1}
+layout = {"meta": {"width": 744, "height": 1038, "dpi": 300}, "items": items}
+with open(tmp_dir + "/layout.json", "w", encoding="utf-8") as fh:
+    json.dump(layout, fh)
+layout["meta"]["item_cache"] = "none"
+with open(tmp_dir + "/layout_nocache.json", "w", encoding="utf-8") as fh:
+    json.dump(layout, fh)
+
+view = CardSceneView(tmp_dir + "/layout.json")
+view.resize(400, 560)
+view.show()
+app.processEvents()
+modes = {item.cacheMode().name for item in view.scene_items.values()}
+frame = view.viewport().grab().toImage()
+
+# кеш скидається на зміну тексту, шрифту й розміру
+view._set_text("t0", "Changed text", persist=False)
+after_text = view.viewport().grab().toImage()
+font = QFont(view.scene_items["t1"].font())
+font.setPointSize(20)
+view.update_font("t1", font)
+after_font = view.viewport().grab().toImage()
+view.update_item_size("r2", (200, 30))
+after_size = view.viewport().grab().toImage()
+
+exported = view.render_card_image()
+modes_after_export = {item.cacheMode().name for item in view.scene_items.values()}
+with view.export_batch():
+    modes_in_batch = {item.cacheMode().name for item in view.scene_items.values()}
+    batch_exported = view.render_card_image()
+modes_after_batch = {item.cacheMode().name for item in view.scene_items.values()}
+reference = CardSceneView(tmp_dir + "/layout_nocache.json")
+reference._set_text("t0", "Changed text", persist=False)
+reference.update_font("t1", font)
+reference.update_item_size("r2", (200, 30))
+
+print(json.dumps({
+    "modes": sorted(modes),
+    "nocache_modes": sorted({item.cacheMode().name for item in reference.scene_items.values()}),
+    "modes_after_export": sorted(modes_after_export),
+    "modes_in_batch": sorted(modes_in_batch),
+    "modes_after_batch": sorted(modes_after_batch),
+    "batch_matches": batch_exported == exported,
+    "text_changed": after_text != frame,
+    "font_changed": after_font != after_text,
+    "size_changed": after_size != after_font,
+    "export_matches": exported == reference.render_card_image(),
+    "frames": view.paint_stats.frames,
+    "average_ms": view.paint_stats.average_ms,
+}))
+"""
+
+
+def test_item_cache_policy_and_paint_metric(tmp_path):
+    result = _run_qt(CACHE_SCRIPT, tmp_path)
+    assert result["modes"] == ["DeviceCoordinateCache"]
+    assert result["nocache_modes"] == ["NoCache"]
+    assert result["modes_after_export"] == ["DeviceCoordinateCache"]
+    assert result["modes_in_batch"] == ["NoCache"]
+    assert result["modes_after_batch"] == ["DeviceCoordinateCache"]
+    assert result["batch_matches"]
+    assert result["text_changed"] and result["font_changed"] and result["size_changed"]
+    assert result["export_matches"]
+    assert result["frames"] >= 4 and result["average_ms"] > 0
+
+
+EXPORT_SCRIPT = """
+import json, sys
+app_dir, tmp_dir = sys.argv[1:3]
+sys.path.insert(0, app_dir)
+from PySide6.QtGui import QImage
+from PySide6.QtWidgets import QApplication
+app = QApplication([])
+from core.export_pipeline import EncodeQueue
+from widgets.card_scene_view import CardSceneView
+
+layout = {"meta": {"width": 744, "height": 1038, "dpi": 300}, "items": {
+    "name": {"type": "text", "text": "", "pos": {"x": 40, "y": 40}, "font": {"family": "DejaVu Sans", "size": 24},
+             "color": "#FFFFFF", "text_width": 600, "z": 6},
+    "panel": {"type": "rect", "pos": {"x": 20, "y": 600}, "size": {"w": 700, "h": 300}, "z": 1}}}
+with open(tmp_dir + "/layout.json", "w", encoding="utf-8") as fh:
+    json.dump(layout, fh)
+view = CardSceneView(tmp_dir + "/layout.json")
+names = [f"Card {i}" for i in range(8)]
+with EncodeQueue() as encoder:
+    for name in names:
+        view.apply_card_data({"name": name}, "#3366CC")
+        view.export_to_png(f"{tmp_dir}/{name}-queued.png", encoder=encoder)
+identical = []
+for name in names:
+    view.apply_card_data({"name": name}, "#3366CC")
+    view.export_to_png(f"{tmp_dir}/{name}-sync.png")
+    queued = QImage(f"{tmp_dir}/{name}-queued.png")
+    identical.append(queued == QImage(f"{tmp_dir}/{name}-sync.png") and queued == view.render_card_image())
+view.export_to_png(f"{tmp_dir}/archival.png", profile="archival")
+archival = QImage(f"{tmp_dir}/archival.png").convertToFormat(QImage.Format_ARGB32)
+image = QImage(f"{tmp_dir}/Card 0-sync.png")
+streamed = []
+with EncodeQueue() as stream:
+    view.export_to_png(streamed.append, encoder=stream)
+from core.atlas_export import AtlasBuilder
+with AtlasBuilder(tmp_dir + "/atlas", "deck", grid=(2, 1)) as atlas:
+    atlas.add("full", view.render_card_image())
+    atlas.add("thumb", view.render_thumbnail(200))
+    atlas.finish()
+atlas_sheet = QImage(tmp_dir + "/atlas/deck-01.png")
+print(json.dumps({
+    "streamed_matches": QImage.fromData(streamed[0]).convertToFormat(QImage.Format_ARGB32)
+    == QImage(f"{tmp_dir}/Card 7-sync.png").convertToFormat(QImage.Format_ARGB32),
+    "archival_matches": archival == QImage(f"{tmp_dir}/Card 7-sync.png").convertToFormat(QImage.Format_ARGB32),
+    "identical": identical,
+    "buffers": view._export_pool.created,
+    "written": encoder.written,
+    "atlas": [atlas_sheet.width(), atlas_sheet.height(), atlas_sheet.pixelColor(100, 700).name() == image.pixelColor(100, 700).name()],
+    "size": [image.width(), image.height(), round(image.dotsPerMeterX() * 0.0254)],
+}))
+"""
+
+
+def test_export_reuses_buffers_and_queued_output_matches_sync(tmp_path):
+    from app.core.export_pipeline import EXPORT_BUFFERS
+
+    result = _run_qt(EXPORT_SCRIPT, tmp_path)
+    assert all(result["identical"]) and len(result["identical"]) == 8
+    assert result["buffers"] <= EXPORT_BUFFERS
+    assert result["written"] == 8
+    assert result["size"] == [744, 1038, 300]
+    assert result["archival_matches"]
+    assert result["streamed_matches"]
+    assert result["atlas"] == [1488, 1038, True]
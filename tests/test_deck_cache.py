@@ -0,0 +1,94 @@
+import json
+import os
+import pickle
+import sys
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+from app.core.deck_cache import CACHE_MAGIC, DeckCache
+from app.core.json_loader import JSONLoader
+
+
+def _make_workspace(tmp_path: Path) -> Path:
+    (tmp_path / "arts").mkdir()
+    decks_dir = tmp_path / "decks"
+    decks_dir.mkdir()
+    deck_path = decks_dir / "deck.json"
+    deck_path.write_text(
+        json.dumps(
+            {
+                "deck_color": "#4466AA",
+                "prompts": {"unit": "{name}, soldier"},
+                "cards": [
+                    {"name": "Alpha", "type": "unit", "atk": 2},
+                    {"name": "Beta", "type": "tactic", "cost": 1},
+                ],
+            }
+        ),
+        encoding="utf-8",
+    )
+    return deck_path
+
+
+def test_snapshot_roundtrip(tmp_path):
+    deck_path = _make_workspace(tmp_path)
+    cache = DeckCache()
+    built = cache.load_or_build(JSONLoader(str(deck_path)))
+
+    cached = cache.load(JSONLoader(str(deck_path)))
+    assert cached is not None
+    assert (deck_path.parent / ".deckcache" / "deck.bin").read_bytes().startswith(CACHE_MAGIC)
+    assert [card.payload for card in cached.cards] == [card.payload for card in built.cards]
+    assert cached.cards[0]["prompt"] == "Alpha, soldier"
+
+
+def test_snapshot_invalidated_by_deck_and_arts_changes(tmp_path):
+    deck_path = _make_workspace(tmp_path)
+    cache = DeckCache(cache_dir=str(tmp_path / "cache"))
+    cache.load_or_build(JSONLoader(str(deck_path)))
+
+    (tmp_path / "arts" / "Alpha.png").write_bytes(b"not really a png")
+    assert cache.load(JSONLoader(str(deck_path))) is None
+    rebuilt = cache.load_or_build(JSONLoader(str(deck_path)))
+    assert rebuilt.cards[0]["art_path"].endswith("Alpha.png")
+    assert cache.load(JSONLoader(str(deck_path))) is not None
+
+    data = json.loads(deck_path.read_text(encoding="utf-8"))
+    data["cards"][1]["cost"] = 5
+    deck_path.write_text(json.dumps(data), encoding="utf-8")
+    assert cache.load(JSONLoader(str(deck_path))) is None
+    assert cache.load_or_build(JSONLoader(str(deck_path))).cards[1]["cost"] == 5
+
+
+def test_corrupt_or_foreign_snapshot_falls_back(tmp_path):
+    deck_path = _make_workspace(tmp_path)
+    cache = DeckCache()
+    loader = JSONLoader(str(deck_path))
+    key = cache.snapshot_key(loader)
+    cache_file = Path(cache.cache_path(loader))
+    cache_file.parent.mkdir(parents=True)
+
+    cache_file.write_bytes(CACHE_MAGIC + key.encode() + b"\n" + b"garbage")
+    assert cache.load(loader) is None
+
+    cache_file.write_bytes(CACHE_MAGIC + key.encode() + b"\n" + pickle.dumps(os.system))
+    assert cache.load(loader) is None
+
+    # знімок старого формату без частини ключів
+    cache_file.write_bytes(CACHE_MAGIC + key.encode() + b"\n" + pickle.dumps({"deck_color": "#fff"}))
+    assert cache.load(loader) is None
+    assert len(cache.load_or_build(loader)) == 2
+
+
+def test_store_accepts_regular_deck(tmp_path):
+    deck_path = _make_workspace(tmp_path)
+    cache = DeckCache()
+    loader = JSONLoader(str(deck_path))
+    deck = loader.load()
+    cache.store(loader, deck)
+
+    cached = cache.load(JSONLoader(str(deck_path)))
+    assert [card.payload for card in cached.cards] == [card.payload for card in deck.cards]
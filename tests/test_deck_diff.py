@@ -0,0 +1,72 @@
+import os
+import sys
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+from app.core.deck_diff import (
+    affected_card_indices,
+    art_snapshot,
+    card_identities,
+    changed_art_files,
+    removed_card_indices,
+)
+from app.core.models import CardModel, DeckModel
+
+
+def _deck(payloads, color="#FFFFFF"):
+    return DeckModel(
+        name="deck",
+        path="",
+        deck_color=color,
+        cards=[CardModel(index=i, payload=dict(p)) for i, p in enumerate(payloads)],
+    )
+
+
+def test_only_edited_and_new_cards_are_affected():
+    old = _deck([{"name": "A"}, {"name": "B"}, {"name": "C"}])
+    new = _deck([{"name": "A"}, {"name": "B", "atk": 3}, {"name": "C"}, {"name": "D"}])
+
+    assert affected_card_indices(old, new) == {1, 3}
+    assert list(removed_card_indices(old, new)) == []
+    assert list(removed_card_indices(new, old)) == [3]
+
+
+def test_cards_are_matched_by_name_and_occurrence():
+    old = _deck([{"name": "A"}, {"name": "B"}, {"name": "C"}, {"name": "C", "atk": 1}])
+    new = _deck([{"name": "A"}, {"name": "C"}, {"name": "C", "atk": 2}])
+
+    assert affected_card_indices(old, new) == {2}
+    assert removed_card_indices(old, new) == [1]
+    assert card_identities(new.cards) == ["A#1", "C#1", "C#2"]
+
+
+def test_deck_color_change_affects_every_card():
+    old = _deck([{"name": "A"}, {"name": "B"}])
+    new = _deck([{"name": "A"}, {"name": "B"}], color="#000000")
+
+    assert affected_card_indices(old, new) == {0, 1}
+
+
+def test_rewritten_art_file_affects_cards_using_it(tmp_path):
+    arts = tmp_path / "arts"
+    arts.mkdir()
+    (arts / "A.png").write_bytes(b"1")
+    (arts / "B.png").write_bytes(b"1")
+    before = art_snapshot(str(arts))
+
+    (arts / "B.png").write_bytes(b"22")
+    (arts / "C.png").write_bytes(b"3")
+    os.remove(arts / "A.png")
+    after = art_snapshot(str(arts))
+
+    assert changed_art_files(before, after) == {"A.png", "B.png", "C.png"}
+
+    deck = _deck([{"name": "A", "art_path": None}, {"name": "B", "art_path": str(arts / "B.png")}, {"name": "X"}])
+    assert affected_card_indices(deck, deck, {"B.png"}) == {1}
+
+
+def test_missing_arts_folder_gives_empty_snapshot(tmp_path):
+    assert art_snapshot(str(tmp_path / "nope")) == {}
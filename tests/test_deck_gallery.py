@@ -0,0 +1,100 @@
+import importlib.machinery
+import json
+import os
+import subprocess
+import sys
+import textwrap
+from pathlib import Path
+
+import pytest
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+APP_DIR = PROJECT_ROOT / "app"
+
+# PathFinder шукає на диску: test_scene_exporter підміняє PySide6 у sys.modules.
+pytestmark = pytest.mark.skipif(
+    importlib.machinery.PathFinder.find_spec("PySide6") is None, reason="PySide6 not installed"
+)
+
+GALLERY_SCRIPT = """
+import json, sys, time
+app_dir, tmp_dir = sys.argv[1:3]
+sys.path.insert(0, app_dir)
+from PySide6.QtGui import QColor
+from PySide6.QtWidgets import QApplication
+app = QApplication([])
+from core.models import CardModel, DeckModel
+from widgets.card_scene_view import CardSceneView
+from widgets.deck_gallery import DeckGalleryView
+
+layout = {"meta": {"width": 744, "height": 1038, "dpi": 300}, "items": {
+    "title": {"type": "text", "text": "", "pos": {"x": 40, "y": 40}, "font": {"family": "DejaVu Sans", "size": 28},
+              "color": "#FFFFFF", "text_width": 600, "z": 6},
+    "panel": {"type": "rect", "pos": {"x": 20, "y": 600}, "size": {"w": 700, "h": 300}, "z": 1}}}
+with open(tmp_dir + "/layout.json", "w", encoding="utf-8") as fh:
+    json.dump(layout, fh)
+editor = CardSceneView(tmp_dir + "/layout.json")
+gallery = DeckGalleryView(editor)
+gallery.resize(300, 400)
+gallery.show()
+model = gallery.gallery_model
+
+
+def deck(changed=()):
+    cards = [CardModel(index=i, payload={"name": f"Card {i}" + ("!" if i in changed else "")}) for i in range(500)]
+    return DeckModel(name="deck", path="", deck_color="#3366CC", cards=cards)
+
+
+def settle():
+    # Розкладка QListView і перемальовування відкладені — чекаємо тиші.
+    quiet, deadline = 0, time.time() + 10
+    while quiet < 20 and time.time() < deadline:
+        app.processEvents()
+        busy = model._pending or model._render_timer.isActive() or model._sync_timer.isActive()
+        quiet = 0 if busy else quiet + 1
+        time.sleep(0.01)
+
+
+def rendered_since(step):
+    before = model.rendered
+    step()
+    settle()
+    return model.rendered - before
+
+
+result = {}
+result["first"] = rendered_since(lambda: model.set_deck(deck()))
+result["size"] = [model.thumbnail_size().width(), model.thumbnail_size().height()]
+result["repaint"] = rendered_since(gallery.viewport().update)
+result["card_changed"] = rendered_since(lambda: model.set_deck(deck(changed={0})))
+result["layout_item_changed"] = rendered_since(lambda: editor.update_text_color("title", QColor("#FF0000")))
+result["editor_preview"] = rendered_since(lambda: editor.apply_card_data({"name": "Preview"}, "#3366CC"))
+result["scrolled"] = rendered_since(gallery.scrollToBottom)
+result["cached"] = len(model.cache)
+image = model.index(model.rowCount() - 1, 0).data(1)
+result["last_is_thumbnail"] = image.pixelColor(image.width() // 2, image.height() // 2) != QColor(45, 60, 75)
+print(json.dumps(result))
+"""
+
+
+def test_gallery_renders_visible_thumbnails_and_invalidates_by_hash(tmp_path):
+    env = dict(os.environ, QT_QPA_PLATFORM="offscreen")
+    output = subprocess.run(
+        [sys.executable, "-c", textwrap.dedent(GALLERY_SCRIPT), str(APP_DIR), str(tmp_path)],
+        check=True,
+        env=env,
+        cwd=str(APP_DIR),
+        capture_output=True,
+        text=True,
+    ).stdout
+    result = json.loads(output.strip().splitlines()[-1])
+    visible = result["first"]
+    assert 0 < visible < 20  # лише видимі рядки з 500
+    assert result["size"] == [120, 167]
+    assert result["repaint"] == 0
+    assert result["card_changed"] == 1
+    assert result["layout_item_changed"] == visible
+    assert result["editor_preview"] == 0
+    assert 0 < result["scrolled"] < 20
+    assert result["cached"] == 2 * visible + 1 + result["scrolled"]
+    assert result["last_is_thumbnail"]
@@ -0,0 +1,120 @@
+import importlib.machinery
+import json
+import os
+import subprocess
+import sys
+import textwrap
+from pathlib import Path
+
+import pytest
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+from app.core.deck_index import DeckSearchIndex
+from app.core.models import CardColumns, CardModel, CompactCardList
+
+APP_DIR = PROJECT_ROOT / "app"
+
+PAYLOADS = [
+    {"name": "Storm Caller", "type": "unit", "cost_type": "mana", "atk": 4, "cost": 3},
+    {"name": "Stone Wall", "type": "building", "atk": 0, "def": 8, "cost": 2},
+    {"name": "Fireball", "type": "spell", "cost_type": "mana", "cost": 5, "rng": "X"},
+    {"name": "Storm Front", "type": "spell", "cost": 1},
+]
+
+
+def _cards(payloads=PAYLOADS):
+    return [CardModel(index=i, payload=dict(p)) for i, p in enumerate(payloads)]
+
+
+def _compact(payloads=PAYLOADS):
+    columns = CardColumns()
+    for payload in payloads:
+        columns.append(payload)
+    return CompactCardList(columns)
+
+
+@pytest.mark.parametrize("cards", [_cards, _compact])
+def test_filter_by_text_fields_and_stats(cards):
+    index = DeckSearchIndex(cards())
+    assert index.filter("") is None
+    assert list(index.filter("storm")) == [0, 3]
+    assert list(index.filter("STORM spell")) == [3]
+    assert list(index.filter("mana")) == [0, 2]
+    assert list(index.filter("type:spell")) == [2, 3]
+    assert list(index.filter("name:spell")) == []
+    assert list(index.filter("cost>=3")) == [0, 2]
+    assert list(index.filter("cost<3 atk=0")) == [1]
+    assert list(index.filter("def!=8")) == []  # картки без стату не порівнюються
+    assert list(index.filter("rng:x")) == [2]
+    assert list(index.filter("rng>x")) == []
+
+
+def test_extend_indexes_streamed_cards_and_drops_memo():
+    cards = _cards()
+    index = DeckSearchIndex(cards[:2])
+    assert list(index.filter("storm")) == [0]
+    index.extend(cards[2:])
+    assert len(index) == 4
+    assert list(index.filter("storm")) == [0, 3]
+
+
+MODEL_SCRIPT = """
+import json, sys
+app_dir = sys.argv[1]
+sys.path.insert(0, app_dir)
+from PySide6.QtWidgets import QApplication
+app = QApplication([])
+from core.models import CardModel, DeckModel
+from widgets.deck_list_model import DeckIndexRole, DeckListModel
+
+cards = [CardModel(index=i, payload={"name": f"Card {i}", "atk": i % 10}) for i in range(10_000)]
+deck = DeckModel(name="deck", path="", deck_color="#FFFFFF", cards=cards[:5_000])
+model = DeckListModel()
+inserted = []
+model.rowsInserted.connect(lambda parent, first, last: inserted.append([first, last]))
+model.set_deck(deck)
+result = {"rows": model.rowCount()}
+deck.cards.extend(cards[5_000:])
+model.cards_appended()
+result["appended"] = model.rowCount()
+result["inserted"] = inserted
+model.set_filter("atk>=9 card")
+result["filtered"] = model.rowCount()
+result["row_deck_index"] = [model.deck_index(0), model.index(1, 0).data(DeckIndexRole)]
+result["name"] = model.index(1, 0).data()
+result["row_of_9999"] = model.row_for_deck_index(9_999)
+result["row_of_filtered_out"] = model.row_for_deck_index(10)
+model.set_deck(DeckModel(name="deck", path="", deck_color="#FFFFFF", cards=cards[:20]))
+result["filter_kept"] = model.rowCount()
+model.set_filter("")
+result["unfiltered"] = [model.rowCount(), model.row_for_deck_index(10), model.deck_index(20)]
+print(json.dumps(result))
+"""
+
+
+# PathFinder шукає на диску: test_scene_exporter підміняє PySide6 у sys.modules.
+@pytest.mark.skipif(importlib.machinery.PathFinder.find_spec("PySide6") is None, reason="PySide6 not installed")
+def test_deck_list_model_maps_rows_to_deck_indices():
+    env = dict(os.environ, QT_QPA_PLATFORM="offscreen")
+    output = subprocess.run(
+        [sys.executable, "-c", textwrap.dedent(MODEL_SCRIPT), str(APP_DIR)],
+        check=True,
+        env=env,
+        cwd=str(APP_DIR),
+        capture_output=True,
+        text=True,
+    ).stdout
+    result = json.loads(output.strip().splitlines()[-1])
+    assert result["rows"] == 5_000
+    assert result["appended"] == 10_000
+    assert result["inserted"] == [[5_000, 9_999]]
+    assert result["filtered"] == 1_000
+    assert result["row_deck_index"] == [9, 19]
+    assert result["name"] == "Card 19"
+    assert result["row_of_9999"] == 999
+    assert result["row_of_filtered_out"] == -1
+    assert result["filter_kept"] == 2
+    assert result["unfiltered"] == [20, 10, -1]
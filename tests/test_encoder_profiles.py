@@ -0,0 +1,73 @@
+import sys
+from io import BytesIO
+from pathlib import Path
+
+import pytest
+from PIL import Image, ImageChops, ImageDraw
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+from app.core.encoder_profiles import PROFILES, format_report, get_profile, profile_report
+from app.core.export_pipeline import EncodeQueue
+
+
+def _card(seed=0):
+    image = Image.new("RGBA", (248, 346), (30, 40, 60, 255))
+    draw = ImageDraw.Draw(image)
+    for i in range(0, 248, 8):
+        draw.line((i, 0, 247 - i, 345), fill=((i * 3 + seed) % 256, 120, 200, 255), width=3)
+    draw.rectangle((20, 200, 228, 320), fill=(240, 230, 200, 200))
+    draw.text((30, 220), f"Storm Caller {seed}", fill=(0, 0, 0, 255))
+    return image
+
+
+def _decode(data):
+    with Image.open(BytesIO(data)) as image:
+        image.load()
+        return image
+
+
+def test_lossless_profiles_round_trip_pixels():
+    card = _card()
+    for name in ("default", "fast", "archival", "web"):
+        decoded = _decode(get_profile(name).encode(card)).convert("RGBA")
+        assert ImageChops.difference(decoded, card).getbbox() is None, name
+
+
+def test_profiles_trade_bytes_for_time():
+    card = _card()
+    sizes = {name: len(profile.encode(card, dpi=300)) for name, profile in PROFILES.items()}
+    assert sizes["archival"] <= sizes["default"] < sizes["fast"]
+    assert sizes["web_png"] < sizes["default"]
+
+    palette = _decode(PROFILES["web_png"].encode(card))
+    assert palette.mode == "P"
+    assert _decode(PROFILES["web"].encode(card)).format == "WEBP"
+    assert round(_decode(PROFILES["archival"].encode(card, dpi=300)).info["dpi"][0]) == 300
+
+
+def test_get_profile():
+    assert get_profile(None).name == "default" and get_profile(None).native
+    assert not get_profile("fast").native
+    assert get_profile(PROFILES["web"]).extension == ".webp"
+    with pytest.raises(ValueError):
+        get_profile("tiff")
+
+
+def test_parallel_encode_queue_and_report(tmp_path):
+    cards = [_card(seed) for seed in range(6)]
+    with EncodeQueue(workers=3, profile="fast") as encoder:
+        for i, card in enumerate(cards):
+            encoder.submit(card, str(tmp_path / f"{i}.png"))
+    assert encoder.written == 6
+    assert encoder.bytes_written == sum(path.stat().st_size for path in tmp_path.iterdir())
+    assert encoder.encode_seconds > 0
+
+    reports = profile_report(cards, ["fast", "archival"], workers=2)
+    assert [(r.profile, r.files, r.workers) for r in reports] == [("fast", 6, 2), ("archival", 6, 2)]
+    assert reports[0].bytes > reports[1].bytes
+    table = format_report(reports)
+    assert table.splitlines()[0].split() == ["profile", "files", "KiB/file", "ms/file", "workers"]
+    assert len(table.splitlines()) == 3
@@ -0,0 +1,83 @@
+import os
+import sys
+import threading
+import time
+from pathlib import Path
+
+import pytest
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+from app.core.export_pipeline import BufferPool, EncodeQueue
+
+
+class FakeImage:
+    def __init__(self, key=None, delay=0.0, ok=True):
+        self.key = key
+        self.delay = delay
+        self.ok = ok
+        self.saved = []
+
+    def save(self, path, fmt):
+        time.sleep(self.delay)
+        if not self.ok:
+            return False
+        with open(path, "wb") as fh:
+            fh.write(fmt.encode("ascii"))
+        self.saved.append(path)
+        return True
+
+
+def test_pool_reuses_buffers_per_key():
+    pool = BufferPool(FakeImage, maxsize=2)
+    first = pool.acquire((10, 10))
+    pool.release(first)
+    assert pool.acquire((10, 10)) is first
+    other = pool.acquire((20, 20))
+    assert other.key == (20, 20) and pool.created == 2
+
+    pool.release(other)
+    pool.clear()
+    assert pool.acquire((20, 20)) is not other
+
+
+def test_pool_blocks_until_a_buffer_is_released():
+    pool = BufferPool(FakeImage, maxsize=1)
+    held = pool.acquire("card")
+    acquired = []
+    waiter = threading.Thread(target=lambda: acquired.append(pool.acquire("card")))
+    waiter.start()
+    time.sleep(0.05)
+    assert acquired == []
+    pool.release(held)
+    waiter.join(timeout=1)
+    assert acquired == [held] and pool.created == 1
+
+
+def test_encode_queue_writes_in_background_and_returns_buffers(tmp_path):
+    pool = BufferPool(lambda key: FakeImage(delay=0.02), maxsize=3)
+    started = time.perf_counter()
+    with EncodeQueue(maxsize=2) as encoder:
+        for i in range(6):
+            image = pool.acquire("card")
+            encoder.submit(image, str(tmp_path / f"{i}.png"), done=pool.release)
+        queued_in = time.perf_counter() - started
+    assert encoder.written == 6
+    assert sorted(os.listdir(tmp_path)) == [f"{i}.png" for i in range(6)]
+    assert pool.created == 3
+    assert queued_in < 6 * 0.02  # рендер не чекав на кожен запис
+
+
+def test_encode_queue_reraises_write_errors_and_still_releases(tmp_path):
+    released = []
+    encoder = EncodeQueue()
+    encoder.submit(FakeImage(ok=False), str(tmp_path / "a.png"), done=released.append)
+    encoder.submit(FakeImage(), str(tmp_path / "b.png"), done=released.append)
+    with pytest.raises(OSError):
+        encoder.close()
+    assert len(released) == 2
+    assert not (tmp_path / "b.png").exists()
+    with pytest.raises(RuntimeError):
+        encoder.submit(FakeImage(), str(tmp_path / "c.png"))
@@ -0,0 +1,162 @@
+import os
+import sys
+import threading
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+from PIL import Image, ImageChops, ImageDraw, ImageStat
+
+from app.core.image_loader import ImageLoader, fit_size
+
+
+def _save(path: Path, size=(40, 20), color=(255, 0, 0)) -> Path:
+    Image.new("RGB", size, color=color).save(path)
+    return path
+
+
+def test_load_is_cached_until_file_changes(tmp_path):
+    path = _save(tmp_path / "art.png")
+    loader = ImageLoader()
+
+    first = loader.load(str(path))
+    assert first.mode == "RGBA"
+    assert loader.load(str(path)) is first
+    assert loader.stats().hits == 1
+
+    _save(path, color=(0, 0, 255))
+    os.utime(path, ns=(1, os.stat(path).st_mtime_ns + 1_000_000))
+    reloaded = loader.load(str(path))
+    assert reloaded is not first
+    assert reloaded.getpixel((0, 0)) == (0, 0, 255, 255)
+
+
+def test_missing_and_corrupt_files_return_none(tmp_path):
+    broken = tmp_path / "broken.png"
+    broken.write_bytes(b"not an image")
+    loader = ImageLoader()
+
+    assert loader.load(None) is None
+    assert loader.load(str(tmp_path / "missing.png")) is None
+    assert loader.load(str(broken)) is None
+    assert loader.load_scaled(str(broken), 10, 10) is None
+
+
+def test_empty_box_returns_none(tmp_path):
+    path = _save(tmp_path / "art.png")
+    for reduced in (False, True):
+        loader = ImageLoader(reduced_decode=reduced)
+        assert loader.load_scaled(str(path), 0, 10) is None
+        assert loader.load_scaled(str(path), 10, -1, keep_aspect=True) is None
+
+
+def test_scaled_variants_are_cached_separately(tmp_path):
+    path = _save(tmp_path / "art.png", size=(400, 200))
+    loader = ImageLoader()
+
+    exact = loader.load_scaled(str(path), 100, 100)
+    fitted = loader.load_scaled(str(path), 100, 100, keep_aspect=True)
+    assert exact.size == (100, 100)
+    assert fitted.size == (100, 50)
+    assert loader.load_scaled(str(path), 100, 100) is exact
+
+
+def test_scaled_miss_is_counted_once_and_stored_once(tmp_path):
+    path = _save(tmp_path / "art.png", size=(40, 20))
+    for reduced in (False, True):
+        loader = ImageLoader(reduced_decode=reduced)
+        loader.load_scaled(str(path), 20, 10)
+        stats = loader.stats()
+        assert (stats.misses, stats.hits) == (1, 0)
+        assert stats.bytes_used == 20 * 10 * 4 + (0 if reduced else 40 * 20 * 4)
+
+        # Той самий розмір — без ресайзу й без другого запису повного образу.
+        full = loader.load(str(path))
+        before = loader.stats()
+        assert loader.load_scaled(str(path), 40, 20) is full
+        assert loader.load_scaled(str(path), 80, 20, keep_aspect=True) is full
+        after = loader.stats()
+        assert (after.entries, after.bytes_used) == (before.entries, before.bytes_used)
+        assert (after.hits - before.hits, after.misses - before.misses) == (2, 0)
+
+
+def test_budget_evicts_least_recently_used(tmp_path):
+    paths = [_save(tmp_path / f"{i}.png", size=(10, 10)) for i in range(3)]
+    loader = ImageLoader(budget_bytes=2 * 10 * 10 * 4)
+
+    loader.load(str(paths[0]))
+    loader.load(str(paths[1]))
+    loader.load(str(paths[0]))
+    loader.load(str(paths[2]))
+
+    stats = loader.stats()
+    assert stats.evictions == 1
+    assert stats.entries == 2
+    assert stats.bytes_used <= stats.budget_bytes
+    misses = stats.misses
+    loader.load(str(paths[0]))
+    assert loader.stats().misses == misses
+
+
+def test_concurrent_loads_are_consistent(tmp_path):
+    path = _save(tmp_path / "art.png", size=(64, 64))
+    loader = ImageLoader()
+    results = []
+
+    def worker():
+        for _ in range(20):
+            results.append(loader.load_scaled(str(path), 32, 32).size)
+
+    threads = [threading.Thread(target=worker) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert results == [(32, 32)] * 80
+    assert loader.stats().bytes_used == 32 * 32 * 4
+
+
+def test_fit_size_matches_keep_aspect_ratio():
+    assert fit_size((2048, 1024), (520, 320)) == (520, 260)
+    assert fit_size((1000, 2000), (520, 320)) == (160, 320)
+
+
+def _detailed_image(size):
+    img = Image.radial_gradient("L").resize(size).convert("RGB")
+    draw = ImageDraw.Draw(img)
+    for x in range(0, size[0], 37):
+        draw.line([(x, 0), (size[0] - x, size[1])], fill=(200, 40, 90), width=3)
+    return img
+
+
+def _mean_abs_diff(a, b):
+    return sum(ImageStat.Stat(ImageChops.difference(a, b)).mean[:3]) / 3
+
+
+def test_reduced_decode_matches_full_decode_quality(tmp_path):
+    source = _detailed_image((2400, 1600))
+    for name in ("art.png", "art.jpg"):
+        path = tmp_path / name
+        source.save(path, quality=95)
+        full = ImageLoader(reduced_decode=False).load_scaled(str(path), 520, 320, keep_aspect=True)
+        reduced_loader = ImageLoader()
+        reduced = reduced_loader.load_scaled(str(path), 520, 320, keep_aspect=True)
+
+        assert reduced.size == full.size == (480, 320)
+        assert reduced.mode == "RGBA"
+        assert _mean_abs_diff(full, reduced) < 2.0
+        assert reduced_loader.stats().bytes_used == 480 * 320 * 4
+
+
+def test_reduced_decode_reuses_cached_full_image(tmp_path):
+    path = tmp_path / "art.png"
+    _detailed_image((800, 800)).save(path)
+    loader = ImageLoader()
+    full = loader.load(str(path))
+
+    scaled = loader.load_scaled(str(path), 100, 100)
+    assert scaled.size == (100, 100)
+    assert loader.load(str(path)) is full
@@ -0,0 +1,79 @@
+import sys
+from math import isclose
+from pathlib import Path
+
+import pytest
+from reportlab.lib.units import mm
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+from app.core.imposition import PAPER_SIZES, plan_imposition
+
+
+def test_picks_orientation_and_paper_with_most_cards():
+    # 63×88 мм на A4 з полями 10 мм: 3×3 книжково, 4×2 альбомно
+    layout = plan_imposition(63, 88, margin_mm=10)
+    assert (layout.paper, layout.orientation, layout.columns, layout.rows) == ("A4", "portrait", 3, 3)
+
+    # 40×62 мм + bleed 5: альбомна A4 вміщує 5×2 проти 3×3 книжкової
+    layout = plan_imposition(40, 62, bleed_mm=5)
+    assert (layout.orientation, layout.per_sheet) == ("landscape", 10)
+    assert layout.page_size == PAPER_SIZES["A4"][::-1]
+
+    layout = plan_imposition(63, 88, margin_mm=10, paper="auto")
+    # SRA3 вміщує стільки ж, але за рівності перемагає менший папір
+    assert (layout.paper, layout.orientation, layout.per_sheet) == ("A3", "landscape", 18)
+    assert (plan_imposition(70, 100, margin_mm=10, paper="auto").paper) == "SRA3"
+    assert plan_imposition(63, 88, margin_mm=10, paper=["Letter", "A4"]).paper == "A4"
+    letter = plan_imposition(63, 88, margin_mm=10, paper="Letter")
+    assert (letter.orientation, letter.per_sheet) == ("landscape", 8)
+    assert plan_imposition(1000, 62).columns == 1
+    with pytest.raises(ValueError):
+        plan_imposition(63, 88, paper="B5")
+
+
+def test_grid_is_centred_and_cut_lines_are_shared_without_gutter():
+    layout = plan_imposition(63, 88, bleed_mm=3, margin_mm=10, gutter_mm=0)
+    left, bottom, width, height = layout.grid_box()
+    page_w, page_h = layout.page_size
+    assert isclose(left, page_w - left - width) and isclose(bottom, page_h - bottom - height)
+
+    xs, ys = layout.cut_positions()
+    assert (len(xs), len(ys)) == (layout.columns + 1, layout.rows + 1)
+    assert len(layout.cut_lines()) == len(xs) + len(ys)
+    assert len(layout.crop_marks()) == 2 * (len(xs) + len(ys))
+    # мітки починаються за межами bleed
+    assert layout.crop_marks()[0][1] > bottom + height + 3 * mm
+
+    # внутрішні краї обрізані до лінії різу, зовнішні зберігають bleed
+    x, y, w, h = layout.clip_rect(0)
+    trim = layout.trim_rect(0)
+    assert isclose(x, trim[0] - 3 * mm) and isclose(x + w, trim[0] + trim[2])
+    assert isclose(y, trim[1]) and isclose(y + h, trim[1] + trim[3] + 3 * mm)
+
+    default = plan_imposition(63, 88, bleed_mm=3, margin_mm=10)
+    assert default.clip_rect(0) is None
+    assert len(default.cut_positions()[0]) == 2 * default.columns
+
+
+def test_back_slots_are_mirrored_for_duplex():
+    layout = plan_imposition(63, 88, margin_mm=10, orientation="portrait", gutter_mm=4)
+    page_w, page_h = layout.page_size
+    front = layout.trim_rect(0)
+    long_back = layout.trim_rect(0, "long")
+    short_back = layout.trim_rect(0, "short")
+    # на звороті перша картка опиняється під тією ж точкою аркуша
+    assert isclose(long_back[0], page_w - front[0] - front[2]) and isclose(long_back[1], front[1])
+    assert isclose(short_back[1], page_h - front[1] - front[3]) and isclose(short_back[0], front[0])
+    assert isclose(layout.trim_rect(layout.columns - 1, "long")[0], layout.trim_rect(0)[0])
+
+    # альбомний аркуш: довгий край горизонтальний, тож "long" дзеркалить по вертикалі
+    landscape = plan_imposition(40, 62, bleed_mm=5, paper="A4", orientation="landscape")
+    assert (landscape.columns, landscape.rows) == (5, 2)
+    front = landscape.trim_rect(0)
+    x, y, _, _ = landscape.trim_rect(0, "long")
+    assert isclose(x, front[0]) and isclose(x, 28.5 * mm) and isclose(y, 38 * mm)
+    assert isclose(landscape.trim_rect(0, "short")[0], 228.5 * mm)
+    assert isclose(landscape.trim_rect(0, "short")[1], front[1])
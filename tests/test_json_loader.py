@@ -0,0 +1,149 @@
+import io
+import json
+import sys
+from pathlib import Path
+
+import pytest
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+from app.core.json_loader import JSONLoader, _DeckStreamReader
+from app.core.models import CompactCardModel
+
+
+def _write_deck(directory: Path, cards, **extra) -> Path:
+    decks_dir = directory / "decks"
+    decks_dir.mkdir(parents=True, exist_ok=True)
+    deck = {
+        "deck_color": "#7B1F1F",
+        "prompts": {"unit": "{name}, soldier", "tactic": "Diagram"},
+        "cards": cards,
+    }
+    deck.update(extra)
+    path = decks_dir / "deck.json"
+    path.write_text(json.dumps(deck, ensure_ascii=False), encoding="utf-8")
+    return path
+
+
+CARDS = [
+    {"name": "Десантник", "type": "unit", "cost": 1, "cost_type": "BF", "atk": 2, "def": 1, "stb": 3, "init": 3, "rng": 1, "move": 1},
+    {"name": "Маневр", "type": "tactic", "cost": 2, "cost_type": "CI", "description": "Draw a card"},
+    {"name": "Дивний", "type": "unit", "atk": "X", "def": 1.5, "move": True},
+]
+
+
+def test_compact_deck_matches_regular_payloads(tmp_path):
+    path = _write_deck(tmp_path, CARDS, version=2)
+    regular = JSONLoader(str(path)).load()
+    compact = JSONLoader(str(path)).load(compact=True)
+
+    assert len(compact) == len(regular)
+    assert compact.metadata == {"version": 2}
+    for expected, card in zip(regular.cards, compact.cards):
+        assert isinstance(card, CompactCardModel)
+        assert card.name == expected.name
+        assert card.payload == expected.payload
+        for key in ("name", "type", "cost", "atk", "def", "move", "description", "prompt", "deck_color"):
+            assert card.get(key) == expected.get(key)
+
+
+def test_compact_card_item_access(tmp_path):
+    path = _write_deck(tmp_path, CARDS)
+    deck = JSONLoader(str(path)).load(compact=True)
+
+    first = deck.card_at(0)
+    assert first["atk"] == 2
+    assert first["prompt"] == "Десантник, soldier"
+    assert first.get("description", "-") == "-"
+    with pytest.raises(KeyError):
+        first["description"]
+    assert deck.cards[-1]["atk"] == "X"
+    assert deck.card_at(5) is None
+    assert [card.index for card in deck] == [0, 1, 2]
+
+
+def test_compact_deck_interns_repeated_strings(tmp_path):
+    cards = [{"name": f"Card {i}", "type": "unit", "cost_type": "BF"} for i in range(3)]
+    path = _write_deck(tmp_path, cards)
+    columns = JSONLoader(str(path)).load(compact=True).cards.columns
+
+    assert columns.types[0] is columns.types[2]
+    assert columns.cost_types[0] is columns.cost_types[1]
+
+
+@pytest.mark.parametrize("chunk_size", [1, 7, 4096])
+def test_stream_yields_same_cards_as_load(tmp_path, chunk_size):
+    cards = CARDS + [{"name": f"Gen {i}", "type": "unit", "atk": 1234567 + i} for i in range(50)]
+    path = _write_deck(tmp_path, cards)
+    expected = JSONLoader(str(path)).load()
+
+    deck, stream = JSONLoader(str(path)).open_stream(chunk_size=chunk_size)
+    assert deck.cards == []
+    assert deck.deck_color == "#7B1F1F"
+
+    streamed = list(stream)
+    assert [card.index for card in streamed] == list(range(len(cards)))
+    assert [card.payload for card in streamed] == [card.payload for card in expected.cards]
+
+
+def test_stream_is_lazy_and_applies_trailing_keys(tmp_path):
+    path = _write_deck(tmp_path, CARDS)
+    data = json.loads(path.read_text(encoding="utf-8"))
+    data["version"] = 3
+    path.write_text(json.dumps(data, ensure_ascii=False), encoding="utf-8")
+
+    deck, stream = JSONLoader(str(path)).open_stream(chunk_size=16)
+    first = next(stream)
+    assert first.name == "Десантник"
+    assert deck.metadata == {}
+
+    rest = list(stream)
+    assert len(rest) == len(CARDS) - 1
+    assert deck.metadata == {"version": 3}
+
+
+def test_stream_without_cards_raises(tmp_path):
+    path = tmp_path / "deck.json"
+    path.write_text('{"deck_color": "#FFFFFF"}', encoding="utf-8")
+    with pytest.raises(ValueError):
+        JSONLoader(str(path)).open_stream()
+
+
+def test_stream_reports_truncated_file(tmp_path):
+    path = _write_deck(tmp_path, CARDS)
+    text = path.read_text(encoding="utf-8")
+    path.write_text(text[: len(text) // 2], encoding="utf-8")
+
+    _deck, stream = JSONLoader(str(path)).open_stream(chunk_size=32)
+    with pytest.raises(ValueError):
+        list(stream)
+
+
+class _CountingReader(io.StringIO):
+    def __init__(self, text):
+        super().__init__(text)
+        self.reads = 0
+
+    def read(self, size=-1):
+        self.reads += 1
+        return super().read(size)
+
+
+def test_stream_fails_at_malformed_card_without_reading_the_rest():
+    padding = ", ".join(json.dumps({"name": f"Gen {i}"}) for i in range(2000))
+    fh = _CountingReader('{"cards": [{"name": "A" "type": "unit"}, ' + padding + "]}")
+    reader = _DeckStreamReader(fh, chunk_size=64)
+    reader.read_header()
+    with pytest.raises(ValueError):
+        list(reader.iter_cards())
+    assert fh.tell() < 1024
+
+
+def test_stream_reads_long_card_in_growing_chunks():
+    fh = _CountingReader(json.dumps({"cards": [{"name": "x" * 100_000}]}))
+    reader = _DeckStreamReader(fh, chunk_size=16)
+    reader.read_header()
+    assert [card["name"] for card in reader.iter_cards()] == ["x" * 100_000]
+    assert fh.reads < 40
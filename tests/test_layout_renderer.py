@@ -0,0 +1,235 @@
+import importlib.util
+import json
+import os
+import subprocess
+import sys
+import textwrap
+from pathlib import Path
+
+import pytest
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+from PIL import Image, ImageChops, ImageDraw, ImageStat
+
+from app.core.art_cache import ArtDerivativeCache
+from app.core.image_loader import ImageLoader
+from app.core.renderer import DEFAULT_ART_COLOR, LayoutRenderer, render_cards_parallel
+
+APP_DIR = PROJECT_ROOT / "app"
+FONT_PATH = APP_DIR / "fonts" / "LS_font.ttf"
+FONT_FAMILY = "UAF Sans"  # внутрішня назва сімейства LS_font.ttf
+
+CARD = {
+    "name": "Storm Caller",
+    "type": "unit",
+    "description": "Deals two damage to every enemy unit in range and then draws a card for each unit destroyed this way.",
+    "atk": 4,
+}
+
+
+@pytest.fixture()
+def scene(tmp_path):
+    frame = Image.new("RGBA", (400, 620), (0, 0, 0, 0))
+    ImageDraw.Draw(frame).rectangle((10, 10, 389, 609), outline=(200, 180, 90, 255), width=8)
+    frame.save(tmp_path / "frame.png")
+
+    art = Image.new("RGB", (800, 400), (30, 120, 200))
+    ImageDraw.Draw(art).ellipse((100, 50, 700, 350), fill=(240, 200, 40))
+    art.save(tmp_path / "art.png")
+
+    text = {"type": "text", "text": "", "color": "#FFFFFF", "z": 6}
+    layout = {
+        "meta": {"width": 744, "height": 1038, "dpi": 300},
+        "items": {
+            "panel": {
+                "type": "rect",
+                "pos": {"x": 40, "y": 500},
+                "size": {"w": 660, "h": 300},
+                "pen": {"color": "#FF8800", "width": 3},
+                "brush": {"color": "#203040"},
+                "opacity": 0.8,
+                "z": 0,
+            },
+            "artwork": {
+                "type": "image",
+                "pos": {"x": 0, "y": 0},
+                "size": {"w": 520, "h": 320},
+                "z": 1,
+                "bindings": {"relative": True, "anchor": {"x": 0.15, "y": 0.14}},
+            },
+            "title": dict(text, pos={"x": 60, "y": 40}, font={"family": FONT_FAMILY, "size": 32}, text_width=520),
+            "description": dict(
+                text, pos={"x": 60, "y": 520}, font={"family": FONT_FAMILY, "size": 18},
+                color="#EEDDCC", text_width=520, opacity=0.9,
+            ),
+            "stat_atk": dict(
+                text, pos={"x": 80, "y": 840}, font={"family": FONT_FAMILY, "size": 20},
+                shadow={"color": "#000000", "offset": [3, 3], "blur": 6},
+            ),
+        },
+    }
+    (tmp_path / "layout.json").write_text(json.dumps(layout), encoding="utf-8")
+    card = dict(CARD, art_path=str(tmp_path / "art.png"))
+    return tmp_path, card
+
+
+def _renderer(tmp_path, **kwargs):
+    return LayoutRenderer(
+        str(tmp_path / "layout.json"),
+        str(tmp_path / "frame.png"),
+        fonts_folder=str(APP_DIR / "fonts"),
+        image_loader=ImageLoader(),
+        art_cache=ArtDerivativeCache(cache_dir=str(tmp_path / "cache"), image_loader=ImageLoader()),
+        **kwargs,
+    )
+
+
+def test_module_imports_without_qt():
+    code = (
+        "import sys; sys.path.insert(0, sys.argv[1]); import core.renderer; "
+        "assert not [m for m in sys.modules if m.startswith('PySide6')]"
+    )
+    subprocess.run([sys.executable, "-c", code, str(APP_DIR)], check=True)
+
+
+def test_renders_items_in_plan_order(scene):
+    tmp_path, card = scene
+    image = _renderer(tmp_path).render_card(card, "#3366CC")
+    assert image.size == (744, 1038)
+    assert image.getpixel((0, 500)) == (51, 102, 204, 255)  # рамка картки кольору колоди
+    assert image.getpixel((372, 280))[:3] == (240, 200, 40)  # арт вписано у слот
+    panel = image.getpixel((600, 780))
+    assert panel[3] == round(255 * 0.8) and panel[:3] == (32, 48, 64)
+
+    without_art = _renderer(tmp_path).render_card(dict(card, art_path=None), "#3366CC")
+    assert without_art.getpixel((372, 280)) == DEFAULT_ART_COLOR
+
+
+def test_dpi_and_bleed_scale_output(scene):
+    tmp_path, card = scene
+    image = _renderer(tmp_path, dpi=600, bleed=20).render_card(card, "#3366CC")
+    assert image.size == (744 * 2 + 40, 1038 * 2 + 40)
+    assert image.getpixel((20 + 744, 20 + 560))[:3] == (240, 200, 40)
+
+
+def test_parallel_render_matches_single_process(scene):
+    tmp_path, card = scene
+    jobs = [(dict(card, name=f"Card {i}"), "#AA3300", str(tmp_path / "out" / f"{i}.png")) for i in range(3)]
+    args = (str(tmp_path / "layout.json"), jobs, str(tmp_path / "frame.png"), str(APP_DIR / "fonts"))
+    paths = render_cards_parallel(*args, workers=2)
+    assert paths == [job[2] for job in jobs]
+    expected = _renderer(tmp_path).render_card(jobs[1][0], "#AA3300")
+    with Image.open(paths[1]) as written:
+        assert written.info["dpi"] == pytest.approx((300, 300), abs=0.01)
+        assert ImageChops.difference(written.convert("RGBA"), expected).getbbox(alpha_only=False) is None
+
+
+QT_EXPORT_SCRIPT = textwrap.dedent(
+    """
+    import json, sys
+    app_dir, tmp_dir, font_path = sys.argv[1:4]
+    sys.path.insert(0, app_dir)
+    from PySide6.QtGui import QFontDatabase
+    from PySide6.QtWidgets import QApplication
+    app = QApplication([])
+    QFontDatabase.addApplicationFont(font_path)
+    from core.qt_images import load_pixmap
+    from widgets.card_scene_view import CardSceneView
+    view = CardSceneView(tmp_dir + "/layout.json")
+    view.set_frame_pixmap(load_pixmap(tmp_dir + "/frame.png"))
+    with open(tmp_dir + "/card.json", encoding="utf-8") as fh:
+        view.apply_card_data(json.load(fh), "#3366CC")
+    view.export_to_png(tmp_dir + "/qt.png")
+    """
+)
+
+
+@pytest.mark.skipif(importlib.util.find_spec("PySide6") is None, reason="PySide6 not installed")
+def test_pixel_parity_with_qt_export(scene):
+    tmp_path, card = scene
+    (tmp_path / "card.json").write_text(json.dumps(card), encoding="utf-8")
+    env = dict(os.environ, QT_QPA_PLATFORM="offscreen")
+    subprocess.run(
+        [sys.executable, "-c", QT_EXPORT_SCRIPT, str(APP_DIR), str(tmp_path), str(FONT_PATH)],
+        check=True,
+        env=env,
+        cwd=str(APP_DIR),
+    )
+    with Image.open(tmp_path / "qt.png") as exported:
+        qt_image = exported.convert("RGBA")
+    pil_image = _renderer(tmp_path).render_card(card, "#3366CC")
+
+    assert qt_image.size == pil_image.size
+    diff = ImageChops.difference(qt_image, pil_image)
+    # Растеризація гліфів у Qt і FreeType/Pillow трохи різниться (хінтинг,
+    # кернінг), тож допускаємо малу середню різницю й ~1% розбіжних пікселів.
+    assert max(ImageStat.Stat(diff).mean) < 4.0
+    strong = diff.convert("L").point(lambda v: 255 if v > 64 else 0)
+    assert ImageStat.Stat(strong).mean[0] / 255 < 0.03
+    # Геометрія без тексту має збігатися точно.
+    for box in [(112, 146, 632, 466), (0, 0, 744, 2), (300, 650, 700, 790)]:
+        region = ImageChops.difference(qt_image.crop(box), pil_image.crop(box))
+        assert max(ImageStat.Stat(region).mean) < 1.5, box
+
+
+def test_static_runs_are_rasterized_once_per_deck_color(scene):
+    tmp_path, card = scene
+    layout = json.loads((tmp_path / "layout.json").read_text(encoding="utf-8"))
+    layout["items"]["badge"] = {
+        "type": "rect", "pos": {"x": 600, "y": 20}, "size": {"w": 100, "h": 40},
+        "brush": {"color": "#AA0000"}, "z": 9,
+    }
+    (tmp_path / "layout.json").write_text(json.dumps(layout), encoding="utf-8")
+    renderer = _renderer(tmp_path)
+
+    def _name(entry):
+        return entry.item_id if hasattr(entry, "item_id") else entry.__name__
+
+    steps = [(static, [_name(e) for e in payload] if static else payload.item_id) for static, payload in renderer._steps]
+    assert steps == [
+        (True, ["_draw_border", "_draw_frame", "panel"]),
+        (False, "artwork"),
+        (False, "title"),
+        (False, "description"),
+        (False, "stat_atk"),
+        (True, ["badge"]),
+    ]
+
+    frame_loads = []
+    load = renderer.images.load
+    renderer.images.load = lambda path: (frame_loads.append(path), load(path))[1]
+    first = renderer.render_card(card, "#3366CC")
+    second = renderer.render_card(dict(card, name="Other"), "#3366CC")
+    assert len(frame_loads) == 1
+    renderer.render_card(card, "#00AA00")
+    assert len(frame_loads) == 2
+
+    assert first.getpixel((650, 40))[:3] == (170, 0, 0)  # статичний шар над динамічними
+    assert ImageChops.difference(first, second).getbbox(alpha_only=False) is not None
+    fresh = _renderer(tmp_path).render_card(card, "#3366CC")
+    assert ImageChops.difference(first, fresh).getbbox(alpha_only=False) is None
+
+
+def test_card_renderer_recolors_frame_once_per_color(tmp_path, monkeypatch):
+    from app.core.renderer import CardRenderer
+
+    Image.new("RGBA", (60, 90), (255, 255, 255, 255)).save(tmp_path / "frame.png")
+    renderer = CardRenderer(
+        str(APP_DIR / "template.json"), str(tmp_path / "frame.png"), str(APP_DIR / "fonts"),
+        image_loader=ImageLoader(),
+        art_cache=ArtDerivativeCache(cache_dir=str(tmp_path / "cache"), image_loader=ImageLoader()),
+    )
+    calls = []
+    original = renderer.recolor_frame
+    monkeypatch.setattr(renderer, "recolor_frame", lambda img, color: (calls.append(color), original(img, color))[1])
+
+    a = renderer.render_card({"name": "A", "type": "unit", "atk": 1}, "#102030")
+    b = renderer.render_card({"name": "B", "type": "spell"}, "#102030")
+    assert calls == [(16, 32, 48)]
+    assert a.getpixel((5, 400)) == (16, 32, 48, 255)
+    assert ImageChops.difference(a, b).getbbox(alpha_only=False) is not None
+    renderer.render_card({"name": "A"}, "#FFFFFF")
+    assert len(calls) == 2
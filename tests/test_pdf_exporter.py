@@ -1,8 +1,11 @@
 import os
 import sys
 from pathlib import Path
+import re
 from math import isclose
 
+import pytest
+
 PROJECT_ROOT = Path(__file__).resolve().parents[1]
 if str(PROJECT_ROOT) not in sys.path:
     sys.path.insert(0, str(PROJECT_ROOT))
@@ -93,3 +96,83 @@ def test_export_pdf_respects_bleed_dpi_and_order(tmp_path, monkeypatch):
     assert isclose(first_draw["height"], expected_height)
 
     assert saved_dpis == [(200, 200), (200, 200)]
+
+
+def test_export_pdf_adds_mirrored_back_pages_and_marks(tmp_path):
+    cards_dir = tmp_path / "cards"
+    for i in range(5):
+        _create_dummy_card_image(cards_dir, f"card{i}.png")
+    back_path = _create_dummy_card_image(tmp_path, "back.png")
+
+    exporter = PDFExporter(margin_mm=5)
+    output_pdf = exporter.export_pdf(
+        str(cards_dir),
+        str(tmp_path / "output.pdf"),
+        card_width_mm=63,
+        card_height_mm=88,
+        bleed_mm=3,
+        paper="A4",
+        orientation="portrait",
+        gutter_mm=0,
+        crop_marks=True,
+        cut_lines=True,
+        back_path=str(back_path),
+    )
+
+    layout = exporter.last_imposition
+    assert (layout.columns, layout.rows) == (3, 3)
+    with open(output_pdf, "rb") as pdf_file:
+        pdf_bytes = pdf_file.read()
+    # одна сторінка карток і одна зворотів
+    assert len(re.findall(rb"/Type /Page\b(?!s)", pdf_bytes)) == 2
+    assert not list(cards_dir.glob("*_tmp_for_pdf.png"))
+
+
+def _page_contents(pdf_path):
+    from pypdf import PdfReader
+
+    pages = []
+    for page in PdfReader(str(pdf_path)).pages:
+        xobjects = page["/Resources"].get("/XObject", {})
+        images = sorted((name, xobjects[name].get_object().get_data()) for name in xobjects)
+        pages.append((page.get_contents().get_data(), images, page.mediabox))
+    return pages
+
+
+@pytest.mark.skipif(pdf_exporter.PdfWriter is None, reason="pypdf not installed")
+def test_parallel_export_matches_serial_and_is_deterministic(tmp_path):
+    cards_dir = tmp_path / "cards"
+    cards_dir.mkdir()
+    for i in range(20):
+        Image.new("RGB", (60, 90), color=(i * 12, 80, 160)).save(cards_dir / f"card{i:02d}.png")
+    back_path = _create_dummy_card_image(tmp_path, "back.png")
+    options = dict(card_width_mm=63, card_height_mm=88, back_path=str(back_path), crop_marks=True)
+
+    serial = PDFExporter().export_pdf(str(cards_dir), str(tmp_path / "serial.pdf"), **options)
+    parallel = PDFExporter().export_pdf(str(cards_dir), str(tmp_path / "parallel.pdf"), workers=3, **options)
+    again = PDFExporter().export_pdf(str(cards_dir), str(tmp_path / "again.pdf"), workers=3, **options)
+
+    serial_pages = _page_contents(serial)
+    assert len(serial_pages) == 10  # 5 аркушів по 4 картки + звороти
+    assert _page_contents(parallel) == serial_pages
+    assert Path(parallel).read_bytes() == Path(again).read_bytes()
+    # спільний зворот вбудовано один раз
+    assert Path(parallel).read_bytes().count(b"/Subtype /Image") == Path(serial).read_bytes().count(b"/Subtype /Image")
+    assert sorted(p.name for p in tmp_path.iterdir()) == ["again.pdf", "back.png", "cards", "parallel.pdf", "serial.pdf"]
+
+
+def test_parallel_export_falls_back_to_serial_without_pypdf(tmp_path, monkeypatch):
+    cards_dir = tmp_path / "cards"
+    for i in range(8):
+        _create_dummy_card_image(cards_dir, f"card{i}.png")
+    monkeypatch.setattr(pdf_exporter, "PdfWriter", None)
+    monkeypatch.setattr(pdf_exporter, "ProcessPoolExecutor", None)  # процеси не запускаються
+
+    exporter = PDFExporter()
+    output_pdf = exporter.export_pdf(
+        str(cards_dir), str(tmp_path / "output.pdf"), card_width_mm=100, card_height_mm=120, workers=4
+    )
+
+    assert exporter.last_imposition.per_sheet == 2
+    with open(output_pdf, "rb") as pdf_file:
+        assert len(re.findall(rb"/Type /Page\b(?!s)", pdf_file.read())) == 4
@@ -0,0 +1,114 @@
+import importlib.machinery
+import json
+import os
+import subprocess
+import sys
+import textwrap
+from pathlib import Path
+
+import pytest
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+APP_DIR = PROJECT_ROOT / "app"
+FONT_PATH = APP_DIR / "fonts" / "LS_font.ttf"
+
+# PathFinder шукає на диску: test_scene_exporter підміняє PySide6 у sys.modules.
+pytestmark = pytest.mark.skipif(
+    importlib.machinery.PathFinder.find_spec("PySide6") is None, reason="PySide6 not installed"
+)
+
+# Сцена з тінню на кешованому растрі проти живого QGraphicsDropShadowEffect.
+SHADOW_SCRIPT = textwrap.dedent(
+    """
+    import json, sys
+    app_dir, tmp_dir, font_path = sys.argv[1:4]
+    sys.path.insert(0, app_dir)
+    from PySide6.QtCore import QRectF, Qt
+    from PySide6.QtGui import QColor, QFontDatabase, QImage, QPainter
+    from PySide6.QtWidgets import QApplication, QGraphicsDropShadowEffect, QGraphicsItem, QGraphicsScene, QGraphicsTextItem
+    app = QApplication([])
+    QFontDatabase.addApplicationFont(font_path)
+    from core.qt_shadows import get_shadow_cache
+    from widgets.card_scene_view import CardSceneView
+
+    items = {
+        "title": {"pos": {"x": 60, "y": 40}, "size": 32, "opacity": 1.0,
+                  "shadow": {"color": "#CC000000", "offset": [0, 0], "blur": 8}},
+        "stat_atk": {"pos": {"x": 80.5, "y": 300}, "size": 20, "opacity": 0.8,
+                     "shadow": {"color": "#FF0000", "offset": [3, -2], "blur": 6}},
+    }
+    layout = {"meta": {"width": 400, "height": 400, "dpi": 300}, "items": {}}
+    for item_id, cfg in items.items():
+        layout["items"][item_id] = {
+            "type": "text", "text": "", "color": "#FFFFFF", "z": 6, "text_width": 300,
+            "pos": cfg["pos"], "font": {"family": "UAF Sans", "size": cfg["size"]},
+            "opacity": cfg["opacity"], "shadow": cfg["shadow"],
+        }
+    with open(tmp_dir + "/layout.json", "w", encoding="utf-8") as fh:
+        json.dump(layout, fh)
+
+    def scene_image(scene):
+        image = QImage(400, 400, QImage.Format_ARGB32_Premultiplied)
+        image.fill(Qt.transparent)
+        painter = QPainter(image)
+        scene.render(painter, QRectF(0, 0, 400, 400), QRectF(0, 0, 400, 400))
+        painter.end()
+        return image
+
+    card = {"name": "Storm Caller", "atk": 4, "type": "unit"}
+    view = CardSceneView(tmp_dir + "/layout.json")
+    view.set_item_cache_mode(QGraphicsItem.NoCache)  # сцена рендериться напряму, як при експорті
+    view.apply_card_data(card, "#3366CC")
+    for item in view.scene_items.values():
+        item.setSelected(False)
+    view._card_rect_item.setVisible(False)
+    view._frame_item.setVisible(False)
+    cached = scene_image(view._scene)
+    misses = get_shadow_cache().misses
+    scene_image(view._scene)
+    repaint_misses = get_shadow_cache().misses - misses
+
+    reference = QGraphicsScene()
+    for item_id, cfg in items.items():
+        source = view.scene_items[item_id]
+        item = QGraphicsTextItem(source.toPlainText())
+        item.setFont(source.font())
+        item.setDefaultTextColor(QColor("#FFFFFF"))
+        item.setTextWidth(300)
+        item.setPos(cfg["pos"]["x"], cfg["pos"]["y"])
+        item.setOpacity(cfg["opacity"])
+        effect = QGraphicsDropShadowEffect()
+        effect.setColor(QColor(cfg["shadow"]["color"]))
+        effect.setOffset(*cfg["shadow"]["offset"])
+        effect.setBlurRadius(cfg["shadow"]["blur"])
+        item.setGraphicsEffect(effect)
+        reference.addItem(item)
+    expected = scene_image(reference)
+
+    cached.save(tmp_dir + "/cached.png")
+    expected.save(tmp_dir + "/expected.png")
+    print(json.dumps({"repaint_misses": repaint_misses}))
+    """
+)
+
+
+def test_cached_shadow_matches_drop_shadow_effect(tmp_path):
+    from PIL import Image, ImageChops, ImageStat
+
+    env = dict(os.environ, QT_QPA_PLATFORM="offscreen")
+    output = subprocess.run(
+        [sys.executable, "-c", SHADOW_SCRIPT, str(APP_DIR), str(tmp_path), str(FONT_PATH)],
+        check=True,
+        env=env,
+        cwd=str(APP_DIR),
+        capture_output=True,
+        text=True,
+    ).stdout
+    result = json.loads(output.strip().splitlines()[-1])
+    assert result["repaint_misses"] == 0
+
+    with Image.open(tmp_path / "cached.png") as cached, Image.open(tmp_path / "expected.png") as expected:
+        assert cached.convert("RGBA").getbbox() is not None
+        diff = ImageChops.difference(cached.convert("RGBA"), expected.convert("RGBA"))
+    assert max(ImageStat.Stat(diff).mean) < 0.1
+    assert max(high for _, high in ImageStat.Stat(diff).extrema) <= 32
@@ -0,0 +1,88 @@
+import json
+import sys
+from dataclasses import FrozenInstanceError
+from pathlib import Path
+
+import pytest
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+from app.core.render_plan import (
+    TEXT_POINT_DPI,
+    compile_layout,
+    compile_mm_template,
+    parse_color,
+    resolve_font_file,
+)
+
+APP_DIR = PROJECT_ROOT / "app"
+
+
+def _layout():
+    return json.loads((APP_DIR / "editor" / "template_layout.json").read_text(encoding="utf-8"))
+
+
+def test_layout_plan_resolves_geometry_order_and_bindings():
+    plan = compile_layout(_layout())
+    assert (plan.width, plan.height, plan.dpi) == (744, 1038, 300)
+
+    art = plan.item("artwork")
+    assert art.kind == "image"
+    assert (art.x, art.y) == pytest.approx((0.15 * 744, 0.14 * 1038))
+    assert (art.width, art.height) == (520, 320)
+    assert [item.z for item in plan.items] == sorted(item.z for item in plan.items)
+
+    title = plan.item("title")
+    assert title.font.bold and title.font.pixel_size == pytest.approx(32 * TEXT_POINT_DPI / 72)
+    assert title.text_width == 520
+
+    with pytest.raises(FrozenInstanceError):
+        title.x = 0
+
+
+def test_plan_scales_with_dpi_and_bleed():
+    base = compile_layout(_layout())
+    plan = compile_layout(_layout(), dpi=600, bleed=10)
+    assert (plan.width, plan.height) == (744 * 2 + 20, 1038 * 2 + 20)
+    cost, base_cost = plan.item("cost"), base.item("cost")
+    assert (cost.x, cost.y) == (base_cost.x * 2 + 10, base_cost.y * 2 + 10)
+    assert cost.font.pixel_size == pytest.approx(base_cost.font.pixel_size * 2)
+
+
+def test_bind_substitutes_card_data():
+    plan = compile_layout(_layout())
+    card = {"name": "Hero", "type": "unit", "text": "Strikes twice", "atk": 0, "art_path": "/a.png"}
+    values = {item.item_id: value for item, value in plan.bind(card)}
+    assert values["title"] == "Hero"
+    assert values["type"] == "UNIT"
+    assert values["description"] == "Strikes twice"
+    assert values["stat_atk"] == "ATK 0"
+    assert values["stat_def"] == "DEF -"
+    assert values["cost"] is None and values["cost_type"] is None
+    assert values["artwork"] == "/a.png"
+
+
+def test_mm_template_plan_matches_card_renderer_geometry():
+    template = json.loads((APP_DIR / "template.json").read_text(encoding="utf-8"))
+    plan = compile_mm_template(template, dpi=300, bleed_mm=3, fonts_dir=str(APP_DIR / "fonts"))
+    assert (plan.width, plan.height) == (543, 803)
+    art = plan.item("artwork")
+    assert (art.x, art.y, art.width, art.height) == (70, 106, 401, 354)
+    assert plan.item("title").font.file.endswith("LS_font.ttf")
+
+    spell = {item.item_id for item, _ in plan.bind({"name": "Bolt", "type": "spell"})}
+    assert "stat_atk" not in spell and "title" in spell
+    unit = dict(plan.bind({"name": "Hero", "type": "unit", "atk": 3}))
+    assert unit[plan.item("stat_atk")] == "ATK: 3"
+
+
+def test_colors_and_fonts():
+    assert parse_color("#FF102030") == (16, 32, 48, 255)
+    assert parse_color("#80FFFFFF") == (255, 255, 255, 128)
+    assert parse_color("#abc") == (170, 187, 204, 255)
+    assert parse_color("nope", (1, 2, 3, 4)) == (1, 2, 3, 4)
+    fonts = str(APP_DIR / "fonts")
+    assert resolve_font_file("LS font", fonts_dir=fonts).endswith("LS_font.ttf")
+    assert resolve_font_file("Missing Family", fonts_dir=fonts) is None
@@ -1,7 +1,13 @@
+import contextlib
+import hashlib
+import io
+import json
 import os
+import tarfile
 import sys
 import tempfile
 import unittest
+import zipfile
 from types import ModuleType
 
 
@@ -19,9 +25,12 @@ if "widgets.card_scene_view" not in sys.modules:
         def set_frame_pixmap(self, pixmap):
             pass
 
-        def export_to_png(self, path):
+        def export_to_png(self, path, encoder=None):
             pass
 
+        def export_batch(self):
+            return contextlib.nullcontext(self)
+
     card_scene_module.CardSceneView = _StubCardSceneView
     widgets_pkg.card_scene_view = card_scene_module
     sys.modules["widgets"] = widgets_pkg
@@ -38,18 +47,33 @@ if "PySide6" not in sys.modules:
         def isNull(self):
             return self._null
 
+    class _StubQImage:
+        def __init__(self, *_args, **_kwargs):
+            pass
+
     qtgui.QPixmap = _StubQPixmap
+    qtgui.QImage = _StubQImage
     pyside6.QtGui = qtgui
     sys.modules["PySide6"] = pyside6
     sys.modules["PySide6.QtGui"] = qtgui
 
+from PIL import Image
+
+from app.core.archive_export import ARCHIVE_MANIFEST_NAME
 from app.core.models import CardModel, DeckModel
-from app.core.scene_exporter import SceneExporter
+from app.core.scene_exporter import MANIFEST_NAME, SceneExporter
 
 
 class DummySceneView:
     def __init__(self):
         self.exported = []
+        self.dpi = 300
+        self.batches = 0
+
+    @contextlib.contextmanager
+    def export_batch(self):
+        self.batches += 1
+        yield self
 
     def apply_card_data(self, payload, deck_color):
         pass
@@ -57,11 +81,24 @@ class DummySceneView:
     def set_frame_pixmap(self, pixmap):
         pass
 
-    def export_to_png(self, path):
+    def render_card_image(self):
+        return Image.new("RGBA", (8, 12), "red")
+
+    def render_thumbnail(self, width):
+        return Image.new("RGBA", (width, width * 3 // 2), "blue")
+
+    def export_to_png(self, path, encoder=None):
         self.exported.append(path)
-        os.makedirs(os.path.dirname(path), exist_ok=True)
-        with open(path, "wb") as handle:
-            handle.write(b"PNG")
+        image = Image.new("RGBA", (4, 4), "red")
+        if encoder is not None:
+            encoder.submit(image, path)
+        elif callable(path):
+            buffer = io.BytesIO()
+            image.save(buffer, "PNG")
+            path(buffer.getvalue())
+        else:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            image.save(path, "PNG")
 
 
 class SceneExporterTests(unittest.TestCase):
@@ -75,16 +112,172 @@ class SceneExporterTests(unittest.TestCase):
                 CardModel(index=1, payload={"name": "Duplicate/Name"}),
             ],
         )
-        exporter = SceneExporter(DummySceneView())
+        scene_view = DummySceneView()
+        exporter = SceneExporter(scene_view)
         with tempfile.TemporaryDirectory() as tmpdir:
             exporter.export_deck(deck, tmpdir)
-            files = sorted(os.listdir(tmpdir))
+            # кеші елементів вимикаються раз на експорт, а не на кожну картку
+            self.assertEqual(1, scene_view.batches)
+            files = sorted(f for f in os.listdir(tmpdir) if f != MANIFEST_NAME)
             self.assertEqual(2, len(files))
             self.assertNotEqual(files[0], files[1])
             for filename in files:
                 self.assertTrue(filename.startswith("duplicate_name-"))
                 self.assertTrue(filename.endswith(".png"))
 
+    def _deck(self, *payloads):
+        return DeckModel(
+            name="Test Deck",
+            path="",
+            deck_color="#FFFFFF",
+            cards=[CardModel(index=i, payload=dict(p)) for i, p in enumerate(payloads)],
+        )
+
+    def test_reexport_updates_in_place(self):
+        scene_view = DummySceneView()
+        exporter = SceneExporter(scene_view)
+        with tempfile.TemporaryDirectory() as tmpdir:
+            exporter.export_deck(self._deck({"name": "Alpha"}, {"name": "Beta"}), tmpdir)
+            self.assertEqual(2, len(scene_view.exported))
+
+            exporter.export_deck(self._deck({"name": "Alpha"}, {"name": "Beta"}), tmpdir)
+            self.assertEqual(2, len(scene_view.exported))
+
+            exporter.export_deck(self._deck({"name": "Alpha"}, {"name": "Beta", "atk": 2}), tmpdir)
+            self.assertEqual(os.path.join(tmpdir, "beta-002.png"), scene_view.exported[-1])
+            self.assertEqual(3, len(scene_view.exported))
+            self.assertEqual(
+                ["alpha-001.png", "beta-002.png", MANIFEST_NAME],
+                sorted(os.listdir(tmpdir)),
+            )
+
+    def test_reexport_deletes_removed_cards_and_rerenders_missing_files(self):
+        scene_view = DummySceneView()
+        exporter = SceneExporter(scene_view)
+        with tempfile.TemporaryDirectory() as tmpdir:
+            exporter.export_deck(self._deck({"name": "Alpha"}, {"name": "Beta"}), tmpdir)
+            os.remove(os.path.join(tmpdir, "alpha-001.png"))
+
+            exporter.export_deck(self._deck({"name": "Alpha"}), tmpdir)
+            self.assertEqual(os.path.join(tmpdir, "alpha-001.png"), scene_view.exported[-1])
+            self.assertEqual(["alpha-001.png", MANIFEST_NAME], sorted(os.listdir(tmpdir)))
+
+    def test_reordered_cards_keep_their_files(self):
+        scene_view = DummySceneView()
+        exporter = SceneExporter(scene_view)
+        with tempfile.TemporaryDirectory() as tmpdir:
+            exporter.export_deck(self._deck({"name": "Alpha"}, {"name": "Beta"}), tmpdir)
+            exporter.export_deck(self._deck({"name": "Beta"}, {"name": "Alpha"}), tmpdir)
+
+            self.assertEqual(2, len(scene_view.exported))
+            with open(os.path.join(tmpdir, MANIFEST_NAME), encoding="utf-8") as handle:
+                manifest = json.load(handle)
+            self.assertEqual("beta-002.png", manifest["cards"]["Beta#1"]["file"])
+
+    def test_partial_export_renders_only_given_cards(self):
+        scene_view = DummySceneView()
+        exporter = SceneExporter(scene_view)
+        with tempfile.TemporaryDirectory() as tmpdir:
+            exporter.export_deck(self._deck({"name": "Alpha"}, {"name": "Beta"}, {"name": "Gamma"}), tmpdir)
+            deck = self._deck({"name": "Alpha"}, {"name": "Gamma", "atk": 1})
+            exporter.export_deck(deck, tmpdir, cards=[deck.cards[1]], partial=True)
+
+            self.assertEqual(4, len(scene_view.exported))
+            self.assertEqual(os.path.join(tmpdir, "gamma-003.png"), scene_view.exported[-1])
+            self.assertEqual(["alpha-001.png", MANIFEST_NAME, "gamma-003.png"], sorted(os.listdir(tmpdir)))
+            with open(os.path.join(tmpdir, MANIFEST_NAME), encoding="utf-8") as handle:
+                self.assertEqual({"Alpha#1", "Gamma#1"}, set(json.load(handle)["cards"]))
+
+    def test_files_without_manifest_are_overwritten_not_duplicated(self):
+        exporter = SceneExporter(DummySceneView())
+        with tempfile.TemporaryDirectory() as tmpdir:
+            with open(os.path.join(tmpdir, "alpha-001.png"), "wb") as handle:
+                handle.write(b"old")
+            exporter.export_deck(self._deck({"name": "Alpha"}), tmpdir)
+            self.assertEqual(["alpha-001.png", MANIFEST_NAME], sorted(os.listdir(tmpdir)))
+
+    def test_profile_sets_extension_and_switching_rewrites_files(self):
+        scene_view = DummySceneView()
+        with tempfile.TemporaryDirectory() as tmpdir:
+            SceneExporter(scene_view).export_deck(self._deck({"name": "Alpha"}), tmpdir)
+            exporter = SceneExporter(scene_view, profile="web", encode_workers=2)
+            exporter.export_deck(self._deck({"name": "Alpha"}), tmpdir)
+            self.assertEqual(["alpha-001.webp", MANIFEST_NAME], sorted(os.listdir(tmpdir)))
+            with Image.open(os.path.join(tmpdir, "alpha-001.webp")) as image:
+                self.assertEqual("WEBP", image.format)
+            report = exporter.last_report
+            self.assertEqual(("web", 1, 2), (report.profile, report.files, report.workers))
+            self.assertEqual(os.path.getsize(os.path.join(tmpdir, "alpha-001.webp")), report.bytes)
+
+            exporter.export_deck(self._deck({"name": "Alpha"}), tmpdir)
+            self.assertEqual(2, len(scene_view.exported))
+            self.assertEqual(0, exporter.last_report.files)
+
+    def test_archive_streams_cards_with_manifest(self):
+        deck = self._deck({"name": "Alpha"}, {"name": "Beta"}, {"name": "Alpha"})
+        exporter = SceneExporter(DummySceneView(), encode_workers=3)
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = exporter.export_archive(deck, os.path.join(tmpdir, "out", "deck.zip"))
+            self.assertEqual(["deck.zip"], os.listdir(os.path.join(tmpdir, "out")))
+            with zipfile.ZipFile(path) as archive:
+                names = archive.namelist()
+                manifest = json.loads(archive.read(ARCHIVE_MANIFEST_NAME))
+                first = archive.read("alpha-001.png")
+        self.assertEqual(["alpha-001.png", "beta-002.png", "alpha-003.png", ARCHIVE_MANIFEST_NAME], names)
+        self.assertEqual((300, "Test Deck", "default"), (manifest["dpi"], manifest["deck"], manifest["profile"]))
+        self.assertEqual(["Alpha", "Beta", "Alpha"], [entry["name"] for entry in manifest["cards"]])
+        self.assertEqual(hashlib.sha256(first).hexdigest(), manifest["cards"][0]["sha256"])
+        self.assertNotEqual(manifest["cards"][0]["hash"], manifest["cards"][1]["hash"])
+        self.assertEqual(3, exporter.last_report.files)
+
+    def test_archive_tar_gz_uses_profile_extension(self):
+        exporter = SceneExporter(DummySceneView(), profile="web")
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = exporter.export_archive(self._deck({"name": "Alpha"}), os.path.join(tmpdir, "deck.tgz"))
+            with tarfile.open(path) as archive:
+                self.assertEqual(["alpha-001.webp", ARCHIVE_MANIFEST_NAME], archive.getnames())
+                with Image.open(archive.extractfile("alpha-001.webp")) as image:
+                    self.assertEqual("WEBP", image.format)
+
+    def test_failed_archive_export_leaves_no_file(self):
+        class FailingSceneView(DummySceneView):
+            def apply_card_data(self, payload, deck_color):
+                if payload["name"] == "Beta":
+                    raise RuntimeError("boom")
+
+        exporter = SceneExporter(FailingSceneView())
+        with tempfile.TemporaryDirectory() as tmpdir:
+            with self.assertRaises(RuntimeError):
+                exporter.export_archive(self._deck({"name": "Alpha"}, {"name": "Beta"}), os.path.join(tmpdir, "d.tar"))
+            self.assertEqual([], os.listdir(tmpdir))
+            with self.assertRaises(ValueError):
+                exporter.export_archive(self._deck({"name": "Alpha"}), os.path.join(tmpdir, "deck.rar"))
+
+    def test_atlas_export_writes_sheets_and_index(self):
+        deck = self._deck(*({"name": f"Card {i}"} for i in range(5)))
+        exporter = SceneExporter(DummySceneView())
+        progress = []
+        with tempfile.TemporaryDirectory() as tmpdir:
+            index_path = exporter.export_atlas(
+                deck, tmpdir, grid=(2, 2), reserve_back=True, progress=lambda *args: progress.append(args)
+            )
+            with open(index_path, encoding="utf-8") as handle:
+                index = json.load(handle)
+            self.assertEqual(
+                ["test_deck-atlas-01.png", "test_deck-atlas-02.png", "test_deck-atlas.json"], sorted(os.listdir(tmpdir))
+            )
+            self.assertEqual([8, 12], index["cell"])
+            self.assertEqual([[16, 24], [16, 24]], [sheet["size"] for sheet in index["sheets"]])
+            self.assertEqual([8, 12, 8, 12], index["sheets"][0]["back"]["rect"])
+            self.assertEqual((5, 5, "test_deck-atlas-02.png"), progress[-1])
+
+            exporter.export_atlas(deck, tmpdir, mode="pack", card_width=4)
+            with open(index_path, encoding="utf-8") as handle:
+                packed = json.load(handle)
+            self.assertEqual([20, 6], packed["sheets"][0]["size"])
+            self.assertNotIn("test_deck-atlas-02.png", os.listdir(tmpdir))
+            self.assertEqual(index["cards"][0]["hash"], packed["cards"][0]["hash"])
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,155 @@
+import importlib.machinery
+import json
+import os
+import subprocess
+import sys
+import textwrap
+from dataclasses import replace
+from pathlib import Path
+
+import pytest
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+from app.core.image_loader import ImageLoader
+from app.core.render_plan import compile_layout
+from app.core.renderer import LayoutRenderer
+from app.core.text_fit import TextMeasureCache, fit_font_size, parse_fit
+
+APP_DIR = PROJECT_ROOT / "app"
+FONT_PATH = APP_DIR / "fonts" / "LS_font.ttf"
+FONT_FAMILY = "UAF Sans"  # внутрішня назва сімейства LS_font.ttf
+LONG_TEXT = " ".join(["Deals two damage to every enemy unit in range."] * 12)
+
+LAYOUT = {
+    "meta": {"width": 744, "height": 1038, "dpi": 300},
+    "items": {
+        "description": {
+            "type": "text",
+            "text": "",
+            "pos": {"x": 60, "y": 520},
+            "font": {"family": FONT_FAMILY, "size": 18},
+            "color": "#FFFFFF",
+            "text_width": 520,
+            "fit": {"mode": "shrink", "height": 210, "min_size": 8},
+        },
+    },
+}
+
+
+def _counting(measure):
+    calls = []
+
+    def wrapped(size):
+        calls.append(size)
+        return measure(size)
+
+    return wrapped, calls
+
+
+def test_binary_search_picks_largest_fitting_size():
+    measure, calls = _counting(lambda size: size * 10.0)
+    cache = TextMeasureCache()
+    assert fit_font_size("text", "font", 100, 125, 6, 40, measure, cache) == 12
+    assert len(calls) <= 7  # max + log2(34)
+
+    assert fit_font_size("short", "font", 100, 1000, 6, 40, lambda size: 10.0, cache) == 40
+    assert fit_font_size("huge", "font", 100, 5, 6, 40, lambda size: 1000.0, cache) == 6
+
+
+def test_measurements_are_memoized_per_text_font_size_width():
+    cache = TextMeasureCache()
+    measure, calls = _counting(lambda size: size * 10.0)
+    first = fit_font_size("text", "font", 100, 125, 6, 40, measure, cache)
+    probed = len(calls)
+    assert fit_font_size("text", "font", 100, 125, 6, 40, measure, cache) == first
+    assert len(calls) == probed and cache.hits == probed
+
+    fit_font_size("text", "font", 200, 125, 6, 40, measure, cache)  # інша ширина — нове вимірювання
+    assert len(calls) > probed
+
+
+def test_measure_cache_is_bounded():
+    cache = TextMeasureCache(maxsize=3)
+    for size in range(5):
+        cache.height("t", "f", size, 10, float)
+    assert len(cache) == 3
+    cache.height("t", "f", 0, 10, lambda size: 99.0)
+    assert cache.height("t", "f", 0, 10, float) == 99.0
+
+
+def test_parse_fit():
+    assert parse_fit(None) is None
+    assert parse_fit({"mode": "none", "height": 100}) is None
+    assert parse_fit({"mode": "shrink"}) is None
+    assert parse_fit({"height": 120}) == {"height": 120.0, "min_size": 6}
+    assert parse_fit({"mode": "shrink", "height": 120, "min_size": 9}) == {"height": 120.0, "min_size": 9}
+
+
+def test_plan_scales_fit_box_with_dpi():
+    item = compile_layout(LAYOUT, dpi=600).item("description")
+    assert item.fit.height == 420
+    assert (item.fit.min_size, item.fit.max_size) == (8, 18)
+    assert item.fit.px_per_point == pytest.approx(96 / 72 * 2)
+    assert compile_layout({"items": {"t": {"type": "text"}}}).item("t").fit is None
+
+
+def test_layout_renderer_shrinks_long_text_into_box(tmp_path):
+    (tmp_path / "layout.json").write_text(json.dumps(LAYOUT), encoding="utf-8")
+    renderer = LayoutRenderer(str(tmp_path / "layout.json"), fonts_folder=str(APP_DIR / "fonts"), image_loader=ImageLoader())
+    item = renderer.plan.item("description")
+
+    assert renderer._fitted_font(item, "Short text.") == item.font
+    fitted = renderer._fitted_font(item, LONG_TEXT)
+    assert fitted.pixel_size < item.font.pixel_size
+
+    layer, _, _ = renderer._text_layer(item, LONG_TEXT)
+    assert layer.height <= item.fit.height
+    overflow, _, _ = renderer._text_layer(replace(item, fit=None), LONG_TEXT)
+    assert overflow.height > item.fit.height
+
+
+QT_FIT_SCRIPT = textwrap.dedent(
+    """
+    import json, sys
+    app_dir, tmp_dir, font_path, text = sys.argv[1:5]
+    sys.path.insert(0, app_dir)
+    from PySide6.QtGui import QFontDatabase
+    from PySide6.QtWidgets import QApplication
+    app = QApplication([])
+    QFontDatabase.addApplicationFont(font_path)
+    from widgets.card_scene_view import CardSceneView
+    view = CardSceneView(tmp_dir + "/layout.json")
+    item = view.scene_items["description"]
+    result = {"short": None, "long": None}
+    view.apply_card_data({"description": "Short text."}, "#FFFFFF")
+    result["short"] = item.font().pointSize()
+    view.apply_card_data({"description": text}, "#FFFFFF")
+    result["long"] = item.font().pointSize()
+    result["height"] = item.boundingRect().height()
+    result["saved"] = view.get_item_config("description")["font"]["size"]
+    print(json.dumps(result))
+    """
+)
+
+
+# PathFinder шукає на диску: test_scene_exporter підміняє PySide6 у sys.modules.
+@pytest.mark.skipif(importlib.machinery.PathFinder.find_spec("PySide6") is None, reason="PySide6 not installed")
+def test_scene_view_shrinks_text_but_keeps_layout_size(tmp_path):
+    (tmp_path / "layout.json").write_text(json.dumps(LAYOUT), encoding="utf-8")
+    env = dict(os.environ, QT_QPA_PLATFORM="offscreen")
+    output = subprocess.run(
+        [sys.executable, "-c", QT_FIT_SCRIPT, str(APP_DIR), str(tmp_path), str(FONT_PATH), LONG_TEXT],
+        check=True,
+        env=env,
+        cwd=str(APP_DIR),
+        capture_output=True,
+        text=True,
+    ).stdout
+    result = json.loads(output.strip().splitlines()[-1])
+    assert result["short"] == 18
+    assert result["long"] < 18
+    assert result["height"] <= 210
+    assert result["saved"] == 18